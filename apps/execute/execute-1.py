@@ -35,7 +35,7 @@
 #
 ##########################################################################
 
-import os, sys, traceback
+import os, sys, json, threading, traceback, multiprocessing
 
 import imath
 
@@ -109,6 +109,30 @@ class execute( Gaffer.Application ) :
 					},
 				),
 
+				IECore.IntParameter(
+					name = "parallelFrames",
+					description = "The maximum number of frames to execute concurrently. "
+						"Frames are only executed concurrently for nodes which don't "
+						"require sequence execution - all other nodes execute their "
+						"frames as a single sequence, as usual. Concurrent frames run "
+						"in the same process, so they share the script and the compute "
+						"cache. A value of 0 uses one frame per hardware thread.",
+					defaultValue = 1,
+					minValue = 0,
+				),
+
+				IECore.BoolParameter(
+					name = "worker",
+					description = "Runs as a persistent worker process. The script is loaded "
+						"once, and then requests to execute nodes are read from standard "
+						"input, one per line, with a result being written to standard output "
+						"for each. Each request is a JSON object with \"nodes\", \"frames\" "
+						"and \"context\" entries matching the parameters of the same name. "
+						"Used by the LocalDispatcher to avoid the cost of launching a new "
+						"process and loading the script for every batch it executes.",
+					defaultValue = False,
+				),
+
 			]
 
 		)
@@ -131,9 +155,22 @@ class execute( Gaffer.Application ) :
 
 		self.root()["scripts"].addChild( scriptNode )
 
+		if args["worker"].value :
+			return self.__runWorker( scriptNode )
+
+		return self.__execute(
+			scriptNode,
+			list( args["nodes"] ),
+			self.parameters()["frames"].getFrameListValue().asList(),
+			list( args["context"] ),
+			args["parallelFrames"].value
+		)
+
+	def __execute( self, scriptNode, nodeNames, frames, contextArgs, parallelFrames = 1 ) :
+
 		nodes = []
-		if len( args["nodes"] ) :
-			for nodeName in args["nodes"] :
+		if len( nodeNames ) :
+			for nodeName in nodeNames :
 				node = scriptNode.descendant( nodeName )
 				if node is None :
 					IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Node \"%s\" does not exist" % nodeName )
@@ -150,38 +187,125 @@ class execute( Gaffer.Application ) :
 				IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Script has no executable nodes" )
 				return 1
 
-		if len(args["context"]) % 2 :
+		if len( contextArgs ) % 2 :
 			IECore.msg( IECore.Msg.Level.Error, "gaffer execute", "Context parameter must have matching entry/value pairs" )
 			return 1
 
 		context = Gaffer.Context( scriptNode.context() )
-		for i in range( 0, len(args["context"]), 2 ) :
-			entry = args["context"][i].lstrip( "-" )
-			context[entry] = eval( args["context"][i+1] )
+		for i in range( 0, len( contextArgs ), 2 ) :
+			entry = contextArgs[i].lstrip( "-" )
+			context[entry] = eval( contextArgs[i+1] )
 
-		frames = self.parameters()["frames"].getFrameListValue().asList()
 		if not frames :
 			frames = [ scriptNode.context().getFrame() ]
 
+		if parallelFrames == 0 :
+			parallelFrames = multiprocessing.cpu_count()
+
 		with context :
 			for node in nodes :
 				errorConnection = node.errorSignal().connect( Gaffer.WeakMethod( self.__error ) )
+				if parallelFrames > 1 and len( frames ) > 1 and not node["task"].requiresSequenceExecution() :
+					if not self.__executeParallelFrames( node, frames, parallelFrames ) :
+						return 1
+				else :
+					try :
+						node["task"].executeSequence( frames )
+					except Exception as exception :
+						self.__reportException( node )
+						return 1
+
+		return 0
+
+	# Executes the frames of a single node using a pool of threads,
+	# each of which takes the next unexecuted frame until none remain.
+	# After a failure, frames which are already executing are allowed
+	# to finish, but no new ones are started. Returns True on success.
+	def __executeParallelFrames( self, node, frames, parallelFrames ) :
+
+		context = Gaffer.Context.current()
+		remainingFrames = list( reversed( frames ) )
+		failed = []
+		lock = threading.Lock()
+
+		def executeFrames() :
+
+			while True :
+
+				with lock :
+					if failed or not remainingFrames :
+						return
+					frame = remainingFrames.pop()
+
+				frameContext = Gaffer.Context( context )
+				frameContext.setFrame( frame )
 				try :
-					node["task"].executeSequence( frames )
+					with frameContext :
+						node["task"].execute()
 				except Exception as exception :
-					IECore.msg(
-						IECore.Msg.Level.Debug,
-						"gaffer execute : executing %s" % node.relativeName( scriptNode ),
-						"".join( traceback.format_exception( *sys.exc_info() ) ),
-					)
-					IECore.msg(
-						IECore.Msg.Level.Error,
-						"gaffer execute : executing %s" % node.relativeName( scriptNode ),
-						"See previous message for details",
-					)
-					return 1
+					with lock :
+						failed.append( frame )
+					self.__reportException( node, frame )
 
-		return 0
+		threads = [
+			threading.Thread( target = executeFrames )
+			for i in range( 0, min( parallelFrames, len( frames ) ) )
+		]
+		for thread in threads :
+			thread.start()
+		for thread in threads :
+			thread.join()
+
+		return not failed
+
+	def __reportException( self, node, frame = None ) :
+
+		context = "gaffer execute : executing %s" % node.relativeName( node.scriptNode() )
+		if frame is not None :
+			context += " (frame %s)" % frame
+
+		IECore.msg(
+			IECore.Msg.Level.Debug,
+			context,
+			"".join( traceback.format_exception( *sys.exc_info() ) ),
+		)
+		IECore.msg(
+			IECore.Msg.Level.Error,
+			context,
+			"See previous message for details",
+		)
+
+	def __runWorker( self, scriptNode ) :
+
+		# Results are written to the original stdout, and anything the
+		# tasks themselves print is redirected to stderr, so that it
+		# can't be confused with a result.
+		results = os.fdopen( os.dup( sys.stdout.fileno() ), "w" )
+		sys.stdout.flush()
+		os.dup2( sys.stderr.fileno(), sys.stdout.fileno() )
+
+		while True :
+
+			line = sys.stdin.readline()
+			if not line :
+				# Our parent has closed the pipe, signifying
+				# that there is no more work to do.
+				return 0
+
+			try :
+				request = json.loads( line )
+				result = self.__execute(
+					scriptNode,
+					[ str( n ) for n in request.get( "nodes", [] ) ],
+					IECore.FrameList.parse( str( request.get( "frames", "" ) ) ).asList(),
+					[ str( c ) for c in request.get( "context", [] ) ]
+				)
+			except Exception as exception :
+				IECore.msg( IECore.Msg.Level.Error, "gaffer execute : processing request", str( exception ) )
+				result = 1
+
+			results.write( json.dumps( { "result" : result } ) + "\n" )
+			results.flush()
 
 	def __error( self, plug, source, message ) :
 
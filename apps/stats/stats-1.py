@@ -37,6 +37,7 @@
 import os
 import gc
 import sys
+import json
 import time
 import tempfile
 import resource
@@ -76,6 +77,27 @@ class stats( Gaffer.Application ) :
 			```
 			gaffer stats fileName.gfr -image NameOfNode -performanceMonitor
 			```
+
+			To output the statistics in JSON format, for processing by
+			other tools :
+
+			```
+			gaffer stats fileName.gfr -image NameOfNode -performanceMonitor -json -outputFile stats.json
+			```
+
+			To record a timeline of all processes on all threads, for
+			viewing in chrome://tracing or https://ui.perfetto.dev :
+
+			```
+			gaffer stats fileName.gfr -scene NameOfNode -traceFile trace.json
+			```
+
+			To compare two sets of JSON statistics, reporting hotspots
+			which have slowed down :
+
+			```
+			gaffer stats -compare before.json after.json
+			```
 			"""
 		)
 
@@ -86,7 +108,7 @@ class stats( Gaffer.Application ) :
 					name = "script",
 					description = "The script to examine.",
 					defaultValue = "",
-					allowEmptyString = False,
+					allowEmptyString = True,
 					extensions = "gfr",
 					check = IECore.FileNameParameter.CheckType.MustExist,
 				),
@@ -99,6 +121,15 @@ class stats( Gaffer.Application ) :
 					extensions = "",
 				),
 
+				IECore.BoolParameter(
+					name = "json",
+					description = "Outputs the results in JSON format rather than as "
+						"human readable text. All the statistics captured by the "
+						"performance and context monitors are included, regardless "
+						"of the value of maxLinesPerMetric.",
+					defaultValue = False,
+				),
+
 				IECore.FrameListParameter(
 					name = "frames",
 					description = "The frames to evaluate statistics for. The default value "
@@ -173,6 +204,17 @@ class stats( Gaffer.Application ) :
 					defaultValue = "",
 				),
 
+				IECore.FileNameParameter(
+					name = "traceFile",
+					description = "Records the start and end of every process on every "
+						"thread, and writes them to this file in the Chrome trace event "
+						"format. The file can be viewed in chrome://tracing or "
+						"https://ui.perfetto.dev.",
+					defaultValue = "",
+					allowEmptyString = True,
+					extensions = "json",
+				),
+
 				IECore.BoolParameter(
 					name = "vtune",
 					description = "Enables VTune instrumentation. When enabled, the VTune "
@@ -186,7 +228,33 @@ class stats( Gaffer.Application ) :
 						"This can be used to measure any overhead generated by nodes checking for "
 						"cancellation.",
 					defaultValue = False
-				)
+				),
+
+				IECore.StringVectorParameter(
+					name = "compare",
+					description = "The names of two files previously output using the json "
+						"argument. Rather than examining a script, the files are compared, "
+						"and any timings which have increased by more than the compareThreshold "
+						"are reported. The application returns a non-zero exit status if "
+						"any regressions are found.",
+					defaultValue = IECore.StringVectorData(),
+				),
+
+				IECore.FloatParameter(
+					name = "compareThreshold",
+					description = "The percentage by which a timing must increase to be "
+						"reported as a regression.",
+					defaultValue = 10,
+					minValue = 0,
+				),
+
+				IECore.FloatParameter(
+					name = "compareMinimumDuration",
+					description = "The increase in seconds below which timings are considered "
+						"to be noise, and are not reported as regressions.",
+					defaultValue = 0.01,
+					minValue = 0,
+				),
 
 			]
 
@@ -202,6 +270,13 @@ class stats( Gaffer.Application ) :
 
 	def _run( self, args ) :
 
+		if len( args["compare"] ) :
+			return self.__compare( args )
+
+		if not args["script"].value :
+			IECore.msg( IECore.Msg.Level.Error, "stats", "No script specified" )
+			return 1
+
 		self.__timers = collections.OrderedDict()
 		self.__memory = collections.OrderedDict()
 
@@ -210,9 +285,17 @@ class stats( Gaffer.Application ) :
 		script = Gaffer.ScriptNode()
 		script["fileName"].setValue( os.path.abspath( args["script"].value ) )
 
+		Gaffer.ScriptNode.resetCodeCacheStatistics()
+		Gaffer.ScriptNode.resetLoadStatistics()
 		with _Timer() as loadingTimer :
 			script.load( continueOnError = True )
 		self.__timers["Loading"] = loadingTimer
+		self.__compilation = collections.OrderedDict( [
+			( "time", Gaffer.ScriptNode.codeCacheCompileTime() ),
+			( "cached", Gaffer.ScriptNode.codeCacheHits() ),
+			( "compiled", Gaffer.ScriptNode.codeCacheMisses() ),
+		] )
+		self.__timers["Loading (compilation)"] = "%.3fs (%d cached, %d compiled)" % tuple( self.__compilation.values() )
 
 		self.root()["scripts"].addChild( script )
 
@@ -234,6 +317,11 @@ class stats( Gaffer.Application ) :
 		else :
 			self.__contextMonitor = None
 
+		if args["traceFile"].value :
+			self.__traceMonitor = Gaffer.TraceMonitor()
+		else :
+			self.__traceMonitor = None
+
 		if args["vtune"].value :
 			try:
 				self.__vtuneMonitor = Gaffer.VTuneMonitor()
@@ -241,8 +329,33 @@ class stats( Gaffer.Application ) :
 			except AttributeError:
 				IECore.msg( IECore.Msg.Level.Error, "gui", "unable to create requested VTune monitor" )
 
+		self.__imageItems = []
+
+		if args["scene"].value :
+
+			self.__computeScene( script, args )
+
+		if args["image"].value :
+
+			self.__computeImage( script, args )
+
+		if args["task"].value :
+
+			self.__computeTask( script, args )
+
+		if self.__traceMonitor is not None :
+
+			self.__traceMonitor.writeTrace( args["traceFile"].value )
+
 		self.__output = file( args["outputFile"].value, "w" ) if args["outputFile"].value else sys.stdout
 
+		if args["json"].value :
+
+			self.__writeJSON( script, args )
+			self.__output.close()
+
+			return 0
+
 		self.__writeVersion( script )
 
 		self.__output.write( "\n" )
@@ -259,21 +372,16 @@ class stats( Gaffer.Application ) :
 
 		self.__output.write( "\n" )
 
+		self.__writeReferences( args )
+
 		if args["nodeSummary"].value :
 
 			self.__writeNodes( script )
 
-		if args["scene"].value :
-
-			self.__writeScene( script, args )
+		if self.__imageItems :
 
-		if args["image"].value :
-
-			self.__writeImage( script, args )
-
-		if args["task"].value :
-
-			self.__writeTask( script, args )
+			self.__output.write( "\nImage :\n\n" )
+			self.__writeItems( self.__imageItems )
 
 		self.__output.write( "\n" )
 
@@ -293,7 +401,7 @@ class stats( Gaffer.Application ) :
 
 		return 0
 
-	def __writeVersion( self, script ) :
+	def __versionItems( self, script ) :
 
 		numbers = [ Gaffer.Metadata.nodeValue( script, "serialiser:" + x + "Version" ) for x in ( "milestone", "major", "minor", "patch" ) ]
 		if None not in numbers :
@@ -301,13 +409,15 @@ class stats( Gaffer.Application ) :
 		else :
 			version = "unknown"
 
-		versions = (
+		return [
 			( "Script", version ),
 			( "Current", Gaffer.About.versionString() ),
-		)
+		]
+
+	def __writeVersion( self, script ) :
 
 		self.__output.write( "Gaffer Version :\n\n" )
-		self.__writeItems( versions )
+		self.__writeItems( self.__versionItems( script ) )
 
 	def __writeItems( self, items ) :
 
@@ -323,7 +433,7 @@ class stats( Gaffer.Application ) :
 		self.__output.write( "Args :\n\n" )
 		self.__writeItems( sorted( args.items() ) )
 
-	def __writeSettings( self, script ) :
+	def __settingsItems( self, script ) :
 
 		plugsToIgnore = {
 			script["fileName"],
@@ -345,10 +455,14 @@ class stats( Gaffer.Application ) :
 
 		itemsWalk( script )
 
+		return items
+
+	def __writeSettings( self, script ) :
+
 		self.__output.write( "Settings :\n\n" )
-		self.__writeItems( items )
+		self.__writeItems( self.__settingsItems( script ) )
 
-	def __writeVariables( self, script ) :
+	def __variablesItems( self, script ) :
 
 		items = []
 		for p in script["variables"] :
@@ -356,10 +470,36 @@ class stats( Gaffer.Application ) :
 			if data is not None :
 				items.append( ( name, data ) )
 
+		return items
+
+	def __writeVariables( self, script ) :
+
 		self.__output.write( "Variables :\n\n" )
+		self.__writeItems( self.__variablesItems( script ) )
+
+	def __referenceStatistics( self, args ) :
+
+		stats = Gaffer.ScriptNode.loadStatistics()
+		stats.pop( os.path.abspath( args["script"].value ), None )
+
+		return sorted( stats.items(), key = lambda x : x[1].totalTime, reverse = True )
+
+	def __writeReferences( self, args ) :
+
+		stats = self.__referenceStatistics( args )
+		if not stats :
+			return
+
+		items = [
+			( fileName, "%.3fs (%d loads, %.3fs reading)" % ( s.totalTime, s.loads, s.readTime ) )
+			for fileName, s in stats[:args["maxLinesPerMetric"].value]
+		]
+
+		self.__output.write( "References :\n\n" )
 		self.__writeItems( items )
+		self.__output.write( "\n" )
 
-	def __writeNodes( self, script ) :
+	def __nodeCounts( self, script ) :
 
 		def countWalk( node, counter ) :
 
@@ -372,10 +512,15 @@ class stats( Gaffer.Application ) :
 		counter = collections.Counter()
 		countWalk( script, counter )
 
-		items = [ ( nodeType.rpartition( ":" )[2], count ) for nodeType, count in counter.most_common() ]
+		return [ ( nodeType.rpartition( ":" )[2], count ) for nodeType, count in counter.most_common() ]
+
+	def __writeNodes( self, script ) :
+
+		counts = self.__nodeCounts( script )
+		items = list( counts )
 		items.extend( [
 			( "", "" ),
-			( "Total", sum( counter.values() ) ),
+			( "Total", sum( x[1] for x in counts ) ),
 		] )
 
 		self.__output.write( "Nodes :\n\n" )
@@ -397,7 +542,7 @@ class stats( Gaffer.Application ) :
 
 		return frames
 
-	def __writeScene( self, script, args ) :
+	def __computeScene( self, script, args ) :
 
 		import GafferScene
 		import GafferSceneTest
@@ -425,7 +570,7 @@ class stats( Gaffer.Application ) :
 
 		memory = _Memory.maxRSS()
 		with _Timer() as sceneTimer :
-			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager() :
+			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__traceMonitor or _NullContextManager() :
 				computeScene()
 
 		self.__timers["Scene generation"] = sceneTimer
@@ -435,7 +580,7 @@ class stats( Gaffer.Application ) :
 		#  - Locations
 		#  - Unique objects, attributes etc
 
-	def __writeImage( self, script, args ) :
+	def __computeImage( self, script, args ) :
 
 		import GafferImage
 		import GafferImageTest
@@ -460,22 +605,19 @@ class stats( Gaffer.Application ) :
 
 		memory = _Memory.maxRSS()
 		with _Timer() as imageTimer :
-			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager() :
+			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__traceMonitor or _NullContextManager() :
 				computeImage()
 
 		self.__timers["Image generation"] = imageTimer
 		self.__memory["Image generation"] = _Memory.maxRSS() - memory
 
-		items = [
+		self.__imageItems = [
 			( "Format", image["format"].getValue() ),
 			( "Data window", image["dataWindow"].getValue() ),
 			( "Channel names", image["channelNames"].getValue() ),
 		]
 
-		self.__output.write( "\nImage :\n\n" )
-		self.__writeItems( items )
-
-	def __writeTask( self, script, args ) :
+	def __computeTask( self, script, args ) :
 
 		import GafferDispatch
 
@@ -492,7 +634,7 @@ class stats( Gaffer.Application ) :
 
 		memory = _Memory.maxRSS()
 		with _Timer() as taskTimer :
-			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager() :
+			with self.__performanceMonitor or _NullContextManager(), self.__contextMonitor or _NullContextManager(), self.__traceMonitor or _NullContextManager() :
 				with Gaffer.Context( script.context() ) as context :
 					for frame in self.__frames( script, args ) :
 						context.setFrame( frame )
@@ -501,25 +643,61 @@ class stats( Gaffer.Application ) :
 		self.__timers["Task execution"] = taskTimer
 		self.__memory["Task execution"] = _Memory.maxRSS() - memory
 
-	def __writeMemory( self ) :
+	def __memoryItems( self ) :
 
 		objectPool = IECore.ObjectPool.defaultObjectPool()
 
 		items = self.__memory.items()
 
+		hashCacheHits = Gaffer.ValuePlug.hashCacheHits()
+		hashCacheMisses = Gaffer.ValuePlug.hashCacheMisses()
+
 		items.extend( [
 			( "", "" ),
 			( "Cache limit", _Memory( Gaffer.ValuePlug.getCacheMemoryLimit() ) ),
 			( "Cache usage", _Memory( Gaffer.ValuePlug.cacheMemoryUsage() ) ),
 			( "", "" ),
+			( "Hash cache limit", Gaffer.ValuePlug.getHashCacheSizeLimit() ),
+			( "Hash cache hits", hashCacheHits ),
+			( "Hash cache misses", hashCacheMisses ),
+			( "Hash cache hit rate", _FormattedValue( 100.0 * hashCacheHits / max( hashCacheHits + hashCacheMisses, 1 ), "%.1f%%" ) ),
+			( "", "" ),
+		] )
+
+		if Gaffer.ValuePlug.getDiskCacheDirectory() :
+			items.extend( [
+				( "Disk cache limit", _Memory( Gaffer.ValuePlug.getDiskCacheSizeLimit() ) ),
+				( "Disk cache hits", Gaffer.ValuePlug.diskCacheHits() ),
+				( "Disk cache misses", Gaffer.ValuePlug.diskCacheMisses() ),
+				( "Disk cache writes", Gaffer.ValuePlug.diskCacheWrites() ),
+				( "Disk cache evictions", Gaffer.ValuePlug.diskCacheEvictions() ),
+				( "", "" ),
+			] )
+
+		if "GafferImage" in sys.modules :
+			import GafferImage
+			items.extend( [
+				( "Image file limit", GafferImage.OpenImageIOReader.getOpenFilesLimit() ),
+				( "Image file handles", GafferImage.OpenImageIOReader.openFileHandles() ),
+				( "Image file evictions", GafferImage.OpenImageIOReader.fileCacheEvictions() ),
+				( "Image bytes read", _Memory( GafferImage.OpenImageIOReader.bytesRead() ) ),
+				( "Image file lock wait", _FormattedValue( GafferImage.OpenImageIOReader.lockWaitTime(), "%.3fs" ) ),
+				( "", "" ),
+			] )
+
+		items.extend( [
 			( "Object pool limit", _Memory( objectPool.getMaxMemoryUsage() ) ),
 			( "Object pool usage", _Memory( objectPool.memoryUsage() ) ),
 			( "", "" ),
 			( "Max resident size", _Memory.maxRSS() ),
 		] )
 
+		return items
+
+	def __writeMemory( self ) :
+
 		self.__output.write( "Memory :\n\n" )
-		self.__writeItems( items )
+		self.__writeItems( self.__memoryItems() )
 
 	def __writeStatisticsItems( self, script, stats, key, n ) :
 
@@ -557,6 +735,146 @@ class stats( Gaffer.Application ) :
 
 			self.__writeItems( items )
 
+	def __writeJSON( self, script, args ) :
+
+		result = collections.OrderedDict()
+
+		result["version"] = _jsonItems( self.__versionItems( script ) )
+		result["args"] = _jsonItems( sorted( args.items() ) )
+		result["settings"] = _jsonItems( self.__settingsItems( script ) )
+		result["variables"] = _jsonItems( self.__variablesItems( script ) )
+
+		result["references"] = collections.OrderedDict( [
+			( fileName, collections.OrderedDict( [
+				( "totalTime", s.totalTime ),
+				( "loads", s.loads ),
+				( "readTime", s.readTime ),
+			] ) )
+			for fileName, s in self.__referenceStatistics( args )
+		] )
+
+		if args["nodeSummary"].value :
+			result["nodes"] = _jsonItems( self.__nodeCounts( script ) )
+
+		if self.__imageItems :
+			result["image"] = _jsonItems( self.__imageItems )
+
+		result["memory"] = _jsonItems( self.__memoryItems() )
+
+		result["timers"] = _jsonItems( [ x for x in self.__timers.items() if isinstance( x[1], _Timer ) ] )
+		result["compilation"] = self.__compilation
+
+		if self.__performanceMonitor is not None :
+
+			def statisticsDict( s ) :
+
+				return collections.OrderedDict( [
+					( "hashCount", s.hashCount ),
+					( "computeCount", s.computeCount ),
+					( "hashDuration", s.hashDuration ),
+					( "computeDuration", s.computeDuration ),
+					( "cacheHitCount", s.cacheHitCount ),
+					( "cacheMissCount", s.cacheMissCount ),
+					( "cacheBytesInserted", s.cacheBytesInserted ),
+					( "cacheEvictionCount", s.cacheEvictionCount ),
+					( "duplicateComputeCount", s.duplicateComputeCount ),
+					( "duplicateComputeDuration", s.duplicateComputeDuration ),
+				] )
+
+			result["performanceMonitor"] = collections.OrderedDict( [
+				( "combined", statisticsDict( self.__performanceMonitor.combinedStatistics() ) ),
+				( "plugs", collections.OrderedDict( sorted(
+					( plug.relativeName( script ), statisticsDict( s ) )
+					for plug, s in self.__performanceMonitor.allStatistics().items()
+				) ) ),
+			] )
+
+		if self.__contextMonitor is not None :
+
+			def statisticsDict( s ) :
+
+				return collections.OrderedDict( [
+					( "uniqueContexts", s.numUniqueContexts() ),
+					( "variables", collections.OrderedDict( [ ( str( n ), s.numUniqueValues( n ) ) for n in s.variableNames() ] ) ),
+				] )
+
+			result["contextMonitor"] = collections.OrderedDict( [
+				( "combined", statisticsDict( self.__contextMonitor.combinedStatistics() ) ),
+				( "plugs", collections.OrderedDict( sorted(
+					( plug.relativeName( script ), statisticsDict( s ) )
+					for plug, s in self.__contextMonitor.allStatistics().items()
+				) ) ),
+			] )
+
+		json.dump( result, self.__output, indent = 4 )
+		self.__output.write( "\n" )
+
+	def __compare( self, args ) :
+
+		if len( args["compare"] ) != 2 :
+			IECore.msg( IECore.Msg.Level.Error, "stats", "Expected two files to compare" )
+			return 1
+
+		before, after = [ json.load( open( f ) ) for f in args["compare"] ]
+
+		threshold = 1 + args["compareThreshold"].value / 100.0
+		minimumDuration = args["compareMinimumDuration"].value
+
+		# Each regression is stored as ( name, duration before, duration after ).
+		regressions = []
+		def compare( name, durationBefore, durationAfter ) :
+
+			if durationAfter - durationBefore > minimumDuration and durationAfter > durationBefore * threshold :
+				regressions.append( ( name, durationBefore, durationAfter ) )
+
+		timersBefore = before.get( "timers", {} )
+		for name, timer in after.get( "timers", {} ).items() :
+			if name in timersBefore :
+				compare( name + " (wall)", timersBefore[name]["wall"], timer["wall"] )
+
+		plugsBefore = before.get( "performanceMonitor", {} ).get( "plugs", {} )
+		for plug, s in after.get( "performanceMonitor", {} ).get( "plugs", {} ).items() :
+			sBefore = plugsBefore.get( plug )
+			if sBefore is None :
+				continue
+			for metric in ( "hashDuration", "computeDuration" ) :
+				# Durations are stored in nanoseconds.
+				compare( plug + " (" + metric + ")", sBefore[metric] / 1e9, s[metric] / 1e9 )
+
+		regressions.sort( key = lambda x : x[2] - x[1], reverse = True )
+
+		self.__output = file( args["outputFile"].value, "w" ) if args["outputFile"].value else sys.stdout
+
+		if regressions :
+			self.__output.write( "Regressions :\n\n" )
+			self.__writeItems( [
+				( name, "%.3fs -> %.3fs (+%.1f%%)" % ( a, b, 100.0 * ( b - a ) / a if a else float( "inf" ) ) )
+				for name, a, b in regressions
+			] )
+		else :
+			self.__output.write( "No regressions found\n" )
+
+		self.__output.close()
+
+		return 1 if regressions else 0
+
+def _jsonValue( value ) :
+
+	if isinstance( value, ( _Timer, _Memory, _FormattedValue ) ) :
+		return value.jsonValue()
+	elif value is None or isinstance( value, ( bool, int, long, float, basestring ) ) :
+		return value
+	else :
+		return str( value )
+
+# Converts a list of ( name, value ) items to a dictionary suitable
+# for JSON output, omitting the blank items used for spacing.
+def _jsonItems( items ) :
+
+	return collections.OrderedDict( [
+		( str( name ), _jsonValue( value ) ) for name, value in items if name
+	] )
+
 class _Timer( object ) :
 
 	def __enter__( self ) :
@@ -575,6 +893,10 @@ class _Timer( object ) :
 
 		return "%.3fs (wall), %.3fs (CPU)" % ( self.__time, self.__clock )
 
+	def jsonValue( self ) :
+
+		return collections.OrderedDict( [ ( "wall", self.__time ), ( "cpu", self.__clock ) ] )
+
 class _Memory( object ) :
 
 	def __init__( self, bytes ) :
@@ -593,10 +915,31 @@ class _Memory( object ) :
 
 		return "%.3fM" % ( self.__bytes / ( 1024 * 1024. ) )
 
+	def jsonValue( self ) :
+
+		return self.__bytes
+
 	def __sub__( self, other ) :
 
 		return _Memory( self.__bytes - other.__bytes )
 
+# A number which is formatted for text output, but
+# output unformatted as JSON.
+class _FormattedValue( object ) :
+
+	def __init__( self, value, format ) :
+
+		self.__value = value
+		self.__format = format
+
+	def __str__( self ) :
+
+		return self.__format % self.__value
+
+	def jsonValue( self ) :
+
+		return self.__value
+
 class _NullContextManager( object ) :
 
 	def __enter__( self ) :
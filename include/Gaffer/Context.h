@@ -183,6 +183,9 @@ class GAFFER_API Context : public IECore::RefCounted
 		/// A signal emitted when an element of the context is changed.
 		ChangedSignal &changedSignal();
 
+		/// Note that the hash is not stable between processes, so nodes
+		/// which use it in `ComputeNode::hash()` must also call
+		/// `ValuePlug::markHashUnstable()`.
 		IECore::MurmurHash hash() const;
 
 		bool operator == ( const Context &other ) const;
@@ -84,6 +84,18 @@ class GAFFER_API Expression : public ComputeNode
 		/// plug cannot be supported.
 		std::string identifier( const ValuePlug *plug ) const;
 
+		/// Executes the expression once for each of the specified contexts,
+		/// filling `values` with the value the expression computes for `output`
+		/// in each. This is equivalent to evaluating `output` in each context
+		/// in turn, but allows the engine to amortise its per-execution overhead
+		/// across the whole batch. It is intended for use by nodes which need
+		/// values from an expression for many sibling contexts - one per scene
+		/// location for instance. Note that the values are returned as provided
+		/// by the engine, prior to any conversion to the type of `output`, and
+		/// are not stored in the compute cache.
+		/// \threading This function may be called concurrently.
+		void executeBatch( const ValuePlug *output, const std::vector<ConstContextPtr> &contexts, std::vector<IECore::ConstObjectPtr> &values ) const;
+
 		IE_CORE_FORWARDDECLARE( Engine )
 
 		/// Abstract base class for adding languages
@@ -120,6 +132,13 @@ class GAFFER_API Expression : public ComputeNode
 				/// to apply them to each of the individual output plugs.
 				/// \threading This function may be called concurrently.
 				virtual IECore::ConstObjectVectorPtr execute( const Context *context, const std::vector<const ValuePlug *> &proxyInputs ) const = 0;
+				/// Executes the last parsed expression once for each of the specified
+				/// contexts, filling `results` with the array that execute() would return
+				/// for each. The default implementation simply calls execute() with each
+				/// context in turn, but engines may reimplement it to amortise their
+				/// per-execution overhead across the batch.
+				/// \threading This function may be called concurrently.
+				virtual void executeBatch( const std::vector<ConstContextPtr> &contexts, const std::vector<const ValuePlug *> &proxyInputs, std::vector<IECore::ConstObjectVectorPtr> &results ) const;
 				//@}
 
 				/// @name Language utilities
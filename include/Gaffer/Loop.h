@@ -105,6 +105,9 @@ class IECORE_EXPORT Loop : public BaseType
 		const ValuePlug *ancestorPlug( const ValuePlug *plug, std::vector<IECore::InternedString> &relativeName ) const;
 		const ValuePlug *descendantPlug( const ValuePlug *plug, const std::vector<IECore::InternedString> &relativeName ) const;
 		const ValuePlug *sourcePlug( const ValuePlug *output, const Context *context, int &sourceLoopIndex, IECore::InternedString &indexVariable ) const;
+		// Returns true if the iterations before `sourceLoopIndex` should be
+		// evaluated in order before `source` itself is evaluated for `output`.
+		bool walkIterations( const ValuePlug *output, const ValuePlug *source, int sourceLoopIndex ) const;
 
 		IE_CORE_DECLARERUNTIMETYPEDDESCRIPTION( Loop<BaseType> );
 
@@ -203,6 +203,18 @@ void Loop<BaseType>::hash( const ValuePlug *output, const Context *context, IECo
 		Context::EditableScope tmpContext( context );
 		if( index >= 0 )
 		{
+			if( walkIterations( output, plug, index ) )
+			{
+				// Hash the earlier iterations in order, so that each one finds
+				// the hash of its predecessor in the cache, instead of recursing
+				// back through every iteration before it.
+				for( int i = 0; i < index; ++i )
+				{
+					IECore::Canceller::check( context->canceller() );
+					tmpContext.set<int>( indexVariable, i );
+					plug->hash();
+				}
+			}
 			tmpContext.set<int>( indexVariable, index );
 		}
 		else
@@ -226,6 +238,20 @@ void Loop<BaseType>::compute( ValuePlug *output, const Context *context ) const
 		Context::EditableScope tmpContext( context );
 		if( index >= 0 )
 		{
+			if( walkIterations( output, plug, index ) )
+			{
+				// As for `hash()`, compute the earlier iterations in order so
+				// that each one finds its predecessor in the cache. We have no
+				// generic way of getting the value of `plug`, but `setFrom()`
+				// does the job, and the final call below will replace the
+				// intermediate results.
+				for( int i = 0; i < index; ++i )
+				{
+					IECore::Canceller::check( context->canceller() );
+					tmpContext.set<int>( indexVariable, i );
+					output->setFrom( plug );
+				}
+			}
 			tmpContext.set<int>( indexVariable, index );
 		}
 		else
@@ -409,4 +435,28 @@ const ValuePlug *Loop<BaseType>::sourcePlug( const ValuePlug *output, const Cont
 	return nullptr;
 }
 
+template<typename BaseType>
+bool Loop<BaseType>::walkIterations( const ValuePlug *output, const ValuePlug *source, int sourceLoopIndex ) const
+{
+	// Evaluating iteration N recursively evaluates iteration N - 1 and
+	// so on, back to the first iteration. For large numbers of iterations
+	// that leads to very deep call stacks. We avoid that by walking forward
+	// through the iterations when the loop is evaluated via the output plug.
+	// Each iteration then finds its predecessor in the cache, so the call
+	// stack stays shallow and the cost is linear in the number of iterations.
+	// We don't walk for the previous plug, because it is evaluated by the
+	// loop body while we are walking, and walking again from there would
+	// be quadratic.
+	//
+	// Without caching for `source`, walking would compute each iteration
+	// many times over, so in that case we stick with recursion.
+	if( sourceLoopIndex < 2 || !source->getFlags( Plug::Cacheable ) )
+	{
+		return false;
+	}
+
+	std::vector<IECore::InternedString> relativeName;
+	return ancestorPlug( output, relativeName ) == outPlugInternal();
+}
+
 } // namespace Gaffer
@@ -39,12 +39,15 @@
 
 #include "Gaffer/Export.h"
 
+#include "IECore/MurmurHash.h"
+
 #include "boost/noncopyable.hpp"
 
 namespace Gaffer
 {
 
 class Process;
+class ValuePlug;
 
 /// Base class for monitoring node graph processes.
 class GAFFER_API Monitor : boost::noncopyable
@@ -84,6 +87,30 @@ class GAFFER_API Monitor : boost::noncopyable
 		/// Implementations must be safe to call concurrently.
 		virtual void processFinished( const Process *process ) = 0;
 
+		/// Cache events
+		/// ============
+		///
+		/// These methods report interactions with the cache of computed
+		/// values. The default implementations do nothing. Implementations
+		/// must be safe to call concurrently.
+
+		/// Called when a value for `plug` is found in the cache.
+		virtual void cacheHit( const ValuePlug *plug );
+		/// Called when a value for `plug` is not found in the cache.
+		virtual void cacheMiss( const ValuePlug *plug );
+		/// Called when a value for `plug` is inserted into the cache,
+		/// where it uses `bytes` of memory.
+		virtual void cacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes );
+		/// Called when a value is evicted or cleared from the cache. May
+		/// be called on any thread, not just those performing processes.
+		virtual void cacheEviction( const IECore::MurmurHash &hash );
+		/// Called at the end of a compute process for `plug` if another
+		/// process has already cached the same value. Typically this means
+		/// that the same value was computed concurrently on another thread,
+		/// and the work was wasted. It also occurs when a compute passes
+		/// through a value computed upstream, but that work is not wasted.
+		virtual void duplicateCompute( const ValuePlug *plug );
+
 };
 
 } // namespace Gaffer
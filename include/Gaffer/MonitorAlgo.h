@@ -60,9 +60,15 @@ enum PerformanceMetric
 	HashCount,
 	ComputeCount,
 	HashesPerCompute,
+	CacheHitCount,
+	CacheMissCount,
+	CacheBytesInserted,
+	CacheEvictionCount,
+	DuplicateComputeCount,
+	DuplicateComputeDuration,
 
 	First = TotalDuration,
-	Last = HashesPerCompute
+	Last = DuplicateComputeDuration
 };
 
 GAFFER_API std::string formatStatistics( const PerformanceMonitor &monitor, size_t maxLinesPerMetric = 50 );
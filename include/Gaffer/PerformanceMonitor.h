@@ -39,11 +39,13 @@
 
 #include "Gaffer/Monitor.h"
 
+#include "IECore/MurmurHash.h"
 #include "IECore/RefCounted.h"
 
 #include "boost/chrono.hpp"
 #include "boost/unordered_map.hpp"
 
+#include "tbb/concurrent_hash_map.h"
 #include "tbb/enumerable_thread_specific.h"
 
 #include <stack>
@@ -54,7 +56,8 @@ namespace Gaffer
 IE_CORE_FORWARDDECLARE( Plug )
 
 /// A monitor which collects statistics about the frequency
-/// and duration of hash and compute processes per plug.
+/// and duration of hash and compute processes per plug, and
+/// about the use each plug makes of the compute cache.
 class GAFFER_API PerformanceMonitor : public Monitor
 {
 
@@ -70,7 +73,13 @@ class GAFFER_API PerformanceMonitor : public Monitor
 				size_t hashCount = 0,
 				size_t computeCount = 0,
 				boost::chrono::nanoseconds hashDuration = boost::chrono::nanoseconds( 0 ),
-				boost::chrono::nanoseconds computeDuration = boost::chrono::nanoseconds( 0 )
+				boost::chrono::nanoseconds computeDuration = boost::chrono::nanoseconds( 0 ),
+				size_t cacheHitCount = 0,
+				size_t cacheMissCount = 0,
+				size_t cacheBytesInserted = 0,
+				size_t cacheEvictionCount = 0,
+				size_t duplicateComputeCount = 0,
+				boost::chrono::nanoseconds duplicateComputeDuration = boost::chrono::nanoseconds( 0 )
 			);
 
 			size_t hashCount;
@@ -78,6 +87,20 @@ class GAFFER_API PerformanceMonitor : public Monitor
 			boost::chrono::nanoseconds hashDuration;
 			boost::chrono::nanoseconds computeDuration;
 
+			// Number of times a value was found in the compute cache,
+			// and the number of times it had to be computed instead.
+			size_t cacheHitCount;
+			size_t cacheMissCount;
+			// Total memory inserted into the compute cache, and the
+			// number of those entries which have since been evicted.
+			size_t cacheBytesInserted;
+			size_t cacheEvictionCount;
+			// Number of computes whose result turned out to be cached
+			// already by the time they completed, and the time spent
+			// in them. See `Monitor::duplicateCompute()`.
+			size_t duplicateComputeCount;
+			boost::chrono::nanoseconds duplicateComputeDuration;
+
 			Statistics & operator += ( const Statistics &rhs );
 
 			bool operator == ( const Statistics &rhs );
@@ -97,6 +120,12 @@ class GAFFER_API PerformanceMonitor : public Monitor
 		void processStarted( const Process *process ) override;
 		void processFinished( const Process *process ) override;
 
+		void cacheHit( const ValuePlug *plug ) override;
+		void cacheMiss( const ValuePlug *plug ) override;
+		void cacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes ) override;
+		void cacheEviction( const IECore::MurmurHash &hash ) override;
+		void duplicateCompute( const ValuePlug *plug ) override;
+
 	private :
 
 		// For performance reasons we accumulate our statistics into
@@ -107,8 +136,19 @@ class GAFFER_API PerformanceMonitor : public Monitor
 			StatisticsMap statistics;
 			// Stack of durations pointing into the statistics map.
 			// The top of the stack is the duration we're billing the
-			// current chunk of time to.
-			typedef std::stack<boost::chrono::nanoseconds *> DurationStack;
+			// current chunk of time to. We also accumulate the total
+			// time for each process, so that it can be billed to
+			// `duplicateComputeDuration` if necessary.
+			struct Duration
+			{
+				Duration( const Process *process, boost::chrono::nanoseconds *target, boost::chrono::nanoseconds *duplicateTarget );
+				const Process *process;
+				boost::chrono::nanoseconds *target;
+				boost::chrono::nanoseconds *duplicateTarget;
+				boost::chrono::nanoseconds elapsed;
+				bool duplicate;
+			};
+			typedef std::stack<Duration> DurationStack;
 			DurationStack durationStack;
 			// The last time measurement we made.
 			boost::chrono::high_resolution_clock::time_point then;
@@ -116,6 +156,11 @@ class GAFFER_API PerformanceMonitor : public Monitor
 
 		tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance> m_threadData;
 
+		// Cache evictions are reported by hash alone, so we record the
+		// plug responsible for each cache entry we have seen inserted.
+		typedef tbb::concurrent_hash_map<IECore::MurmurHash, ConstPlugPtr> CacheEntries;
+		CacheEntries m_cacheEntries;
+
 		// Then when we want to query it, we collate it into m_statistics.
 		void collate() const;
 		mutable StatisticsMap m_statistics;
@@ -106,10 +106,17 @@ class GAFFER_API Plug : public GraphComponent
 			/// this flag must be used by such nodes to indicate that the cycle is
 			/// intentional in this case, and is guaranteed to terminate during compute.
 			AcceptsDependencyCycles = 0x00000010,
+			/// If the DiskCacheable flag is set in addition to the Cacheable flag,
+			/// then computed values may also be stored in the disk cache, and
+			/// shared with other processes. Because the disk cache is slower than
+			/// the memory cache and persists between sessions, this should only
+			/// be set for plugs whose values are expensive to compute. See
+			/// `ValuePlug::setDiskCacheDirectory()` for more details.
+			DiskCacheable = 0x00000020,
 			/// When adding values, don't forget to update the Default and All values below,
 			/// and to update PlugBinding.cpp too!
 			Default = Serialisable | AcceptsInputs | Cacheable,
-			All = Dynamic | Serialisable | AcceptsInputs | Cacheable | AcceptsDependencyCycles
+			All = Dynamic | Serialisable | AcceptsInputs | Cacheable | AcceptsDependencyCycles | DiskCacheable
 		};
 
 		Plug( const std::string &name=defaultName<Plug>(), Direction direction=In, unsigned flags=Default );
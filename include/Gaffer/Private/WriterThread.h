@@ -0,0 +1,108 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2018, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef GAFFER_WRITERTHREAD_H
+#define GAFFER_WRITERTHREAD_H
+
+#include "boost/noncopyable.hpp"
+
+#include "tbb/concurrent_queue.h"
+
+#include <atomic>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <thread>
+
+namespace Gaffer
+{
+
+namespace Private
+{
+
+/// Writes items on a dedicated thread, in the order in which they were
+/// pushed. This allows the writing of each item to overlap with the
+/// computation of the items which follow it. The queue is bounded, so
+/// `push()` blocks when writing can't keep up, limiting the memory used
+/// by items waiting to be written.
+///
+/// If writing an item throws, all subsequent items are discarded, and
+/// the exception is rethrown by `finish()`.
+template<typename T>
+class WriterThread : boost::noncopyable
+{
+
+	public :
+
+		typedef std::shared_ptr<T> ItemPtr;
+		typedef std::function<void ( const T & )> WriteFunction;
+
+		WriterThread( const WriteFunction &writeFunction, size_t queueCapacity );
+		/// If `finish()` has not been called, any items still
+		/// waiting to be written are discarded.
+		~WriterThread();
+
+		/// Queues an item for writing. May be called concurrently
+		/// from several threads.
+		void push( const ItemPtr &item );
+		/// Returns true if writing has failed, in which case
+		/// there is no point pushing further items.
+		bool failed() const;
+		/// Waits for all items to be written, rethrowing any
+		/// exception thrown while writing.
+		void finish();
+
+	private :
+
+		void run();
+
+		WriteFunction m_writeFunction;
+		tbb::concurrent_bounded_queue<ItemPtr> m_queue;
+		std::atomic<bool> m_failed;
+		std::exception_ptr m_exception;
+		// Declared last, so that everything above is
+		// initialised before the thread starts.
+		std::thread m_thread;
+
+};
+
+} // namespace Private
+
+} // namespace Gaffer
+
+#include "Gaffer/Private/WriterThread.inl"
+
+#endif // GAFFER_WRITERTHREAD_H
@@ -0,0 +1,126 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2018, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef GAFFER_WRITERTHREAD_INL
+#define GAFFER_WRITERTHREAD_INL
+
+namespace Gaffer
+{
+
+namespace Private
+{
+
+template<typename T>
+WriterThread<T>::WriterThread( const WriteFunction &writeFunction, size_t queueCapacity )
+	:	m_writeFunction( writeFunction ), m_failed( false )
+{
+	m_queue.set_capacity( queueCapacity );
+	m_thread = std::thread( &WriterThread::run, this );
+}
+
+template<typename T>
+WriterThread<T>::~WriterThread()
+{
+	if( m_thread.joinable() )
+	{
+		// We're typically being destroyed due to an exception,
+		// so there's no point writing anything else.
+		m_failed = true;
+		m_queue.push( ItemPtr() );
+		m_thread.join();
+	}
+}
+
+template<typename T>
+void WriterThread<T>::push( const ItemPtr &item )
+{
+	m_queue.push( item );
+}
+
+template<typename T>
+bool WriterThread<T>::failed() const
+{
+	return m_failed;
+}
+
+template<typename T>
+void WriterThread<T>::finish()
+{
+	m_queue.push( ItemPtr() );
+	m_thread.join();
+
+	if( m_exception )
+	{
+		std::rethrow_exception( m_exception );
+	}
+}
+
+template<typename T>
+void WriterThread<T>::run()
+{
+	while( true )
+	{
+		ItemPtr item;
+		m_queue.pop( item );
+		if( !item )
+		{
+			break;
+		}
+
+		if( m_failed )
+		{
+			// Keep draining, so that `push()` doesn't
+			// block forever on a full queue.
+			continue;
+		}
+
+		try
+		{
+			m_writeFunction( *item );
+		}
+		catch( ... )
+		{
+			m_exception = std::current_exception();
+			m_failed = true;
+		}
+	}
+}
+
+} // namespace Private
+
+} // namespace Gaffer
+
+#endif // GAFFER_WRITERTHREAD_INL
@@ -40,6 +40,7 @@
 #include "Gaffer/Export.h"
 
 #include "IECore/InternedString.h"
+#include "IECore/MurmurHash.h"
 
 #include "boost/noncopyable.hpp"
 
@@ -50,6 +51,7 @@ namespace Gaffer
 
 class Context;
 class Plug;
+class ValuePlug;
 class Monitor;
 
 /// Base class representing a node graph process being
@@ -102,6 +104,15 @@ class GAFFER_API Process : public boost::noncopyable
 		/// we use C++11's current_exception() in our destructor perhaps?
 		void handleException();
 
+		/// Derived classes which cache their results should call these
+		/// methods to report cache activity to any active monitors. See
+		/// the Monitor class for details.
+		static void reportCacheHit( const ValuePlug *plug );
+		static void reportCacheMiss( const ValuePlug *plug );
+		static void reportCacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes );
+		static void reportCacheEviction( const IECore::MurmurHash &hash );
+		static void reportDuplicateCompute( const ValuePlug *plug );
+
 	private :
 
 		// Friendship allows monitors to register and deregister
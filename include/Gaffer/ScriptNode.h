@@ -47,6 +47,7 @@
 #include "Gaffer/UndoScope.h"
 
 #include <functional>
+#include <map>
 #include <stack>
 
 namespace GafferModule
@@ -214,6 +215,36 @@ class GAFFER_API ScriptNode : public Node
 		bool importFile( const std::string &fileName, Node *parent = nullptr, bool continueOnError = false );
 		//@}
 
+		//! @name Loading performance
+		/// Loading a script also loads the files for any References it
+		/// contains. By default, these files are read in parallel as soon
+		/// as the script itself has been read, while execution proceeds
+		/// in serialisation order on the calling thread.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		/// Enables or disables the parallel reading of referenced files.
+		static void setParallelLoading( bool parallelLoading );
+		static bool getParallelLoading();
+		struct LoadStatistics
+		{
+			LoadStatistics();
+			/// The number of times the file was loaded.
+			size_t loads;
+			/// The time spent waiting for the file to be read, in seconds.
+			/// This is less than the time taken to actually read the
+			/// file when it is read in parallel.
+			double readTime;
+			/// The total time spent loading the file, in seconds. This
+			/// includes the time spent loading any References it contains.
+			double totalTime;
+		};
+		typedef std::map<std::string, LoadStatistics> LoadStatisticsMap;
+		/// Returns statistics for all the files loaded by `load()`,
+		/// `executeFile()` and `importFile()`.
+		static LoadStatisticsMap loadStatistics();
+		static void resetLoadStatistics();
+		//@}
+
 		//! @name Computation context
 		///
 		/// The ScriptNode provides a default context that is
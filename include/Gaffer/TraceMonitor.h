@@ -0,0 +1,122 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2018, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef GAFFER_TRACEMONITOR_H
+#define GAFFER_TRACEMONITOR_H
+
+#include "Gaffer/Monitor.h"
+
+#include "IECore/InternedString.h"
+#include "IECore/MurmurHash.h"
+#include "IECore/RefCounted.h"
+
+#include "boost/chrono.hpp"
+
+#include "tbb/enumerable_thread_specific.h"
+
+#include <atomic>
+#include <iostream>
+#include <vector>
+
+namespace Gaffer
+{
+
+IE_CORE_FORWARDDECLARE( Plug )
+
+/// A monitor which records the start and end of every process,
+/// preserving the ordering and threading information that is
+/// lost by the PerformanceMonitor. The results may be written
+/// in the Chrome trace event format, for viewing in
+/// `chrome://tracing` or https://ui.perfetto.dev.
+class GAFFER_API TraceMonitor : public Monitor
+{
+
+	public :
+
+		TraceMonitor();
+		~TraceMonitor() override;
+
+		/// Writes all events recorded so far as Chrome trace event JSON.
+		/// Must not be called while processes are being monitored.
+		void writeTrace( std::ostream &stream ) const;
+		void writeTrace( const std::string &fileName ) const;
+
+		/// Discards all events recorded so far.
+		/// Must not be called while processes are being monitored.
+		void clear();
+
+	protected :
+
+		void processStarted( const Process *process ) override;
+		void processFinished( const Process *process ) override;
+
+	private :
+
+		typedef boost::chrono::high_resolution_clock Clock;
+
+		struct Event
+		{
+			// Null for the end of a process.
+			ConstPlugPtr plug;
+			IECore::InternedString type;
+			IECore::MurmurHash contextHash;
+			Clock::time_point time;
+		};
+
+		// Events are appended to thread local storage while processes
+		// are running, so no locking is required.
+		struct ThreadData
+		{
+			ThreadData();
+			int threadIndex;
+			// Number of processes started on this thread while we were
+			// active, so we can ignore the ends of processes which started
+			// before that.
+			size_t depth;
+			std::vector<Event> events;
+		};
+
+		ThreadData &threadData();
+
+		tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance> m_threadData;
+		std::atomic_int m_numThreads;
+		const Clock::time_point m_start;
+
+};
+
+} // namespace Gaffer
+
+#endif // GAFFER_TRACEMONITOR_H
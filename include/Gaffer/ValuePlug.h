@@ -116,6 +116,82 @@ class GAFFER_API ValuePlug : public Plug
 		static void clearCache();
 		//@}
 
+		/// @name Hash cache
+		/// Each thread keeps a cache of recently computed hashes, which
+		/// avoids repeated hash computations during evaluation of a single
+		/// graph. Entries are invalidated when their plug is dirtied, and
+		/// the least recently used entries are evicted when the cache
+		/// exceeds its size limit.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the maximum number of entries in each thread's cache.
+		static size_t getHashCacheSizeLimit();
+		static void setHashCacheSizeLimit( size_t entries );
+		/// Clears the caches for all threads. This is only necessary
+		/// when a change affects hashes without dirtying any plugs,
+		/// such as a change to a process-wide setting.
+		static void clearHashCache();
+		/// Statistics for the hash cache, summed over all threads and
+		/// accumulated since the last call to resetHashCacheStatistics().
+		static size_t hashCacheHits();
+		static size_t hashCacheMisses();
+		static void resetHashCacheStatistics();
+		//@}
+
+		/// @name Disk cache
+		/// In addition to the in-memory cache, values for plugs with the
+		/// `Plug::DiskCacheable` flag may be stored in a second level cache
+		/// on disk. Because this is keyed by the plug hash, it may be shared
+		/// between processes - for instance the `gaffer execute` processes
+		/// launched by a dispatcher - allowing one process to reuse expensive
+		/// upstream computations performed by another. Pointing the cache at
+		/// a RAM backed filesystem such as `/dev/shm` provides a shared memory
+		/// cache. Values which cannot be serialised are simply not stored.
+		/// Each process indexes the contents of the cache when first using it,
+		/// and refreshes the index only when evicting values, so values written
+		/// by processes running concurrently may not be seen immediately.
+		///
+		/// Since hashes are only meaningful to the code that generated them,
+		/// values are only shared between processes which have loaded
+		/// identical builds of the same libraries. Nodes must also take care
+		/// that their hashes account for everything which could differ between
+		/// processes, using `markHashUnstable()` and `hashFileModificationTime()`
+		/// as necessary.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		/// Sets the directory used for the disk cache. An empty string
+		/// (the default) disables the disk cache. Should not be called
+		/// while computations are in progress.
+		static void setDiskCacheDirectory( const std::string &directory );
+		static std::string getDiskCacheDirectory();
+		/// The disk cache is limited to approximately this many bytes,
+		/// with the least recently used values being evicted first.
+		static size_t getDiskCacheSizeLimit();
+		static void setDiskCacheSizeLimit( size_t bytes );
+		/// Removes all files from the disk cache.
+		static void clearDiskCache();
+		/// Statistics for the disk cache, accumulated since the
+		/// last call to resetDiskCacheStatistics().
+		static size_t diskCacheHits();
+		static size_t diskCacheMisses();
+		static size_t diskCacheWrites();
+		static size_t diskCacheEvictions();
+		static void resetDiskCacheStatistics();
+		/// Must be called from `ComputeNode::hash()` by nodes whose hash is
+		/// not stable between processes - for instance because it includes a
+		/// pointer, or `Context::hash()`. Appends a value unique to this
+		/// process to `h`, so that neither it nor any hash derived from it
+		/// can match a value stored by another process.
+		static void markHashUnstable( IECore::MurmurHash &h );
+		/// Must be called from `ComputeNode::hash()` by nodes which read
+		/// files, so that values computed from a file are not reused after
+		/// the file has been modified. Appends the modification time and
+		/// size of the file to `h`, but only when the disk cache is enabled,
+		/// since within a single process changes to files are only expected
+		/// to be picked up following an explicit refresh.
+		static void hashFileModificationTime( const std::string &fileName, IECore::MurmurHash &h );
+		//@}
+
 	protected :
 
 		/// This constructor must be used by all derived classes which wish
@@ -178,6 +254,8 @@ class GAFFER_API ValuePlug : public Plug
 		IECore::ConstObjectPtr m_defaultValue;
 		// For holding the value of input plugs with no input connections.
 		IECore::ConstObjectPtr m_staticValue;
+		// Used to invalidate hash cache entries when the plug is dirtied.
+		uint64_t m_hashCacheGeneration;
 
 };
 
@@ -55,6 +55,18 @@ class GAFFERIMAGE_API Blur : public ImageProcessor
 
 		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( GafferImage::Blur, BlurTypeId, ImageProcessor );
 
+		enum Mode
+		{
+			/// Filters with a true gaussian, at a cost
+			/// proportional to the radius.
+			Exact = 0,
+			/// Approximates the gaussian with a cascade of
+			/// box filters. The filtering cost per pixel is
+			/// independent of the radius, but each tile must
+			/// still fetch an input region which grows with it.
+			Approximate = 1
+		};
+
 		Gaffer::V2fPlug *radiusPlug();
 		const Gaffer::V2fPlug *radiusPlug() const;
 
@@ -64,6 +76,9 @@ class GAFFERIMAGE_API Blur : public ImageProcessor
 		Gaffer::BoolPlug *expandDataWindowPlug();
 		const Gaffer::BoolPlug *expandDataWindowPlug() const;
 
+		Gaffer::IntPlug *modePlug();
+		const Gaffer::IntPlug *modePlug() const;
+
 		void affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const override;
 
 	protected :
@@ -84,6 +99,22 @@ class GAFFERIMAGE_API Blur : public ImageProcessor
 		Resample *resample();
 		const Resample *resample() const;
 
+		// Output plug to compute the filter widths for the internal box
+		// Resamples used by the Approximate mode. Has a V2fPlug child for
+		// each box.
+		Gaffer::ValuePlug *boxFilterScalesPlug();
+		const Gaffer::ValuePlug *boxFilterScalesPlug() const;
+
+		// Input plugs to receive the results of the last box Resample.
+		Gaffer::AtomicBox2iPlug *approximateDataWindowPlug();
+		const Gaffer::AtomicBox2iPlug *approximateDataWindowPlug() const;
+		Gaffer::FloatVectorDataPlug *approximateChannelDataPlug();
+		const Gaffer::FloatVectorDataPlug *approximateChannelDataPlug() const;
+
+		// Internal box resample nodes, applied in sequence.
+		Resample *boxResample( size_t index );
+		const Resample *boxResample( size_t index ) const;
+
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
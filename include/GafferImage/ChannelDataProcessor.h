@@ -47,12 +47,18 @@ namespace GafferImage
 
 /// The ChannelDataProcessor provides a useful base class for nodes that manipulate individual channels
 /// of an image and leave their image dimensions, channel names, and metadata unchanged.
+///
+/// By default each channel is computed separately. Derived classes which can share work between
+/// the channels of a layer may instead pass `processLayers = true` to the constructor, in which
+/// case the R, G, B and A channels of each layer are processed together for each tile, by a single
+/// call to `processLayerData()`. The results are then distributed to the individual channels,
+/// which are cached separately as usual.
 class GAFFERIMAGE_API ChannelDataProcessor : public ImageProcessor
 {
 
 	public :
 
-		ChannelDataProcessor( const std::string &name=defaultName<ChannelDataProcessor>() );
+		ChannelDataProcessor( const std::string &name=defaultName<ChannelDataProcessor>(), bool processLayers = false );
 		~ChannelDataProcessor() override;
 
 		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( GafferImage::ChannelDataProcessor, ChannelDataProcessorTypeId, ImageProcessor );
@@ -67,6 +73,10 @@ class GAFFERIMAGE_API ChannelDataProcessor : public ImageProcessor
 		/// This implementation queries whether or not the requested channel is masked by the channelMaskPlug().
 		bool channelEnabled( const std::string &channel ) const override;
 
+		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
+		/// Implemented to compute the intermediate results used when processing layers.
+		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
+
 		/// Implemented to initialize the output tile and then call processChannelData()
 		/// All other ImagePlug children are passed through via direct connection to the input values.
 		IECore::ConstFloatVectorDataPtr computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const override;
@@ -78,9 +88,28 @@ class GAFFERIMAGE_API ChannelDataProcessor : public ImageProcessor
 		///                     It is useful for querying Color4f plugs for the value that coresponds to the channel being processed.
 		/// @param outData The tile where the result of the operation should be written. It is initialized with the coresponding tile data from inPlug() which should be used as the input data.
 		virtual void processChannelData( const Gaffer::Context *context, const ImagePlug *parent, const std::string &channel, IECore::FloatVectorDataPtr outData ) const = 0;
+		/// Used instead of `processChannelData()` for the R, G, B and A channels when
+		/// `processLayers` was passed to the constructor. The `channels` and `outData`
+		/// arguments contain the enabled channels of a single layer, and the tiles to
+		/// process for them, initialized from the corresponding input tiles. The default
+		/// implementation calls `processChannelData()` for each channel in turn.
+		virtual void processLayerData( const Gaffer::Context *context, const ImagePlug *parent, const std::vector<std::string> &channels, const std::vector<IECore::FloatVectorDataPtr> &outData ) const;
 
 	private :
 
+		// Used to store the results of processLayerData(), so that they can be reused by
+		// computeChannelData(). Evaluated in a context with an
+		// "image:channelDataProcessor:__layerName" variable, so we can cache different
+		// results per layer.
+		Gaffer::ObjectPlug *layerDataPlug();
+		const Gaffer::ObjectPlug *layerDataPlug() const;
+
+		// Returns the enabled R, G, B and A channels of the layer
+		// specified by the context.
+		std::vector<std::string> layerChannels( const Gaffer::Context *context ) const;
+
+		const bool m_processLayers;
+
 		static size_t g_firstPlugIndex;
 
 };
@@ -156,7 +156,24 @@ class GAFFERIMAGE_API ImagePlug : public Gaffer::ValuePlug
 			void setChannelName( const std::string &channelName );
 		};
 
+		/// @name Tile size
+		/// Images are processed in square tiles, the size of which
+		/// is a process-wide setting. Smaller tiles waste less work
+		/// at the edges of data windows and improve interactive
+		/// responsiveness, while larger tiles reduce the overhead
+		/// of hashing, caching and context management per tile.
+		////////////////////////////////////////////////////////////////////
+		//@{
 		static int tileSize() { return 1 << tileSizeLog2(); };
+		/// Sets the tile size, which must be a power of two between
+		/// 16 and 1024 inclusive. This should be called on startup,
+		/// before any ImagePlugs have been created, because the
+		/// default values of existing plugs are not resized. The
+		/// default size of 64 may be overridden with the
+		/// GAFFERIMAGE_TILE_SIZE environment variable.
+		static void setTileSize( int tileSize );
+		//@}
+
 		static const IECore::FloatVectorData *blackTile();
 		static const IECore::FloatVectorData *whiteTile();
 
@@ -176,7 +193,8 @@ class GAFFERIMAGE_API ImagePlug : public Gaffer::ValuePlug
 
 
 	private :
-		static int tileSizeLog2() { return 6; };
+		static int tileSizeLog2() { return g_tileSizeLog2; };
+		static int g_tileSizeLog2;
 
 		static void compoundObjectToCompoundData( const IECore::CompoundObject *object, IECore::CompoundData *data );
 
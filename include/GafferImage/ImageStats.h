@@ -42,6 +42,8 @@
 #include "Gaffer/BoxPlug.h"
 #include "Gaffer/CompoundNumericPlug.h"
 #include "Gaffer/ComputeNode.h"
+#include "Gaffer/NumericPlug.h"
+#include "Gaffer/TypedObjectPlug.h"
 
 namespace GafferImage
 {
@@ -78,16 +80,48 @@ class GAFFERIMAGE_API ImageStats : public Gaffer::ComputeNode
 		Gaffer::Color4fPlug *maxPlug();
 		const Gaffer::Color4fPlug *maxPlug() const;
 
+		/// The range of values covered by the histogram. Values
+		/// outside the range are counted in the first or last bin.
+		Gaffer::V2fPlug *histogramRangePlug();
+		const Gaffer::V2fPlug *histogramRangePlug() const;
+
+		Gaffer::IntPlug *histogramBinsPlug();
+		const Gaffer::IntPlug *histogramBinsPlug() const;
+
+		/// The percentile to be output on `percentileValuePlug()`,
+		/// in the range 0-100.
+		Gaffer::FloatPlug *percentilePlug();
+		const Gaffer::FloatPlug *percentilePlug() const;
+
+		/// Outputs an IntVectorData histogram for each analysed
+		/// channel, keyed by channel name.
+		Gaffer::AtomicCompoundDataPlug *histogramPlug();
+		const Gaffer::AtomicCompoundDataPlug *histogramPlug() const;
+
+		/// The per-channel values below which `percentilePlug()`
+		/// percent of the pixels lie. These are interpolated from the
+		/// histogram, so their accuracy depends on the number of bins.
+		Gaffer::Color4fPlug *percentileValuePlug();
+		const Gaffer::Color4fPlug *percentileValuePlug() const;
+
 	protected :
 
-		/// Implemented to hash the area we are sampling along with the channel context and regionOfInterest.
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
-
-		/// Computes the min, max and average plugs by analyzing the input ImagePlug.
 		void compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const override;
 
 	private :
 
+		// Statistics are gathered separately for each tile, on a plug
+		// evaluated with the tile origin and channel name in the
+		// context. This means that only the affected tiles need to be
+		// recomputed when the image or area changes. The tiles are then
+		// merged in parallel into statistics for the whole area, on a
+		// plug evaluated with only the channel name in the context.
+		Gaffer::ObjectPlug *tileStatsPlug();
+		const Gaffer::ObjectPlug *tileStatsPlug() const;
+		Gaffer::ObjectPlug *channelStatsPlug();
+		const Gaffer::ObjectPlug *channelStatsPlug() const;
+
 		std::string channelName( int colorIndex ) const;
 
 		static size_t g_firstPlugIndex;
@@ -86,6 +86,41 @@ class GAFFERIMAGE_API OpenImageIOReader : public ImageNode
 
 		static size_t supportedExtensions( std::vector<std::string> &extensions );
 
+		/// \name File cache
+		/// All OpenImageIOReaders share a cache of open files.
+		////////////////////////////////////////////////////////////////////
+		//@{
+		/// Limits the number of files which may be open at once, with the
+		/// least recently used files being closed first.
+		static size_t getOpenFilesLimit();
+		static void setOpenFilesLimit( size_t maxOpenFiles );
+		/// Multiple handles may be opened for each file, allowing different
+		/// regions of the file to be read concurrently. Takes effect for
+		/// files opened after the call.
+		static size_t getHandlesPerFile();
+		static void setHandlesPerFile( size_t handlesPerFile );
+		/// Tiled files are read in batches of tiles at least this many pixels
+		/// wide and high. Larger batches reduce the waste from file tiles which
+		/// straddle batch boundaries, but read more data than may be needed.
+		/// Changing the size closes all open files and clears the
+		/// ValuePlug caches.
+		static int getTileBatchSize();
+		static void setTileBatchSize( int pixels );
+		/// The number of file handles currently open.
+		static size_t openFileHandles();
+		/// Statistics accumulated since the last call to resetStatistics().
+		/// Evictions count only the files closed to stay within the open
+		/// files limit. Bytes read counts pixel data in the file's own
+		/// data formats, before conversion to float and ignoring any
+		/// compression. The lock wait time is the total time in seconds
+		/// that threads have spent waiting for another thread to finish
+		/// reading from a file handle.
+		static size_t fileCacheEvictions();
+		static size_t bytesRead();
+		static double lockWaitTime();
+		static void resetStatistics();
+		//@}
+
 	protected :
 
 		void hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
@@ -98,6 +98,11 @@ class GAFFERIMAGE_API RankFilter : public ImageProcessor
 		Gaffer::V2iVectorDataPlug *pixelOffsetsPlug();
 		const Gaffer::V2iVectorDataPlug *pixelOffsetsPlug() const;
 
+		// Computes the rank for every pixel in a tile, given the input
+		// pixels within `radius` of the tile. Uses algorithms whose cost
+		// is independent of the radius when the radius is large.
+		void rankValues( const std::vector<float> &input, const Imath::V2i &radius, const Gaffer::Context *context, std::vector<float> &result ) const;
+
 		static size_t g_firstPlugIndex;
 		int m_mode;
 };
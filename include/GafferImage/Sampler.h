@@ -95,6 +95,15 @@ class GAFFERIMAGE_API Sampler
 		/// 0.5, 0.5.
 		inline float sample( float x, float y );
 
+		/// Copies the integer pixel values within `region` into
+		/// `buffer`, in scanline order starting at `region.min`.
+		/// This is preferable to calling `sample()` once per pixel
+		/// for processes which need to visit every pixel in a region
+		/// many times. It is the caller's responsibility to ensure
+		/// that `region` is contained within the sample window
+		/// passed to the constructor.
+		void sampleRegion( const Imath::Box2i &region, std::vector<float> &buffer );
+
 		/// Appends a hash that represent all the pixel
 		/// values within the requested sample area.
 		void hash( IECore::MurmurHash &h ) const;
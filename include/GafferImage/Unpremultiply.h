@@ -69,6 +69,7 @@ class GAFFERIMAGE_API Unpremultiply : public ChannelDataProcessor
 
 		void hashChannelData( const GafferImage::ImagePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const override;
 		void processChannelData( const Gaffer::Context *context, const ImagePlug *parent, const std::string &channelIndex, IECore::FloatVectorDataPtr outData ) const override;
+		void processLayerData( const Gaffer::Context *context, const ImagePlug *parent, const std::vector<std::string> &channels, const std::vector<IECore::FloatVectorDataPtr> &outData ) const override;
 
 	private :
 
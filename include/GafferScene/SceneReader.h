@@ -42,6 +42,9 @@
 #include "IECoreScene/SceneInterface.h"
 
 #include "tbb/enumerable_thread_specific.h"
+#include "tbb/spin_mutex.h"
+
+#include <set>
 
 namespace Gaffer
 {
@@ -78,6 +81,13 @@ class GAFFERSCENE_API SceneReader : public SceneNode
 
 		static size_t supportedExtensions( std::vector<std::string> &extensions );
 
+		/// All SceneReaders share a cache of open files, separate from
+		/// `IECoreScene::SharedSceneInterfaces`. This limits the number
+		/// of files which may be open at once, with the least recently
+		/// used files being closed first.
+		static size_t getOpenFilesLimit();
+		static void setOpenFilesLimit( size_t maxOpenFiles );
+
 	protected :
 
 		/// \todo These methods defer to SceneInterface::hash() to do most of the work, but we could go further.
@@ -126,6 +136,12 @@ class GAFFERSCENE_API SceneReader : public SceneNode
 		// and specified path, using m_lastScene to accelerate the lookups.
 		IECoreScene::ConstSceneInterfacePtr scene( const ScenePath &path ) const;
 
+		// The files we have loaded from the shared file cache. We
+		// remove only these from the cache when refreshCountPlug()
+		// is incremented, so that other nodes are unaffected.
+		mutable tbb::spin_mutex m_fileNamesMutex;
+		mutable std::set<std::string> m_fileNames;
+
 		static const double g_frameRate;
 		static size_t g_firstPlugIndex;
 
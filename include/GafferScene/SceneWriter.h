@@ -74,7 +74,10 @@ class GAFFERSCENE_API SceneWriter : public GafferDispatch::TaskNode
 		void execute() const override;
 
 		/// Re-implemented to open the file for writing, then iterate through the
-		/// frames, modifying the current Context and calling writeLocation().
+		/// frames, modifying the current Context and writing every location.
+		/// Locations are computed in parallel and queued for writing by a single
+		/// dedicated output thread. Throughput statistics are reported via a
+		/// Debug message once writing is complete.
 		void executeSequence( const std::vector<float> &frames ) const override;
 
 		/// Re-implemented to return true, since the entire file must be written at once.
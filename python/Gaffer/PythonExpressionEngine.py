@@ -55,7 +55,6 @@ class PythonExpressionEngine( Gaffer.Expression.Engine ) :
 
 		parser = _Parser( expression )
 
-		self.__expression = expression
 		self.__inPlugPaths = list( parser.plugReads )
 		self.__outPlugPaths = list( parser.plugWrites )
 
@@ -63,37 +62,65 @@ class PythonExpressionEngine( Gaffer.Expression.Engine ) :
 		outPlugs.extend( [ self.__plug( node, p ) for p in self.__outPlugPaths ] )
 		contextNames.extend( parser.contextReads )
 
+		# Do as much work as possible up front, so that `execute()` has
+		# as little to do as possible - it may be called for many thousands
+		# of contexts. We compile the expression to a code object once,
+		# and precompute the layout of the nested dictionaries used to
+		# provide `parent["node"]["plug"]` access. The layout is stored as
+		# a list of `( parentIndex, name )` pairs, one per dictionary,
+		# ordered so that parents are created before their children, and
+		# each plug is located by the index of its dictionary and its name.
+
+		self.__code = compile( expression, "<string>", "exec" )
+
+		dictIndices = { () : 0 }
+		self.__dictLayout = []
+		def plugLocation( plugPath ) :
+			plugPathSplit = tuple( plugPath.split( "." ) )
+			for i in range( 1, len( plugPathSplit ) ) :
+				dictPath = plugPathSplit[:i]
+				if dictPath not in dictIndices :
+					dictIndices[dictPath] = len( dictIndices )
+					self.__dictLayout.append( ( dictIndices[dictPath[:-1]], dictPath[-1] ) )
+			return ( dictIndices[plugPathSplit[:-1]], plugPathSplit[-1] )
+
+		self.__inPlugLocations = [ plugLocation( p ) for p in self.__inPlugPaths ]
+		self.__outPlugLocations = [ plugLocation( p ) for p in self.__outPlugPaths ]
+
 	def execute( self, context, inputs ) :
 
-		plugDict = {}
-		for plugPath, plug in zip( self.__inPlugPaths, inputs ) :
-			parentDict = plugDict
-			plugPathSplit = plugPath.split( "." )
-			for p in plugPathSplit[:-1] :
-				parentDict = parentDict.setdefault( p, {} )
+		dicts = [ {} ]
+		for parentIndex, name in self.__dictLayout :
+			d = {}
+			dicts[parentIndex][name] = d
+			dicts.append( d )
+
+		for ( dictIndex, name ), plug in zip( self.__inPlugLocations, inputs ) :
 			if isinstance( plug, Gaffer.CompoundDataPlug ) :
 				value = IECore.CompoundData()
 				plug.fillCompoundData( value )
 			else :
 				value = plug.getValue()
-			parentDict[plugPathSplit[-1]] = value
+			dicts[dictIndex][name] = value
 
-		for plugPath in self.__outPlugPaths :
-			parentDict = plugDict
-			for p in plugPath.split( "." )[:-1] :
-				parentDict = parentDict.setdefault( p, {} )
+		executionDict = { "imath" : imath, "IECore" : IECore, "parent" : dicts[0], "context" : _ContextProxy( context ) }
 
-		executionDict = { "imath" : imath, "IECore" : IECore, "parent" : plugDict, "context" : _ContextProxy( context ) }
-
-		exec( self.__expression, executionDict, executionDict )
+		exec( self.__code, executionDict, executionDict )
 
 		result = IECore.ObjectVector()
-		for plugPath in self.__outPlugPaths :
-			parentDict = plugDict
-			plugPathSplit = plugPath.split( "." )
-			for p in plugPathSplit[:-1] :
-				parentDict = parentDict[p]
-			result.append( parentDict.get( plugPathSplit[-1], IECore.NullObject.defaultNullObject() ) )
+		for dictIndex, name in self.__outPlugLocations :
+			result.append( dicts[dictIndex].get( name, IECore.NullObject.defaultNullObject() ) )
+
+		return result
+
+	def executeBatch( self, contexts, inputs ) :
+
+		# Evaluating the whole batch in a single call means
+		# we only need to acquire the GIL once.
+		result = []
+		for context in contexts :
+			with context :
+				result.append( self.execute( context, inputs ) )
 
 		return result
 
@@ -36,6 +36,8 @@
 
 import os
 import errno
+import json
+import multiprocessing
 import signal
 import shlex
 import subprocess32 as subprocess
@@ -57,6 +59,8 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 		self["executeInBackground"] = Gaffer.BoolPlug( defaultValue = False )
 		self["ignoreScriptLoadErrors"] = Gaffer.BoolPlug( defaultValue = False )
 		self["environmentCommand"] = Gaffer.StringPlug()
+		self["maxConcurrency"] = Gaffer.IntPlug( defaultValue = 1, minValue = 0 )
+		self["useWorkerProcesses"] = Gaffer.BoolPlug( defaultValue = False )
 
 		self.__jobPool = jobPool if jobPool else LocalDispatcher.defaultJobPool()
 
@@ -91,6 +95,15 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 			self.__environmentCommand = Gaffer.Context.current().substitute(
 				dispatcher["environmentCommand"].getValue()
 			)
+			self.__maxConcurrency = dispatcher["maxConcurrency"].getValue() or multiprocessing.cpu_count()
+			self.__useWorkerProcesses = dispatcher["useWorkerProcesses"].getValue()
+
+			# Used by the background dispatch to wait for the completion
+			# of running processes, and by `kill()` to wake it up again.
+			self.__condition = threading.Condition()
+			self.__finishedProcesses = []
+			self.__idleWorkers = []
+			self.__workersShutdown = False
 
 			self.__messageHandler = IECore.CapturingMessageHandler()
 			self.__messageTitle = "%s : Job %s %s" % ( self.__dispatcher.getName(), self.__name, self.__id )
@@ -115,35 +128,35 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 		def description( self ) :
 
-			batch = self.__currentBatch()
-			if batch is None or batch.plug() is None :
-				return "N/A"
-
-			frames = str( IECore.frameListFromList( [ int(x) for x in batch.frames() ] ) )
+			descriptions = []
+			for batch in self.__runningBatches() :
+				if batch.plug() is None :
+					continue
+				frames = str( IECore.frameListFromList( [ int(x) for x in batch.frames() ] ) )
+				descriptions.append( "Executing " + batch.blindData()["nodeName"].value + " on frames " + frames )
 
-			return "Executing " + batch.blindData()["nodeName"].value + " on frames " + frames
+			return ", ".join( descriptions ) if descriptions else "N/A"
 
 		def statistics( self ) :
 
-			batch = self.__currentBatch()
-			if batch is None or "pid" not in batch.blindData().keys() :
+			pids = [ b.blindData()["pid"].value for b in self.__runningBatches() if "pid" in b.blindData().keys() ]
+			if not pids :
 				return {}
 
 			rss = 0
 			pcpu = 0.0
-			pid = batch.blindData().get( "pid" )
 
 			try :
 				stats = subprocess.Popen( ( "ps -Ao pid,ppid,pgid,sess,pcpu,rss" ).split( " " ), stdout=subprocess.PIPE, stderr=subprocess.PIPE ).communicate()[0].split()
 				for i in range( 0, len(stats), 6 ) :
-					if str(pid) in stats[i:i+4] :
+					if any( str(pid) in stats[i:i+4] for pid in pids ) :
 						pcpu += float(stats[i+4])
 						rss += float(stats[i+5])
 			except :
 				return {}
 
 			return {
-				"pid" : pid,
+				"pid" : pids[0] if len( pids ) == 1 else pids,
 				"pcpu" : pcpu,
 				"rss" : rss,
 			}
@@ -169,6 +182,10 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 			if not self.failed() :
 				self.__killBatchWalk( self.__batch )
+				# Wake the background dispatch so that it
+				# can respond to the kill.
+				with self.__condition :
+					self.__condition.notify()
 
 		def killed( self ) :
 
@@ -227,38 +244,135 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 		def __backgroundDispatch( self ) :
 
 			with self.__messageHandler :
-				self.__doBackgroundDispatch( self.__batch )
+				try :
+					self.__doBackgroundDispatch( self.__batch )
+				finally :
+					self.__shutdownWorkers()
 
 		def __doBackgroundDispatch( self, batch ) :
 
-			if self.__getStatus( batch ) == LocalDispatcher.Job.Status.Complete :
-				return True
+			# Batches are launched in the order of a depth-first walk,
+			# so that with a `maxConcurrency` of 1 we execute in exactly
+			# the same order as a foreground dispatch. With higher
+			# concurrencies, any batch whose preTasks are complete may
+			# be launched, provided there are enough free slots for it.
 
-			for upstreamBatch in batch.preTasks() :
-				if not self.__doBackgroundDispatch( upstreamBatch ) :
+			waitingBatches = self.__orderedBatches( batch )
+			runningBatches = {}
+			failed = False
+
+			while True :
+
+				with self.__condition :
+					finishedProcesses = self.__finishedProcesses
+					self.__finishedProcesses = []
+
+				for finishedBatch, returnCode in finishedProcesses :
+					del runningBatches[finishedBatch]
+					if returnCode :
+						if not failed and not batch.blindData().get( "killed" ) :
+							self.__reportFailed( finishedBatch )
+						failed = True
+					else :
+						self.__setStatus( finishedBatch, LocalDispatcher.Job.Status.Complete )
+
+				if batch.blindData().get( "killed" ) :
+					for process in runningBatches.values() :
+						try :
+							os.killpg( process.pid, signal.SIGTERM )
+						except OSError as e :
+							if e.errno != errno.ESRCH :
+								raise
+					if not failed :
+						self.__reportKilled( batch )
 					return False
 
-			if batch.blindData().get( "killed" ) :
-				self.__reportKilled( batch )
-				return False
+				if failed :
+					# Let running batches finish, but don't launch any more.
+					if not runningBatches :
+						return False
+					self.__waitForProcesses()
+					continue
+
+				progressed = False
+				freeSlots = self.__maxConcurrency - sum( b.blindData()["slots"].value for b in runningBatches.keys() )
+				for waitingBatch in list( waitingBatches ) :
+
+					if any( self.__getStatus( b ) != LocalDispatcher.Job.Status.Complete for b in waitingBatch.preTasks() ) :
+						continue
+
+					if not waitingBatch.plug() :
+						waitingBatches.remove( waitingBatch )
+						self.__reportCompleted( waitingBatch )
+						progressed = True
+						continue
+
+					if len( waitingBatch.frames() ) == 0 :
+						# This case occurs for nodes like TaskList and TaskContextProcessors,
+						# because they don't do anything in execute (they have empty hashes).
+						# Their batches exist only to depend on upstream batches. We don't need
+						# to do any work here, but we still signal completion for the task to
+						# provide progress feedback to the user.
+						waitingBatches.remove( waitingBatch )
+						self.__setStatus( waitingBatch, LocalDispatcher.Job.Status.Complete )
+						IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Finished " + waitingBatch.blindData()["nodeName"].value )
+						progressed = True
+						continue
+
+					# We always allow at least one batch to run, even if it
+					# requires more slots than are available in total.
+					slots = waitingBatch.blindData()["slots"].value
+					if runningBatches and slots > freeSlots :
+						continue
+
+					waitingBatches.remove( waitingBatch )
+					runningBatches[waitingBatch] = self.__launchBatch( waitingBatch )
+					freeSlots -= slots
+
+				if self.__getStatus( batch ) == LocalDispatcher.Job.Status.Complete :
+					return True
+
+				if runningBatches :
+					self.__waitForProcesses()
+				elif not progressed :
+					# Should be impossible, as long as the batches form a DAG.
+					self.__reportFailed( batch )
+					return False
 
-			if not batch.plug() :
-				self.__reportCompleted( batch )
-				return True
+		def __orderedBatches( self, batch ) :
 
-			if len( batch.frames() ) == 0 :
-				# This case occurs for nodes like TaskList and TaskContextProcessors,
-				# because they don't do anything in execute (they have empty hashes).
-				# Their batches exist only to depend on upstream batches. We don't need
-				# to do any work here, but we still signal completion for the task to
-				# provide progress feedback to the user.
-				self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
-				IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Finished " + batch.blindData()["nodeName"].value )
-				return True
+			result = []
+			self.__orderedBatchesWalk( batch, result, set() )
+			return result
+
+		def __orderedBatchesWalk( self, batch, result, visited ) :
+
+			if batch in visited :
+				return
+
+			visited.add( batch )
+
+			for upstreamBatch in batch.preTasks() :
+				self.__orderedBatchesWalk( upstreamBatch, result, visited )
+
+			if self.__getStatus( batch ) != LocalDispatcher.Job.Status.Complete :
+				result.append( batch )
+
+		def __launchBatch( self, batch ) :
 
 			taskContext = batch.context()
 			frames = str( IECore.frameListFromList( [ int(x) for x in batch.frames() ] ) )
 
+			contextArgs = []
+			for entry in [ k for k in taskContext.keys() if k != "frame" and not k.startswith( "ui:" ) ] :
+				if entry not in self.__context.keys() or taskContext[entry] != self.__context[entry] :
+					contextArgs.extend( [ "-" + entry, IECore.repr( taskContext[entry] ) ] )
+
+			self.__setStatus( batch, LocalDispatcher.Job.Status.Running )
+
+			if self.__useWorkerProcesses :
+				return self.__launchBatchInWorker( batch, frames, contextArgs )
+
 			args = [
 				"gaffer", "execute",
 				"-script", self.__scriptFile,
@@ -271,35 +385,104 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 			if self.__ignoreScriptLoadErrors :
 				args.append( "-ignoreScriptLoadErrors" )
 
-			contextArgs = []
-			for entry in [ k for k in taskContext.keys() if k != "frame" and not k.startswith( "ui:" ) ] :
-				if entry not in self.__context.keys() or taskContext[entry] != self.__context[entry] :
-					contextArgs.extend( [ "-" + entry, IECore.repr( taskContext[entry] ) ] )
-
 			if contextArgs :
 				args.extend( [ "-context" ] + contextArgs )
 
-			self.__setStatus( batch, LocalDispatcher.Job.Status.Running )
 			IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, " ".join( args ) )
 			process = subprocess.Popen( args, start_new_session=True )
 			batch.blindData()["pid"] = IECore.IntData( process.pid )
 
-			while process.poll() is None :
+			# Rather than poll for completion, we dedicate a thread to waiting
+			# for the process, and have it notify us when it is done.
+			threading.Thread( target = self.__waitForProcess, args = ( batch, process ) ).start()
 
-				if batch.blindData().get( "killed" ) :
-					os.killpg( process.pid, signal.SIGTERM )
-					self.__reportKilled( batch )
-					return False
+			return process
 
-				time.sleep( 0.01 )
+		def __launchBatchInWorker( self, batch, frames, contextArgs ) :
 
-			if process.returncode :
-				self.__reportFailed( batch )
-				return False
+			with self.__condition :
+				worker = self.__idleWorkers.pop() if self.__idleWorkers else None
 
-			self.__setStatus( batch, LocalDispatcher.Job.Status.Complete )
+			if worker is None :
+				args = shlex.split( self.__environmentCommand ) + [
+					"gaffer", "execute",
+					"-script", self.__scriptFile,
+					"-worker",
+				]
+				if self.__ignoreScriptLoadErrors :
+					args.append( "-ignoreScriptLoadErrors" )
+				IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, " ".join( args ) )
+				worker = subprocess.Popen( args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, start_new_session=True )
 
-			return True
+			request = json.dumps( {
+				"nodes" : [ batch.blindData()["nodeName"].value ],
+				"frames" : frames,
+				"context" : contextArgs,
+			} )
+
+			IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Worker %d : %s" % ( worker.pid, request ) )
+			batch.blindData()["pid"] = IECore.IntData( worker.pid )
+
+			try :
+				worker.stdin.write( request + "\n" )
+				worker.stdin.flush()
+			except IOError :
+				# The worker has died. The thread below will
+				# report the failure.
+				pass
+
+			threading.Thread( target = self.__waitForWorker, args = ( batch, worker ) ).start()
+
+			return worker
+
+		def __waitForWorker( self, batch, worker ) :
+
+			line = worker.stdout.readline()
+			try :
+				returnCode = json.loads( line )["result"]
+			except ValueError :
+				# The worker died before replying.
+				returnCode = 1
+				worker.wait()
+
+			with self.__condition :
+				# A worker which finishes after `__shutdownWorkers()` has
+				# been called must not be reused, so we shut it down
+				# ourselves instead.
+				reuse = line and not self.__workersShutdown
+				if reuse :
+					self.__idleWorkers.append( worker )
+				self.__finishedProcesses.append( ( batch, returnCode ) )
+				self.__condition.notify()
+
+			if line and not reuse :
+				worker.stdin.close()
+				worker.wait()
+
+		def __shutdownWorkers( self ) :
+
+			with self.__condition :
+				self.__workersShutdown = True
+				workers = self.__idleWorkers
+				self.__idleWorkers = []
+
+			# Closing the pipe tells the worker to exit.
+			for worker in workers :
+				worker.stdin.close()
+				worker.wait()
+
+		def __waitForProcess( self, batch, process ) :
+
+			returnCode = process.wait()
+			with self.__condition :
+				self.__finishedProcesses.append( ( batch, returnCode ) )
+				self.__condition.notify()
+
+		def __waitForProcesses( self ) :
+
+			with self.__condition :
+				while not self.__finishedProcesses and not self.__batch.blindData().get( "killed" ) :
+					self.__condition.wait()
 
 		def __getStatus( self, batch ) :
 
@@ -328,28 +511,9 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 			self.__dispatcher.jobPool()._remove( self )
 			IECore.msg( IECore.MessageHandler.Level.Info, self.__messageTitle, "Killed " + self.name() )
 
-		def __currentBatch( self ) :
-
-			## \todo Consider just storing the current batch, rather
-			# than searching each time it is requested.
-			return self.__currentBatchWalk( self.__batch, set() )
-
-		def __currentBatchWalk( self, batch, visited ) :
-
-			if batch in visited :
-				return None
-
-			visited.add( batch )
-
-			if self.__getStatus( batch ) == LocalDispatcher.Job.Status.Running :
-				return batch
-
-			for upstreamBatch in batch.preTasks() :
-				currentBatch = self.__currentBatchWalk( upstreamBatch, visited )
-				if currentBatch is not None :
-					return currentBatch
+		def __runningBatches( self ) :
 
-			return None
+			return [ b for b in self.__orderedBatches( self.__batch ) if self.__getStatus( b ) == LocalDispatcher.Job.Status.Running ]
 
 		def __initBatchWalk( self, batch ) :
 
@@ -362,6 +526,14 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 				nodeName = batch.plug().node().relativeName( batch.plug().node().scriptNode() )
 			batch.blindData()["nodeName"] = nodeName
 
+			slots = 1
+			if batch.plug() is not None :
+				localPlug = batch.node()["dispatcher"].getChild( "local" )
+				if localPlug is not None :
+					with batch.context() :
+						slots = localPlug["slots"].getValue()
+			batch.blindData()["slots"] = IECore.IntData( max( slots, 1 ) )
+
 			self.__setStatus( batch, LocalDispatcher.Job.Status.Waiting )
 
 			for upstreamBatch in batch.preTasks() :
@@ -451,7 +623,16 @@ class LocalDispatcher( GafferDispatch.Dispatcher ) :
 
 		job.execute( background = self["executeInBackground"].getValue() )
 
+	@staticmethod
+	def _setupPlugs( parentPlug ) :
+
+		if "local" in parentPlug :
+			return
+
+		parentPlug["local"] = Gaffer.Plug()
+		parentPlug["local"]["slots"] = Gaffer.IntPlug( defaultValue = 1, minValue = 1 )
+
 IECore.registerRunTimeTyped( LocalDispatcher, typeName = "GafferDispatch::LocalDispatcher" )
 IECore.registerRunTimeTyped( LocalDispatcher.JobPool, typeName = "GafferDispatch::LocalDispatcher::JobPool" )
 
-GafferDispatch.Dispatcher.registerDispatcher( "Local", LocalDispatcher )
+GafferDispatch.Dispatcher.registerDispatcher( "Local", LocalDispatcher, LocalDispatcher._setupPlugs )
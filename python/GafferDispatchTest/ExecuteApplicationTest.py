@@ -124,6 +124,51 @@ class ExecuteApplicationTest( GafferTest.TestCase ) :
 		for f in frames.asList() :
 			self.failUnless( os.path.exists( self.__outputFileSeq.fileNameForFrame( f ) ) )
 
+	def testParallelFrames( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["object"] = GafferTest.CachingTestNode()
+		s["write"] = Gaffer.ObjectWriter()
+		s["write"]["in"].setInput( s["object"]["out"] )
+		s["write"]["fileName"].setValue( self.__outputFileSeq.fileName )
+
+		s["fileName"].setValue( self.__scriptFileName )
+		s.save()
+
+		frames = IECore.FrameList.parse( "1-10" )
+		p = subprocess.Popen(
+			"gaffer execute " + self.__scriptFileName + " -frames " + str( frames ) + " -parallelFrames 4",
+			shell=True,
+			stderr = subprocess.PIPE,
+		)
+		p.wait()
+
+		error = "".join( p.stderr.readlines() )
+		self.assertEqual( error, "" )
+		self.assertFalse( p.returncode )
+		for f in frames.asList() :
+			self.assertTrue( os.path.exists( self.__outputFileSeq.fileNameForFrame( f ) ) )
+
+	def testParallelFramesErrorReturnStatus( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["fileName"].setValue( self.__scriptFileName )
+		s["t"] = GafferDispatchTest.TextWriter()
+		s["t"]["fileName"].setValue( "" ) # will cause an error
+		s.save()
+
+		p = subprocess.Popen(
+			"gaffer execute -script " + self.__scriptFileName + " -frames 1-4 -parallelFrames 2",
+			shell=True,
+			stderr = subprocess.PIPE,
+		)
+		p.wait()
+
+		error = "".join( p.stderr.readlines() )
+		self.assertIn( "ERROR", error )
+		self.assertIn( "executing t (frame", error )
+		self.assertTrue( p.returncode )
+
 	def testContextParameter( self ) :
 
 		s = Gaffer.ScriptNode()
@@ -825,6 +825,146 @@ class LocalDispatcherTest( GafferTest.TestCase ) :
 			"0.0 1.0 2.0"
 		)
 
+	def testMaxConcurrency( self ) :
+
+		# Each of these commands writes a file and then waits for the other
+		# one to have done the same. They can therefore only both succeed
+		# if they are executed concurrently.
+
+		s = Gaffer.ScriptNode()
+
+		for name, other in ( ( "a", "b" ), ( "b", "a" ) ) :
+			s[name] = GafferDispatch.PythonCommand()
+			s[name]["command"].setValue( inspect.cleandoc(
+				"""
+				import os, time
+				open( "{directory}/{name}.txt", "w" ).write( "{name}" )
+				t = time.time()
+				while not os.path.exists( "{directory}/{other}.txt" ) :
+					if time.time() - t > 60 :
+						raise RuntimeError( "Timed out" )
+					time.sleep( 0.1 )
+				open( "{directory}/{name}Done.txt", "w" ).write( "{name}" )
+				""".format( directory = self.temporaryDirectory(), name = name, other = other )
+			) )
+
+		s["l"] = GafferDispatch.TaskList()
+		s["l"]["preTasks"][0].setInput( s["a"]["task"] )
+		s["l"]["preTasks"][1].setInput( s["b"]["task"] )
+
+		self.assertIn( "local", s["a"]["dispatcher"] )
+		self.assertEqual( s["a"]["dispatcher"]["local"]["slots"].getValue(), 1 )
+
+		d = GafferDispatch.Dispatcher.create( "LocalTest" )
+		d["executeInBackground"].setValue( True )
+		d["maxConcurrency"].setValue( 2 )
+		d.dispatch( [ s["l"] ] )
+		d.jobPool().waitForAll()
+
+		self.assertEqual( len( d.jobPool().failedJobs() ), 0 )
+		self.assertTrue( os.path.exists( self.temporaryDirectory() + "/aDone.txt" ) )
+		self.assertTrue( os.path.exists( self.temporaryDirectory() + "/bDone.txt" ) )
+
+	def testSlotsLimitConcurrency( self ) :
+
+		# Each command records the time it started and finished, so
+		# we can check how many ran at once. The first case needs more
+		# slots than are available, so the tasks must still be executed,
+		# but one at a time.
+
+		for slots, maxConcurrency, expectedConcurrency in [
+			( 4, 2, 1 ),
+			( 2, 4, 2 ),
+		] :
+
+			directory = os.path.join( self.temporaryDirectory(), "%d-%d" % ( slots, maxConcurrency ) )
+			os.makedirs( directory )
+
+			s = Gaffer.ScriptNode()
+			s["l"] = GafferDispatch.TaskList()
+
+			for i in range( 0, 4 ) :
+				s["n%d" % i] = GafferDispatch.PythonCommand()
+				s["n%d" % i]["command"].setValue( inspect.cleandoc(
+					"""
+					import time
+					start = time.time()
+					time.sleep( 0.5 )
+					open( "{directory}/n{i}.txt", "w" ).write( "%r %r" % ( start, time.time() ) )
+					""".format( directory = directory, i = i )
+				) )
+				s["n%d" % i]["dispatcher"]["local"]["slots"].setValue( slots )
+				s["l"]["preTasks"][i].setInput( s["n%d" % i]["task"] )
+
+			d = GafferDispatch.Dispatcher.create( "LocalTest" )
+			d["executeInBackground"].setValue( True )
+			d["maxConcurrency"].setValue( maxConcurrency )
+			d.dispatch( [ s["l"] ] )
+			d.jobPool().waitForAll()
+
+			self.assertEqual( len( d.jobPool().failedJobs() ), 0 )
+
+			intervals = [
+				[ float( t ) for t in open( directory + "/n%d.txt" % i ).read().split() ]
+				for i in range( 0, 4 )
+			]
+
+			concurrency = max(
+				len( [ 1 for start, end in intervals if start <= t < end ] )
+				for t, _ in intervals
+			)
+			self.assertLessEqual( concurrency, expectedConcurrency )
+
+	def testWorkerProcesses( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["c"] = GafferDispatch.PythonCommand()
+		s["c"]["command"].setValue( inspect.cleandoc(
+			"""
+			import os
+			open( "{directory}/%d.txt" % context.getFrame(), "w" ).write( str( os.getpid() ) )
+			""".format( directory = self.temporaryDirectory() )
+		) )
+
+		d = GafferDispatch.Dispatcher.create( "LocalTest" )
+		d["executeInBackground"].setValue( True )
+		d["useWorkerProcesses"].setValue( True )
+		d["framesMode"].setValue( d.FramesMode.CustomRange )
+		d["frameRange"].setValue( "1-4" )
+		d.dispatch( [ s["c"] ] )
+		d.jobPool().waitForAll()
+
+		self.assertEqual( len( d.jobPool().failedJobs() ), 0 )
+
+		# All the frames should have been executed by the
+		# same worker process.
+
+		pids = set()
+		for frame in range( 1, 5 ) :
+			pids.add( open( self.temporaryDirectory() + "/%d.txt" % frame ).read() )
+
+		self.assertEqual( len( pids ), 1 )
+		self.assertNotEqual( pids.pop(), str( os.getpid() ) )
+
+	def testWorkerProcessFailure( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n1"] = GafferDispatchTest.TextWriter()
+		s["n1"]["fileName"].setValue( self.temporaryDirectory() + "/n1.txt" )
+		s["n2"] = GafferDispatchTest.TextWriter()
+		s["n2"]["fileName"].setValue( "" )
+		s["n1"]["preTasks"][0].setInput( s["n2"]["task"] )
+
+		d = GafferDispatch.Dispatcher.create( "LocalTest" )
+		d["executeInBackground"].setValue( True )
+		d["useWorkerProcesses"].setValue( True )
+		d.dispatch( [ s["n1"] ] )
+		d.jobPool().waitForAll()
+
+		self.assertEqual( len( d.jobPool().failedJobs() ), 1 )
+		self.assertFalse( os.path.exists( self.temporaryDirectory() + "/n1.txt" ) )
+		d.jobPool()._remove( d.jobPool().failedJobs()[0], force = True )
+
 	def tearDown( self ) :
 
 		GafferTest.TestCase.tearDown( self )
@@ -97,6 +97,69 @@ Gaffer.Metadata.registerNode(
 
 		),
 
+		"maxConcurrency" : (
+
+			"description",
+			"""
+			The maximum number of task slots which may be used
+			concurrently when executing in the background. Tasks
+			are executed concurrently when they do not depend on
+			one another, with each task using the number of slots
+			specified by its `dispatcher.local.slots` plug. A value
+			of 0 uses one slot per CPU core.
+			""",
+
+		),
+
+		"useWorkerProcesses" : (
+
+			"description",
+			"""
+			Executes background tasks using a pool of persistent
+			`gaffer execute -worker` processes, rather than launching a new
+			process for every batch. Each worker loads the script only once,
+			and keeps its caches warm between batches, which greatly reduces
+			the overhead for many short tasks. Tasks which leak state between
+			executions should not be used with this mode.
+			""",
+
+		),
+
+	}
+
+)
+
+Gaffer.Metadata.registerNode(
+
+	GafferDispatch.TaskNode,
+
+	plugs = {
+
+		"dispatcher.local" : (
+
+			"description",
+			"""
+			Settings that control how tasks are
+			executed by the LocalDispatcher.
+			""",
+
+			"layout:section", "Local",
+			"plugValueWidget:type", "GafferUI.LayoutPlugValueWidget",
+
+		),
+
+		"dispatcher.local.slots" : (
+
+			"description",
+			"""
+			The number of the LocalDispatcher's concurrency
+			slots used by each batch of this task. Memory or
+			CPU hungry tasks may be given more slots so that
+			fewer other tasks run alongside them.
+			""",
+
+		),
+
 	}
 
 )
@@ -190,5 +190,44 @@ class BlurTest( GafferImageTest.ImageTestCase ) :
 
 		self.assertImagesEqual( finalCrop["out"], expectedReader["out"], maxDifference = 0.00001, ignoreMetadata = True )
 
+	def testApproximateMode( self ) :
+
+		reader = GafferImage.ImageReader()
+		reader["fileName"].setValue( os.path.dirname( __file__ ) + "/images/checker.exr" )
+
+		exact = GafferImage.Blur()
+		exact["in"].setInput( reader["out"] )
+		exact["radius"].setValue( imath.V2f( 20, 10 ) )
+
+		approximate = GafferImage.Blur()
+		approximate["in"].setInput( reader["out"] )
+		approximate["radius"].setInput( exact["radius"] )
+		approximate["mode"].setValue( GafferImage.Blur.Mode.Approximate )
+
+		self.assertNotEqual( approximate["out"].channelDataHash( "R", imath.V2i( 0 ) ), exact["out"].channelDataHash( "R", imath.V2i( 0 ) ) )
+		self.assertImagesEqual( approximate["out"], exact["out"], maxDifference = 0.05 )
+
+		# Energy is preserved, just as for the exact blur.
+
+		stats = GafferImage.ImageStats()
+		stats["in"].setInput( approximate["out"] )
+		stats["area"].setValue( reader["out"]["dataWindow"].getValue() )
+
+		inStats = GafferImage.ImageStats()
+		inStats["in"].setInput( reader["out"] )
+		inStats["area"].setInput( stats["area"] )
+
+		self.assertAlmostEqual( stats["average"]["r"].getValue(), inStats["average"]["r"].getValue(), delta = 0.01 )
+
+		# Data window is expanded by roughly the same amount as the exact blur.
+
+		exact["expandDataWindow"].setValue( True )
+		approximate["expandDataWindow"].setValue( True )
+
+		exactDataWindow = exact["out"]["dataWindow"].getValue()
+		approximateDataWindow = approximate["out"]["dataWindow"].getValue()
+		self.assertTrue( approximateDataWindow.intersects( exactDataWindow.min() ) )
+		self.assertTrue( approximateDataWindow.intersects( exactDataWindow.max() - imath.V2i( 1 ) ) )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -166,5 +166,50 @@ class ImagePlugTest( GafferImageTest.ImageTestCase ) :
 			GafferImage.FormatPlug.setDefaultFormat( c, GafferImage.Format( 200, 300 ) )
 			self.assertEqual( constant["out"].image().displayWindow, imath.Box2i( imath.V2i( 0 ), imath.V2i( 199, 299 ) ) )
 
+	def testSetTileSize( self ) :
+
+		self.addCleanup( GafferImage.ImagePlug.setTileSize, GafferImage.ImagePlug.tileSize() )
+
+		reader = GafferImage.ImageReader()
+		reader["fileName"].setValue( os.path.expandvars( "$GAFFER_ROOT/python/GafferImageTest/images/checker.exr" ) )
+		grade = GafferImage.Grade()
+		grade["in"].setInput( reader["out"] )
+		grade["gain"].setValue( imath.Color4f( 2 ) )
+
+		image = grade["out"].image()
+
+		for tileSize in ( 16, 32, 128, 256 ) :
+
+			GafferImage.ImagePlug.setTileSize( tileSize )
+			self.assertEqual( GafferImage.ImagePlug.tileSize(), tileSize )
+			self.assertEqual( GafferImage.ImagePlug.tileOrigin( imath.V2i( tileSize + 1, -1 ) ), imath.V2i( tileSize, -tileSize ) )
+			self.assertEqual( GafferImage.ImagePlug.tileIndex( imath.V2i( tileSize * 2 ) ), imath.V2i( 2 ) )
+
+			constant = GafferImage.Constant()
+			self.assertEqual( len( constant["out"].channelData( "R", imath.V2i( 0 ) ) ), tileSize * tileSize )
+
+			self.assertEqual( grade["out"].image(), image )
+
+		for tileSize in ( 0, 8, 48, 2048 ) :
+			self.assertRaises( RuntimeError, GafferImage.ImagePlug.setTileSize, tileSize )
+
+	def testSetTileSizeInvalidatesHashes( self ) :
+
+		self.addCleanup( GafferImage.ImagePlug.setTileSize, GafferImage.ImagePlug.tileSize() )
+
+		constant = GafferImage.Constant()
+		grade = GafferImage.Grade()
+		grade["in"].setInput( constant["out"] )
+
+		# Hashes from the hash cache must not be reused,
+		# since they are for tiles of the old size.
+		h = grade["out"].channelDataHash( "R", imath.V2i( 0 ) )
+		GafferImage.ImagePlug.setTileSize( GafferImage.ImagePlug.tileSize() * 2 )
+		self.assertNotEqual( grade["out"].channelDataHash( "R", imath.V2i( 0 ) ), h )
+		self.assertEqual(
+			len( grade["out"].channelData( "R", imath.V2i( 0 ) ) ),
+			GafferImage.ImagePlug.tileSize() * GafferImage.ImagePlug.tileSize()
+		)
+
 if __name__ == "__main__":
 	unittest.main()
@@ -40,6 +40,7 @@ import imath
 
 import IECore
 
+import Gaffer
 import GafferTest
 import GafferImage
 import GafferImageTest
@@ -187,6 +188,103 @@ class ImageStatsTest( GafferImageTest.ImageTestCase ) :
 		self.assertEqual( s["min"].getValue(), imath.Color4f( 1 ) )
 		self.assertEqual( s["max"].getValue(), imath.Color4f( 1 ) )
 
+	def testHistogramAndPercentile( self ) :
+
+		c = GafferImage.Constant()
+		c["color"].setValue( imath.Color4f( 0.25, 0.5, 0.75, 1 ) )
+
+		s = GafferImage.ImageStats()
+		s["in"].setInput( c["out"] )
+		s["area"].setValue( imath.Box2i( imath.V2i( 0 ), imath.V2i( 100 ) ) )
+		s["histogramBins"].setValue( 4 )
+
+		h = s["histogram"].getValue()
+		self.assertEqual( set( h.keys() ), { "R", "G", "B", "A" } )
+		self.assertEqual( h["R"], IECore.IntVectorData( [ 0, 10000, 0, 0 ] ) )
+		self.assertEqual( h["G"], IECore.IntVectorData( [ 0, 0, 10000, 0 ] ) )
+		self.assertEqual( h["B"], IECore.IntVectorData( [ 0, 0, 0, 10000 ] ) )
+		# Values at or above the top of the range go in the last bin.
+		self.assertEqual( h["A"], IECore.IntVectorData( [ 0, 0, 0, 10000 ] ) )
+
+		# Percentiles are interpolated within the bins.
+		self.__assertColour( s["percentileValue"].getValue(), imath.Color4f( 0.375, 0.625, 0.875, 0.875 ) )
+		s["percentile"].setValue( 100 )
+		self.__assertColour( s["percentileValue"].getValue(), imath.Color4f( 0.5, 0.75, 1, 1 ) )
+
+		# Pixels outside the data window count as black.
+		s["area"].setValue( imath.Box2i( imath.V2i( -100, 0 ), imath.V2i( 100 ) ) )
+		self.assertEqual( s["histogram"].getValue()["R"], IECore.IntVectorData( [ 10000, 10000, 0, 0 ] ) )
+		s["percentile"].setValue( 50 )
+		self.__assertColour( s["percentileValue"].getValue(), imath.Color4f( 0.25, 0.25, 0.25, 0.25 ) )
+
+		s["channels"].setValue( IECore.StringVectorData( [ "R", "R", "", "" ] ) )
+		self.assertEqual( s["histogram"].getValue().keys(), [ "R" ] )
+
+	def testHistogramMatchesImage( self ) :
+
+		r = GafferImage.ImageReader()
+		r["fileName"].setValue( self.__rgbFilePath )
+
+		s = GafferImage.ImageStats()
+		s["in"].setInput( r["out"] )
+		s["area"].setValue( r["out"]["dataWindow"].getValue() )
+		s["histogramBins"].setValue( 16 )
+
+		image = r["out"].image()
+		h = s["histogram"].getValue()
+		for channelName in "RGBA" :
+			expected = [ 0 ] * 16
+			for v in image[channelName] :
+				expected[min( max( int( v * 16 ), 0 ), 15 )] += 1
+			self.assertEqual( list( h[channelName] ), expected )
+
+	def testMovingAreaReusesTiles( self ) :
+
+		tileSize = GafferImage.ImagePlug.tileSize()
+
+		c = GafferImage.Constant()
+		c["format"].setValue( GafferImage.Format( tileSize * 8, tileSize * 8 ) )
+
+		s = GafferImage.ImageStats()
+		s["in"].setInput( c["out"] )
+		s["area"].setValue( imath.Box2i( imath.V2i( 10 ), imath.V2i( tileSize * 8 - 10 ) ) )
+		s["average"]["r"].getValue()
+
+		# Moving the left edge of the area should only require the tiles
+		# in the leftmost column to be recomputed.
+		s["area"]["min"]["x"].setValue( 20 )
+		with Gaffer.PerformanceMonitor() as m :
+			self.assertEqual( s["average"]["r"].getValue(), 1 )
+
+		self.assertEqual( m.plugStatistics( s["__tileStats"] ).computeCount, 8 )
+
+	def testEmptyArea( self ) :
+
+		c = GafferImage.Constant()
+		c["color"].setValue( imath.Color4f( 0.25, 0.5, 0.75, 1 ) )
+
+		s = GafferImage.ImageStats()
+		s["in"].setInput( c["out"] )
+		s["histogramBins"].setValue( 4 )
+
+		for area in [
+			imath.Box2i(),
+			imath.Box2i( imath.V2i( 10 ), imath.V2i( 10 ) ),
+			imath.Box2i( imath.V2i( 10 ), imath.V2i( 10, 20 ) ),
+		] :
+			s["area"].setValue( area )
+			h = s["histogram"].getValue()
+			for channelName in [ "R", "G", "B", "A" ] :
+				self.assertEqual( h[channelName], IECore.IntVectorData( [ 0, 0, 0, 0 ] ) )
+			self.assertEqual( s["average"].getValue(), imath.Color4f( 0 ) )
+
+		# Different empty areas share a hash, because they
+		# share a result.
+		s["area"].setValue( imath.Box2i() )
+		h1 = s["histogram"].hash()
+		s["area"].setValue( imath.Box2i( imath.V2i( 10 ), imath.V2i( 10 ) ) )
+		self.assertEqual( s["histogram"].hash(), h1 )
+
 	def __assertColour( self, colour1, colour2 ) :
 		for i in range( 0, 4 ):
 			self.assertEqual( "%.4f" % colour2[i], "%.4f" % colour1[i] )
@@ -1041,6 +1041,37 @@ class ImageWriterTest( GafferImageTest.ImageTestCase ) :
 
 		self.assertEqual( r["out"]["metadata"].getValue()["test"], m["out"]["metadata"].getValue()["test"] )
 
+	def testMultipleChunks( self ) :
+
+		# Large enough to be written in several chunks, with a
+		# data window which doesn't align with the tiles.
+
+		c = GafferImage.Checkerboard()
+		c["format"].setValue( GafferImage.Format( 700, 900, 1. ) )
+		c["size"].setValue( imath.V2f( 13 ) )
+
+		crop = GafferImage.Crop()
+		crop["in"].setInput( c["out"] )
+		crop["area"].setValue( imath.Box2i( imath.V2i( 37, 23 ), imath.V2i( 650, 870 ) ) )
+		crop["affectDisplayWindow"].setValue( False )
+
+		w = GafferImage.ImageWriter()
+		w["in"].setInput( crop["out"] )
+		w["openexr"]["dataType"].setValue( "float" )
+		w["openexr"]["compression"].setValue( "zip" )
+
+		r = GafferImage.ImageReader()
+
+		for mode in ( GafferImage.ImageWriter.Mode.Scanline, GafferImage.ImageWriter.Mode.Tile ) :
+
+			testFile = self.__testFile( "multipleChunks" + str( mode ), "RGBA", "exr" )
+			w["openexr"]["mode"].setValue( mode )
+			w["fileName"].setValue( testFile )
+			w["task"].execute()
+
+			r["fileName"].setValue( testFile )
+			self.assertImagesEqual( r["out"], crop["out"], ignoreMetadata = True )
+
 	def __testFile( self, mode, channels, ext ) :
 
 		return self.temporaryDirectory() + "/test." + channels + "." + str( mode ) + "." + str( ext )
@@ -243,6 +243,138 @@ class OpenImageIOReaderTest( GafferImageTest.ImageTestCase ) :
 		reader["refreshCount"].setValue( reader["refreshCount"].getValue() + 1 )
 		self.assertNotEqual( reader["out"].image(), image1 )
 
+	def testRefreshDoesntAffectOtherReaders( self ) :
+
+		testFile = self.temporaryDirectory() + "/refresh.exr"
+		shutil.copyfile( self.fileName, testFile )
+
+		reader1 = GafferImage.OpenImageIOReader()
+		reader1["fileName"].setValue( self.offsetDataWindowFileName )
+		reader2 = GafferImage.OpenImageIOReader()
+		reader2["fileName"].setValue( testFile )
+
+		reader1["out"].image()
+		reader2["out"]["format"].getValue()
+
+		original = GafferImage.OpenImageIOReader()
+		original["fileName"].setValue( self.fileName )
+
+		# Refreshing reader1 shouldn't drop reader2's file handle,
+		# so reader2 continues to see the file it opened originally.
+		shutil.copyfile( self.offsetDataWindowFileName, testFile )
+		reader1["refreshCount"].setValue( reader1["refreshCount"].getValue() + 1 )
+		self.assertEqual( reader2["out"]["dataWindow"].getValue(), original["out"]["dataWindow"].getValue() )
+
+	def testFileCacheLimits( self ) :
+
+		openFilesLimit = GafferImage.OpenImageIOReader.getOpenFilesLimit()
+		self.addCleanup( GafferImage.OpenImageIOReader.setOpenFilesLimit, openFilesLimit )
+		handlesPerFile = GafferImage.OpenImageIOReader.getHandlesPerFile()
+		self.addCleanup( GafferImage.OpenImageIOReader.setHandlesPerFile, handlesPerFile )
+		tileBatchSize = GafferImage.OpenImageIOReader.getTileBatchSize()
+		self.addCleanup( GafferImage.OpenImageIOReader.setTileBatchSize, tileBatchSize )
+
+		reader1 = GafferImage.OpenImageIOReader()
+		reader1["fileName"].setValue( self.fileName )
+		reader2 = GafferImage.OpenImageIOReader()
+		reader2["fileName"].setValue( self.circlesExrFileName )
+
+		# Changing the tile batch size closes all files, giving
+		# us a clean slate for each test.
+
+		for limit, handles, batchSize in [
+			( 10, 1, tileBatchSize * 2 ),
+			( 10, 4, tileBatchSize ),
+			( 1, 4, tileBatchSize * 2 ),
+		] :
+
+			GafferImage.OpenImageIOReader.setOpenFilesLimit( limit )
+			GafferImage.OpenImageIOReader.setHandlesPerFile( handles )
+			GafferImage.OpenImageIOReader.setTileBatchSize( batchSize )
+			self.assertEqual( GafferImage.OpenImageIOReader.openFileHandles(), 0 )
+
+			reader1["out"].image()
+			reader2["out"].image()
+
+			self.assertGreaterEqual( GafferImage.OpenImageIOReader.openFileHandles(), min( limit, 2 ) )
+			self.assertLessEqual( GafferImage.OpenImageIOReader.openFileHandles(), min( limit, 2 ) * handles )
+
+	def testHandlesPerFile( self ) :
+
+		handlesPerFile = GafferImage.OpenImageIOReader.getHandlesPerFile()
+		self.addCleanup( GafferImage.OpenImageIOReader.setHandlesPerFile, handlesPerFile )
+
+		references = {}
+		for fileName in ( self.fileName, self.circlesExrFileName, self.circlesJpgFileName ) :
+			reader = GafferImage.OpenImageIOReader()
+			reader["fileName"].setValue( fileName )
+			references[fileName] = reader
+
+		GafferImage.OpenImageIOReader.setHandlesPerFile( 4 )
+
+		for fileName, reference in references.items() :
+
+			# Copy the file, so it isn't already open with a single handle.
+			testFile = self.temporaryDirectory() + "/handles" + os.path.splitext( fileName )[1]
+			shutil.copyfile( fileName, testFile )
+
+			reader = GafferImage.OpenImageIOReader()
+			reader["fileName"].setValue( testFile )
+
+			GafferImage.OpenImageIOReader.resetStatistics()
+			self.assertImagesEqual( reader["out"], reference["out"], ignoreMetadata = True )
+			self.assertGreater( GafferImage.OpenImageIOReader.bytesRead(), 0 )
+			self.assertGreaterEqual( GafferImage.OpenImageIOReader.openFileHandles(), 1 )
+			self.assertGreaterEqual( GafferImage.OpenImageIOReader.lockWaitTime(), 0 )
+
+	def testTileBatchSize( self ) :
+
+		tileBatchSize = GafferImage.OpenImageIOReader.getTileBatchSize()
+		self.addCleanup( GafferImage.OpenImageIOReader.setTileBatchSize, tileBatchSize )
+
+		reader = GafferImage.OpenImageIOReader()
+		reader["fileName"].setValue( self.circlesExrFileName )
+		image = reader["out"].image()
+
+		# The reader isn't dirtied by changing the batch size, so this
+		# checks that we don't reuse hashes or batches which were
+		# computed with the previous layout.
+		for size in ( GafferImage.ImagePlug.tileSize(), 1024, tileBatchSize ) :
+			GafferImage.OpenImageIOReader.setTileBatchSize( size )
+			self.assertEqual( reader["out"].image(), image )
+
+	def testFileCacheEvictions( self ) :
+
+		openFilesLimit = GafferImage.OpenImageIOReader.getOpenFilesLimit()
+		self.addCleanup( GafferImage.OpenImageIOReader.setOpenFilesLimit, openFilesLimit )
+		tileBatchSize = GafferImage.OpenImageIOReader.getTileBatchSize()
+		self.addCleanup( GafferImage.OpenImageIOReader.setTileBatchSize, tileBatchSize )
+
+		reader1 = GafferImage.OpenImageIOReader()
+		reader1["fileName"].setValue( self.fileName )
+		reader2 = GafferImage.OpenImageIOReader()
+		reader2["fileName"].setValue( self.circlesExrFileName )
+
+		# Closing files explicitly is not an eviction.
+
+		GafferImage.OpenImageIOReader.setOpenFilesLimit( 10 )
+		reader1["out"]["format"].getValue()
+		reader2["out"]["format"].getValue()
+		GafferImage.OpenImageIOReader.resetStatistics()
+		GafferImage.OpenImageIOReader.setTileBatchSize( tileBatchSize * 2 )
+		self.assertEqual( GafferImage.OpenImageIOReader.fileCacheEvictions(), 0 )
+
+		# Closing files to stay within the limit is.
+
+		GafferImage.OpenImageIOReader.setOpenFilesLimit( 1 )
+		for i in range( 0, 2 ) :
+			Gaffer.ValuePlug.clearCache()
+			reader1["out"]["format"].getValue()
+			reader2["out"]["format"].getValue()
+
+		self.assertGreaterEqual( GafferImage.OpenImageIOReader.fileCacheEvictions(), 3 )
+		self.assertLessEqual( GafferImage.OpenImageIOReader.openFileHandles(), 1 )
+
 	def testNonexistentFiles( self ) :
 
 		reader = GafferImage.OpenImageIOReader()
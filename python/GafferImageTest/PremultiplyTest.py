@@ -116,3 +116,42 @@ class PremultiplyTest( GafferImageTest.ImageTestCase ) :
 						self.assertEqual( result, color[channelName] )
 					else:
 						self.assertEqual( result, color[channelName] * color[alphaChannelName] )
+
+	def testLayers( self ) :
+
+		main = GafferImage.Constant()
+		main["color"].setValue( imath.Color4f( 1, 2, 3, 0.5 ) )
+
+		diffuse = GafferImage.Constant()
+		diffuse["color"].setValue( imath.Color4f( 4, 5, 6, 0.25 ) )
+		diffuse["layer"].setValue( "diffuse" )
+
+		copy = GafferImage.CopyChannels()
+		copy["in"][0].setInput( main["out"] )
+		copy["in"][1].setInput( diffuse["out"] )
+		copy["channels"].setValue( "*" )
+
+		premultiply = GafferImage.Premultiply()
+		premultiply["in"].setInput( copy["out"] )
+		premultiply["channels"].setValue( "*" )
+
+		for alphaChannel, alpha in ( ( "A", 0.5 ), ( "diffuse.A", 0.25 ) ) :
+
+			premultiply["alphaChannel"].setValue( alphaChannel )
+
+			for channelName, value in (
+				( "R", 1 ), ( "G", 2 ), ( "B", 3 ), ( "A", 0.5 ),
+				( "diffuse.R", 4 ), ( "diffuse.G", 5 ), ( "diffuse.B", 6 ), ( "diffuse.A", 0.25 ),
+			) :
+				expected = value if channelName == alphaChannel else value * alpha
+				self.assertEqual( premultiply["out"].channelData( channelName, imath.V2i( 0 ) )[0], expected )
+
+		# Channels outside the mask must be passed through, even
+		# though other channels in the same layer are processed.
+
+		premultiply["channels"].setValue( "R" )
+		self.assertEqual( premultiply["out"].channelData( "R", imath.V2i( 0 ) )[0], 0.25 )
+		self.assertEqual(
+			premultiply["out"].channelDataHash( "G", imath.V2i( 0 ) ),
+			copy["out"].channelDataHash( "G", imath.V2i( 0 ) )
+		)
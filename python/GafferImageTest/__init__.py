@@ -90,6 +90,7 @@ from FilterAlgoTest import FilterAlgoTest
 from MedianTest import MedianTest
 from ErodeTest import ErodeTest
 from DilateTest import DilateTest
+from RankFilterTest import RankFilterTest
 from MixTest import MixTest
 from CatalogueTest import CatalogueTest
 from CollectImagesTest import CollectImagesTest
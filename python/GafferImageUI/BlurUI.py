@@ -91,7 +91,26 @@ Gaffer.Metadata.registerNode(
 			which the blur will bleed onto.
 			"""
 
-		]
+		],
+
+		"mode" : [
+
+			"description",
+			"""
+			The method used to compute the blur. Exact filters with a
+			true gaussian, at a cost which grows with the radius.
+			Approximate uses a sequence of box filters which closely
+			resembles a gaussian. The cost of filtering each pixel is
+			independent of the radius, making it much faster for large
+			blurs, although the results differ slightly from Exact.
+			""",
+
+			"preset:Exact", GafferImage.Blur.Mode.Exact,
+			"preset:Approximate", GafferImage.Blur.Mode.Approximate,
+
+			"plugValueWidget:type", "GafferUI.PresetsPlugValueWidget",
+
+		],
 
 	}
 
@@ -59,7 +59,8 @@ Gaffer.Metadata.registerNode(
 	"""
 	Calculates minimum, maximum and average colours for a region of
 	an image. These outputs can then be used to drive other plugs
-	within the node graph.
+	within the node graph. A histogram and percentile value are
+	also calculated for each channel.
 	""",
 
 	plugs = {
@@ -123,6 +124,66 @@ Gaffer.Metadata.registerNode(
 
 		],
 
+		"histogramRange" : [
+
+			"description",
+			"""
+			The range of values covered by the histogram. Values below
+			the range are counted in the first bin, and values above it
+			are counted in the last bin.
+			""",
+
+			"nodule:type", "",
+
+		],
+
+		"histogramBins" : [
+
+			"description",
+			"""
+			The number of bins in the histogram. More bins give a more
+			accurate percentile value.
+			""",
+
+			"nodule:type", "",
+
+		],
+
+		"percentile" : [
+
+			"description",
+			"""
+			The percentile to be output on the percentileValue plug. For
+			instance, a value of 50 gives the median.
+			""",
+
+			"nodule:type", "",
+
+		],
+
+		"histogram" : [
+
+			"description",
+			"""
+			The histogram for each channel, stored as IntVectorData
+			and keyed by channel name.
+			""",
+
+			"plugValueWidget:type", "",
+
+		],
+
+		"percentileValue" : [
+
+			"description",
+			"""
+			The per-channel values below which the specified percentage
+			of the input image region lies. These are interpolated from
+			the histogram.
+			""",
+
+		],
+
 	}
 
 )
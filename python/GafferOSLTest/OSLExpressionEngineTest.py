@@ -607,5 +607,24 @@ class OSLExpressionEngineTest( GafferOSLTest.OSLTestCase ) :
 			c["str"] = "abc"
 			self.assertEqual( s["n"]["user"]["i"].getValue(), 1 )
 
+	def testExecuteBatch( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n"] = Gaffer.Node()
+		s["n"]["user"]["f"] = Gaffer.FloatPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( "parent.n.user.f = time * 2;", "OSL" )
+
+		contexts = []
+		for frame in range( 1, 4 ) :
+			c = Gaffer.Context()
+			c.setFrame( frame )
+			c.setFramesPerSecond( 1 )
+			contexts.append( c )
+
+		values = s["e"].executeBatch( s["n"]["user"]["f"], contexts )
+		self.assertEqual( [ v.value for v in values ], [ 2, 4, 6 ] )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -122,6 +122,28 @@ class ShadingEngineTest( GafferOSLTest.OSLTestCase ) :
 			for i in range( 0, len( v1 ) ) :
 				self.assertEqual( v1[i], imath.Color3f( v2[i] ) )
 
+	def testManyPoints( self ) :
+
+		# Enough points to be shaded in many blocks, on many threads.
+		rp = self.rectanglePoints( divisions = imath.V2i( 300 ) )
+
+		shader = self.compileShader( os.path.dirname( __file__ ) + "/shaders/globals.osl" )
+		e = GafferOSL.ShadingEngine( IECore.ObjectVector( [
+			IECoreScene.Shader( shader, "osl:surface", { "global" : "P" } )
+		] ) )
+
+		p = e.shade( rp )
+		self.assertEqual( p["Ci"], IECore.Color3fVectorData( [ imath.Color3f( x ) for x in rp["P"] ] ) )
+
+		# Debug results must be gathered correctly too.
+		shader = self.compileShader( os.path.dirname( __file__ ) + "/shaders/debugClosure.osl" )
+		e = GafferOSL.ShadingEngine( IECore.ObjectVector( [
+			IECoreScene.Shader( shader, "osl:surface", { "name" : "a", "weight" : imath.Color3f( 1, 0, 0 ) } ),
+		] ) )
+
+		p = e.shade( rp )
+		self.assertEqual( p["a"], IECore.Color3fVectorData( [ imath.Color3f( 1, 0, 0 ) ] * len( rp["P"] ) ) )
+
 	def testDoubleAsIntViaGetAttribute( self ):
 		shader = self.compileShader( os.path.dirname( __file__ ) + "/shaders/intAttribute.osl" )
 
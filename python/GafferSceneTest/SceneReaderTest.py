@@ -93,6 +93,35 @@ class SceneReaderTest( GafferSceneTest.SceneTestCase ) :
 		scene = reader["out"]
 		self.assertEqual( scene.childNames( "/" ), IECore.InternedStringVectorData( [ "transform" ] ) )
 
+	def testRefreshDoesntAffectOtherReaders( self ) :
+
+		fileNames = [ self.temporaryDirectory() + "/test%d.scc" % i for i in range( 0, 2 ) ]
+		for fileName in fileNames :
+			sc = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+			sc.createChild( "a" )
+			del sc
+
+		readers = []
+		for fileName in fileNames :
+			reader = GafferScene.SceneReader()
+			reader["fileName"].setValue( fileName )
+			reader["refreshCount"].setValue( self.uniqueInt( fileName ) )
+			self.assertEqual( reader["out"].childNames( "/" ), IECore.InternedStringVectorData( [ "a" ] ) )
+			readers.append( reader )
+
+		for fileName in fileNames :
+			sc = IECoreScene.SceneCache( fileName, IECore.IndexedIO.OpenMode.Write )
+			sc.createChild( "b" )
+			del sc
+
+		readers[0]["refreshCount"].setValue( readers[0]["refreshCount"].getValue() + 1 )
+		self.assertEqual( readers[0]["out"].childNames( "/" ), IECore.InternedStringVectorData( [ "b" ] ) )
+
+		# The second reader wasn't refreshed, so should still be
+		# using the file it loaded originally.
+		self.assertEqual( readers[1]["out"].childNames( "/" ), IECore.InternedStringVectorData( [ "a" ] ) )
+		self.assertEqual( readers[1]["out"].childNames( "/a" ), IECore.InternedStringVectorData() )
+
 	def testRead( self ) :
 
 		sc = IECoreScene.SceneCache( self.__testFile, IECore.IndexedIO.OpenMode.Write )
@@ -500,5 +529,24 @@ class SceneReaderTest( GafferSceneTest.SceneTestCase ) :
 		r["fileName"].setValue( os.path.dirname( __file__ ) + "/alembicFiles/cube.abc" )
 		self.assertSceneValid( r["out"] )
 
+	def testOpenFilesLimit( self ) :
+
+		openFilesLimit = GafferScene.SceneReader.getOpenFilesLimit()
+		self.addCleanup( GafferScene.SceneReader.setOpenFilesLimit, openFilesLimit )
+
+		GafferScene.SceneReader.setOpenFilesLimit( 1 )
+		self.assertEqual( GafferScene.SceneReader.getOpenFilesLimit(), 1 )
+
+		# With only one file allowed open at a time, alternating between
+		# files must still produce correct results.
+		r1 = GafferScene.SceneReader()
+		r1["fileName"].setValue( os.path.dirname( __file__ ) + "/alembicFiles/cube.abc" )
+		r2 = GafferScene.SceneReader()
+		r2["fileName"].setValue( os.path.dirname( __file__ ) + "/alembicFiles/animatedCube.abc" )
+
+		self.assertSceneValid( r1["out"] )
+		self.assertSceneValid( r2["out"] )
+		self.assertSceneValid( r1["out"] )
+
 if __name__ == "__main__":
 	unittest.main()
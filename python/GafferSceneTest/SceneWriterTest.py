@@ -277,5 +277,33 @@ class SceneWriterTest( GafferSceneTest.SceneTestCase ) :
 		ss = s.serialise()
 		self.assertFalse( "out" in ss )
 
+	def testWriteLargeHierarchy( self ) :
+
+		script = Gaffer.ScriptNode()
+		script["sphere"] = GafferScene.Sphere()
+		script["instancer"] = GafferScene.Instancer()
+		script["plane"] = GafferScene.Plane()
+		script["plane"]["divisions"].setValue( imath.V2i( 49 ) )
+		script["instancer"]["in"].setInput( script["plane"]["out"] )
+		script["instancer"]["instances"].setInput( script["sphere"]["out"] )
+		script["instancer"]["parent"].setValue( "/plane" )
+
+		script["writer"] = GafferScene.SceneWriter()
+		script["writer"]["in"].setInput( script["instancer"]["out"] )
+		script["writer"]["fileName"].setValue( self.temporaryDirectory() + "/test.scc" )
+
+		with IECore.CapturingMessageHandler() as mh :
+			script["writer"]["task"].execute()
+
+		statistics = [ m for m in mh.messages if m.context == "SceneWriter" ]
+		self.assertEqual( len( statistics ), 1 )
+		self.assertTrue( statistics[0].message.startswith( "Wrote 2504 locations" ) )
+
+		sc = IECoreScene.SceneCache( self.temporaryDirectory() + "/test.scc", IECore.IndexedIO.OpenMode.Read )
+		instances = sc.scene( [ "plane", "instances", "sphere" ] )
+		self.assertEqual( len( instances.childNames() ), 2500 )
+		for name in instances.childNames() :
+			self.assertTrue( instances.child( name ).hasObject() )
+
 if __name__ == "__main__":
 	unittest.main()
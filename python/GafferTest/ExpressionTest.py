@@ -1413,5 +1413,63 @@ class ExpressionTest( GafferTest.TestCase ) :
 			self.assertEqual( s["n"]["op1"].getValue(), 0 )
 			self.assertEqual( s["n"]["op2"].getValue(), 1 )
 
+	def testPlugsAtDifferentDepths( self ) :
+
+		s = Gaffer.ScriptNode()
+
+		s["n"] = Gaffer.Node()
+		s["n"]["user"]["i"] = Gaffer.IntPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["user"]["v"] = Gaffer.V2iPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["user"]["o"] = Gaffer.IntPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["b"] = Gaffer.Box()
+		s["b"]["m"] = GafferTest.MultiplyNode()
+		s["b"]["m"]["op1"].setValue( 3 )
+		s["b"]["m"]["op2"].setValue( 4 )
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( inspect.cleandoc(
+			"""
+			i = parent["n"]["user"]["i"] + parent["b"]["m"]["product"]
+			parent["n"]["user"]["v"]["x"] = i
+			parent["n"]["user"]["v"]["y"] = i * 2
+			parent["n"]["user"]["o"] = i + int( context.getFrame() )
+			"""
+		) )
+
+		s["n"]["user"]["i"].setValue( 1 )
+		with Gaffer.Context() as c :
+			c.setFrame( 10 )
+			self.assertEqual( s["n"]["user"]["v"].getValue(), imath.V2i( 13, 26 ) )
+			self.assertEqual( s["n"]["user"]["o"].getValue(), 23 )
+			c.setFrame( 20 )
+			self.assertEqual( s["n"]["user"]["o"].getValue(), 33 )
+
+	def testExecuteBatch( self ) :
+
+		s = Gaffer.ScriptNode()
+
+		s["n"] = Gaffer.Node()
+		s["n"]["user"]["i"] = Gaffer.IntPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["user"]["o"] = Gaffer.IntPlug( flags = Gaffer.Plug.Flags.Default | Gaffer.Plug.Flags.Dynamic )
+		s["n"]["user"]["i"].setValue( 2 )
+
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( 'parent["n"]["user"]["o"] = parent["n"]["user"]["i"] * int( context.getFrame() )' )
+
+		contexts = []
+		for frame in range( 1, 6 ) :
+			c = Gaffer.Context()
+			c.setFrame( frame )
+			contexts.append( c )
+
+		values = s["e"].executeBatch( s["n"]["user"]["o"], contexts )
+		self.assertEqual( [ v.value for v in values ], [ 2, 4, 6, 8, 10 ] )
+
+		for c, v in zip( contexts, values ) :
+			with c :
+				self.assertEqual( s["n"]["user"]["o"].getValue(), v.value )
+
+		self.assertRaises( RuntimeError, s["e"].executeBatch, s["n"]["user"]["i"], contexts )
+
 if __name__ == "__main__":
 	unittest.main()
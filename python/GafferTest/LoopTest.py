@@ -185,5 +185,31 @@ class LoopTest( GafferTest.TestCase ) :
 
 		self.assertTrue( n.correspondingInput( n["out"] ).isSame( n["in"] ) )
 
+	def testManyIterations( self ) :
+
+		n = self.intLoop()
+		a = GafferTest.AddNode()
+
+		n["in"].setValue( 0 )
+		n["next"].setInput( a["sum"] )
+
+		a["op1"].setInput( n["previous"] )
+		a["op2"].setValue( 1 )
+
+		with Gaffer.Context() as c :
+
+			# Evaluating this many iterations recursively would
+			# require an extremely deep call stack.
+			n["iterations"].setValue( 50000 )
+			self.assertEqual( n["out"].getValue(), 50000 )
+
+			a["op2"].setValue( 2 )
+			self.assertEqual( n["out"].getValue(), 100000 )
+
+			# The previous plug is still evaluated recursively, but only
+			# as far as the iterations already cached above.
+			c["loop:index"] = 40000
+			self.assertEqual( n["previous"].getValue(), 80000 )
+
 if __name__ == "__main__":
 	unittest.main()
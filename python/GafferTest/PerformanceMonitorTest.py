@@ -132,23 +132,87 @@ class PerformanceMonitorTest( GafferTest.TestCase ) :
 			hashCount = 10,
 			computeCount = 20,
 			hashDuration = 100,
-			computeDuration = 200
+			computeDuration = 200,
+			cacheHitCount = 30,
+			cacheMissCount = 40,
+			cacheBytesInserted = 1000,
+			cacheEvictionCount = 50,
+			duplicateComputeCount = 60,
+			duplicateComputeDuration = 300,
 		)
 
 		self.assertEqual( s.hashCount, 10 )
 		self.assertEqual( s.computeCount, 20 )
 		self.assertEqual( s.hashDuration, 100 )
 		self.assertEqual( s.computeDuration, 200 )
+		self.assertEqual( s.cacheHitCount, 30 )
+		self.assertEqual( s.cacheMissCount, 40 )
+		self.assertEqual( s.cacheBytesInserted, 1000 )
+		self.assertEqual( s.cacheEvictionCount, 50 )
+		self.assertEqual( s.duplicateComputeCount, 60 )
+		self.assertEqual( s.duplicateComputeDuration, 300 )
 
 		s.hashCount = 20
 		s.computeCount = 30
 		s.hashDuration = 200
 		s.computeDuration = 300
+		s.cacheHitCount = 40
+		s.cacheMissCount = 50
+		s.cacheBytesInserted = 2000
+		s.cacheEvictionCount = 60
+		s.duplicateComputeCount = 70
+		s.duplicateComputeDuration = 400
 
 		self.assertEqual( s.hashCount, 20 )
 		self.assertEqual( s.computeCount, 30 )
 		self.assertEqual( s.hashDuration, 200 )
 		self.assertEqual( s.computeDuration, 300 )
+		self.assertEqual( s.cacheHitCount, 40 )
+		self.assertEqual( s.cacheMissCount, 50 )
+		self.assertEqual( s.cacheBytesInserted, 2000 )
+		self.assertEqual( s.cacheEvictionCount, 60 )
+		self.assertEqual( s.duplicateComputeCount, 70 )
+		self.assertEqual( s.duplicateComputeDuration, 400 )
+
+	def testCacheStatistics( self ) :
+
+		m = Gaffer.PerformanceMonitor()
+
+		a = GafferTest.AddNode()
+		a["op1"].setValue( 1 )
+		a["op2"].setValue( 2 )
+
+		# First computation misses the cache, and inserts
+		# the result.
+
+		with m :
+			self.assertEqual( a["sum"].getValue(), 3 )
+
+		s = m.plugStatistics( a["sum"] )
+		self.assertEqual( s.cacheHitCount, 0 )
+		self.assertEqual( s.cacheMissCount, 1 )
+		self.assertEqual( s.cacheBytesInserted, IECore.IntData( 3 ).memoryUsage() )
+		self.assertEqual( s.cacheEvictionCount, 0 )
+		self.assertEqual( s.duplicateComputeCount, 0 )
+
+		# Second computation hits the cache.
+
+		with m :
+			self.assertEqual( a["sum"].getValue(), 3 )
+
+		s = m.plugStatistics( a["sum"] )
+		self.assertEqual( s.cacheHitCount, 1 )
+		self.assertEqual( s.cacheMissCount, 1 )
+
+		# Clearing the cache is reported as an eviction
+		# for the plug that inserted the value.
+
+		with m :
+			Gaffer.ValuePlug.clearCache()
+
+		s = m.plugStatistics( a["sum"] )
+		self.assertEqual( s.cacheEvictionCount, 1 )
+		self.assertEqual( m.combinedStatistics().cacheEvictionCount, 1 )
 
 	def testEnterReturnValue( self ) :
 
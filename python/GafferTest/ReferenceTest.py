@@ -1150,6 +1150,82 @@ class ReferenceTest( GafferTest.TestCase ) :
 
 		assertReferenceConnections()
 
+	def testParallelLoading( self ) :
+
+		# Make a reference which itself contains references.
+
+		s = Gaffer.ScriptNode()
+		s["b"] = Gaffer.Box()
+		s["b"]["n"] = GafferTest.AddNode()
+		Gaffer.PlugAlgo.promote( s["b"]["n"]["op1"] )
+		s["b"].exportForReference( self.temporaryDirectory() + "/inner.grf" )
+
+		s = Gaffer.ScriptNode()
+		s["b"] = Gaffer.Box()
+		for i in range( 0, 3 ) :
+			s["b"]["r%d" % i] = Gaffer.Reference()
+			s["b"]["r%d" % i].load( self.temporaryDirectory() + "/inner.grf" )
+			s["b"]["r%d" % i]["op1"].setValue( i )
+		s["b"].exportForReference( self.temporaryDirectory() + "/outer.grf" )
+
+		# And a script which references both, as well as
+		# a file which doesn't exist (which we can only
+		# achieve by editing the file).
+
+		s = Gaffer.ScriptNode()
+		s["r1"] = Gaffer.Reference()
+		s["r1"].load( self.temporaryDirectory() + "/outer.grf" )
+		s["r2"] = Gaffer.Reference()
+		s["r2"].load( self.temporaryDirectory() + "/inner.grf" )
+		s["r2"]["op1"].setValue( 10 )
+		s["r3"] = Gaffer.Reference()
+		s["r3"].load( self.temporaryDirectory() + "/inner.grf" )
+		s["fileName"].setValue( self.temporaryDirectory() + "/test.gfr" )
+		s.save()
+
+		with open( s["fileName"].getValue() ) as f :
+			script = f.read()
+		with open( s["fileName"].getValue(), "w" ) as f :
+			f.write(
+				script.replace(
+					'__children["r3"].load( "{0}/inner.grf" )'.format( self.temporaryDirectory() ),
+					'__children["r3"].load( "{0}/missing.grf" )'.format( self.temporaryDirectory() ),
+				)
+			)
+
+		self.addCleanup( Gaffer.ScriptNode.setParallelLoading, Gaffer.ScriptNode.getParallelLoading() )
+
+		serialisations = []
+		for parallel in ( True, False ) :
+
+			Gaffer.ScriptNode.setParallelLoading( parallel )
+			Gaffer.ScriptNode.resetLoadStatistics()
+
+			s2 = Gaffer.ScriptNode()
+			s2["fileName"].setValue( s["fileName"].getValue() )
+			with IECore.CapturingMessageHandler() as mh :
+				s2.load( continueOnError = True )
+
+			# The missing file should still be reported when
+			# its load is reached.
+			errors = [ m for m in mh.messages if m.level == IECore.Msg.Level.Error ]
+			self.assertEqual( len( errors ), 1 )
+			self.assertTrue( "missing.grf" in errors[0].message )
+
+			for i in range( 0, 3 ) :
+				self.assertEqual( s2["r1"]["r%d" % i]["op1"].getValue(), i )
+			self.assertEqual( s2["r2"]["op1"].getValue(), 10 )
+			serialisations.append( s2.serialise() )
+
+			stats = Gaffer.ScriptNode.loadStatistics()
+			self.assertEqual( stats[s["fileName"].getValue()].loads, 1 )
+			self.assertEqual( stats[self.temporaryDirectory() + "/outer.grf"].loads, 1 )
+			self.assertEqual( stats[self.temporaryDirectory() + "/inner.grf"].loads, 4 )
+			for fileName, fileStats in stats.items() :
+				self.assertGreaterEqual( fileStats.totalTime, fileStats.readTime )
+
+		self.assertEqual( serialisations[0], serialisations[1] )
+
 	def tearDown( self ) :
 
 		GafferTest.TestCase.tearDown( self )
@@ -1444,5 +1444,68 @@ class ScriptNodeTest( GafferTest.TestCase ) :
 		s["fileName"].setValue( self.temporaryDirectory() + "/test2.gfr" )
 		self.assertFalse( Gaffer.MetadataAlgo.getReadOnly( s ) )
 
+	def testCodeCache( self ) :
+
+		directory = Gaffer.ScriptNode.getCodeCacheDirectory()
+		self.addCleanup( Gaffer.ScriptNode.setCodeCacheDirectory, directory )
+		Gaffer.ScriptNode.setCodeCacheDirectory( self.temporaryDirectory() + "/codeCache" )
+		Gaffer.ScriptNode.clearCodeCache()
+
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.AddNode()
+		s["n"]["op1"].setValue( 10 )
+		s["fileName"].setValue( self.temporaryDirectory() + "/test.gfr" )
+		s.save()
+
+		def assertLoads( op1, hits, misses, continueOnError = False ) :
+
+			s2 = Gaffer.ScriptNode()
+			s2["fileName"].setValue( s["fileName"].getValue() )
+			s2.load( continueOnError = continueOnError )
+			self.assertEqual( s2["n"]["op1"].getValue(), op1 )
+			self.assertEqual( Gaffer.ScriptNode.codeCacheHits(), hits )
+			self.assertEqual( Gaffer.ScriptNode.codeCacheMisses(), misses )
+
+		Gaffer.ScriptNode.resetCodeCacheStatistics()
+
+		# First load compiles, subsequent loads use the cache.
+
+		assertLoads( 10, hits = 0, misses = 1 )
+		assertLoads( 10, hits = 1, misses = 1 )
+		assertLoads( 10, hits = 2, misses = 1 )
+
+		# Clearing the in-memory cache falls back to the disk cache.
+
+		Gaffer.ScriptNode.clearCodeCache()
+		assertLoads( 10, hits = 3, misses = 1 )
+		self.assertNotEqual( os.listdir( Gaffer.ScriptNode.getCodeCacheDirectory() ), [] )
+
+		# Modifying the file invalidates the cache.
+
+		s["n"]["op1"].setValue( 20 )
+		s.save()
+		assertLoads( 20, hits = 3, misses = 2 )
+
+		# Code for `continueOnError` is compiled separately.
+
+		assertLoads( 20, hits = 3, misses = 3, continueOnError = True )
+		assertLoads( 20, hits = 4, misses = 3, continueOnError = True )
+
+		# Executing strings doesn't use the cache.
+
+		s.execute( "parent['n']['op2'].setValue( 1 )" )
+		self.assertEqual( Gaffer.ScriptNode.codeCacheHits(), 4 )
+		self.assertEqual( Gaffer.ScriptNode.codeCacheMisses(), 3 )
+
+	def testCodeCacheErrors( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["fileName"].setValue( self.temporaryDirectory() + "/test.gfr" )
+		with open( s["fileName"].getValue(), "w" ) as f :
+			f.write( "a = 10\n)\n" )
+
+		for i in range( 0, 2 ) :
+			self.assertRaisesRegexp( RuntimeError, "Line 2 of .*test.gfr", s.load )
+
 if __name__ == "__main__":
 	unittest.main()
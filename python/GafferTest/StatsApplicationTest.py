@@ -35,6 +35,7 @@
 ##########################################################################
 
 import re
+import json
 import unittest
 import subprocess32 as subprocess
 
@@ -69,5 +70,80 @@ class StatsApplicationTest( GafferTest.TestCase ) :
 		self.assertTrue( re.search( r"Box\s*1", o ) )
 		self.assertTrue( re.search( r"Total\s*3", o ) )
 
+	def testJSON( self ) :
+
+		script = Gaffer.ScriptNode()
+		script["n"] = GafferTest.AddNode()
+		script["fileName"].setValue( self.temporaryDirectory() + "/script.gfr" )
+		script.save()
+
+		o = subprocess.check_output( [ "gaffer", "stats", script["fileName"].getValue(), "-json" ] )
+		j = json.loads( o )
+
+		self.assertEqual( j["version"]["Current"], Gaffer.About.versionString() )
+		self.assertEqual( j["nodes"], { "AddNode" : 1 } )
+		self.assertIn( "Loading", j["timers"] )
+		self.assertIn( "wall", j["timers"]["Loading"] )
+		self.assertIn( "Cache usage", j["memory"] )
+		self.assertNotIn( "performanceMonitor", j )
+
+	def testTraceFile( self ) :
+
+		import GafferDispatchTest
+
+		script = Gaffer.ScriptNode()
+		script["w"] = GafferDispatchTest.TextWriter()
+		script["w"]["fileName"].setValue( self.temporaryDirectory() + "/text.txt" )
+		script["e"] = Gaffer.Expression()
+		script["e"].setExpression( """parent["w"]["text"] = "test%d" % context.getFrame()""" )
+		script["fileName"].setValue( self.temporaryDirectory() + "/script.gfr" )
+		script.save()
+
+		traceFileName = self.temporaryDirectory() + "/trace.json"
+		subprocess.check_call( [ "gaffer", "stats", script["fileName"].getValue(), "-task", "w", "-traceFile", traceFileName ] )
+
+		with open( traceFileName ) as f :
+			trace = json.load( f )
+
+		# We expect to see the computation of the expression.
+		beginEvents = [ e for e in trace["traceEvents"] if e["ph"] == "B" ]
+		self.assertTrue( any( e["name"].startswith( "e." ) for e in beginEvents ) )
+		self.assertEqual( len( beginEvents ), len( [ e for e in trace["traceEvents"] if e["ph"] == "E" ] ) )
+
+	def testCompare( self ) :
+
+		def writeStats( fileName, loadingTime, computeDuration ) :
+
+			with open( fileName, "w" ) as f :
+				json.dump(
+					{
+						"timers" : { "Loading" : { "wall" : loadingTime, "cpu" : loadingTime } },
+						"performanceMonitor" : {
+							"plugs" : {
+								"n.sum" : { "hashCount" : 1, "computeCount" : 1, "hashDuration" : 1000, "computeDuration" : computeDuration },
+							}
+						}
+					},
+					f
+				)
+
+		before = self.temporaryDirectory() + "/before.json"
+		after = self.temporaryDirectory() + "/after.json"
+		writeStats( before, 1.0, int( 1e9 ) )
+
+		# Within the threshold
+
+		writeStats( after, 1.05, int( 1.05e9 ) )
+		self.assertEqual( subprocess.call( [ "gaffer", "stats", "-compare", before, after ] ), 0 )
+
+		# Above the threshold
+
+		writeStats( after, 1.05, int( 2e9 ) )
+		process = subprocess.Popen( [ "gaffer", "stats", "-compare", before, after ], stdout = subprocess.PIPE )
+		o = process.communicate()[0]
+		self.assertEqual( process.returncode, 1 )
+		self.assertTrue( re.search( r"n\.sum \(computeDuration\)\s*1\.000s -> 2\.000s", o ) )
+		self.assertNotIn( "Loading", o )
+
 if __name__ == "__main__":
 	unittest.main()
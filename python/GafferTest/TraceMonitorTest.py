@@ -0,0 +1,135 @@
+##########################################################################
+#
+#  Copyright (c) 2018, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import json
+import unittest
+
+import IECore
+
+import Gaffer
+import GafferTest
+
+class TraceMonitorTest( GafferTest.TestCase ) :
+
+	def test( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["a1"] = GafferTest.AddNode()
+		s["a2"] = GafferTest.AddNode()
+		s["a2"]["op1"].setInput( s["a1"]["sum"] )
+
+		m = Gaffer.TraceMonitor()
+		with Gaffer.Context() as c, m :
+			s["a2"]["sum"].getValue()
+
+		fileName = os.path.join( self.temporaryDirectory(), "trace.json" )
+		m.writeTrace( fileName )
+
+		with open( fileName ) as f :
+			trace = json.load( f )
+
+		events = [ e for e in trace["traceEvents"] if e["ph"] in ( "B", "E" ) ]
+		beginEvents = [ e for e in events if e["ph"] == "B" ]
+
+		# Every process which started must also have finished.
+		self.assertEqual( len( beginEvents ) * 2, len( events ) )
+
+		self.assertEqual(
+			set( ( e["name"], e["cat"] ) for e in beginEvents ),
+			{
+				( "a2.sum", "computeNode:hash" ),
+				( "a2.sum", "computeNode:compute" ),
+				( "a1.sum", "computeNode:hash" ),
+				( "a1.sum", "computeNode:compute" ),
+			}
+		)
+
+		for e in beginEvents :
+			self.assertEqual( e["args"]["context"], str( c.hash() ) )
+
+		# Events on each thread must be correctly nested and in
+		# chronological order.
+
+		depths = {}
+		times = {}
+		for e in events :
+			self.assertGreaterEqual( e["ts"], times.get( e["tid"], 0 ) )
+			times[e["tid"]] = e["ts"]
+			depths[e["tid"]] = depths.get( e["tid"], 0 ) + ( 1 if e["ph"] == "B" else -1 )
+			self.assertGreaterEqual( depths[e["tid"]], 0 )
+
+		# Clearing should remove all events.
+
+		m.clear()
+		m.writeTrace( fileName )
+		with open( fileName ) as f :
+			trace = json.load( f )
+
+		self.assertEqual( [ e for e in trace["traceEvents"] if e["ph"] != "M" ], [] )
+
+	def testDontRecordPreExistingProcesses( self ) :
+
+		s = Gaffer.ScriptNode()
+		s["n"] = GafferTest.MultiplyNode()
+		s["n"]["op2"].setValue( 1 )
+		s["e"] = Gaffer.Expression()
+		s["e"].setExpression( """parent["n"]["op1"] = context["op1"]""" )
+
+		def backgroundFunction() :
+
+			with Gaffer.Context() as c :
+				for i in range( 0, 10000 ) :
+					c["op1"] = i
+					self.assertEqual( s["n"]["product"].getValue(), i )
+
+		t = Gaffer.ParallelAlgo.callOnBackgroundThread(
+			s["n"]["product"], backgroundFunction
+		)
+
+		m = Gaffer.TraceMonitor()
+		with m :
+			t.wait()
+
+		fileName = os.path.join( self.temporaryDirectory(), "trace.json" )
+		m.writeTrace( fileName )
+		with open( fileName ) as f :
+			trace = json.load( f )
+
+		self.assertEqual( [ e for e in trace["traceEvents"] if e["ph"] != "M" ], [] )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -35,7 +35,10 @@
 #
 ##########################################################################
 
+import os
 import gc
+import shutil
+import subprocess32 as subprocess
 
 import IECore
 
@@ -616,17 +619,216 @@ class ValuePlugTest( GafferTest.TestCase ) :
 		n["user"]["c"].setInput( None )
 		self.assertTrue( n["user"]["c"]["i"].getInput() is None )
 
+	def testDiskCache( self ) :
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.temporaryDirectory() + "/diskCache" )
+		Gaffer.ValuePlug.resetDiskCacheStatistics()
+
+		n = GafferTest.CachingTestNode()
+		n["out"].setFlags( Gaffer.Plug.Flags.DiskCacheable, True )
+		n["in"].setValue( "d" )
+
+		# First computation misses, and writes to the disk cache.
+
+		v1 = n["out"].getValue( _copy = False )
+		self.assertEqual( v1, IECore.StringData( "d" ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheMisses(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheHits(), 0 )
+
+		# Clearing the memory cache simulates a fresh process, which
+		# should load the value from disk rather than compute it.
+
+		Gaffer.ValuePlug.clearCache()
+		v2 = n["out"].getValue( _copy = False )
+		self.assertEqual( v2, v1 )
+		self.failIf( v2.isSame( v1 ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheHits(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 1 )
+
+		# Clearing the disk cache too forces recomputation.
+
+		Gaffer.ValuePlug.clearCache()
+		Gaffer.ValuePlug.clearDiskCache()
+		v3 = n["out"].getValue( _copy = False )
+		self.assertEqual( v3, v1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheHits(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheMisses(), 2 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 2 )
+
+	def testDiskCacheSizeLimit( self ) :
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.temporaryDirectory() + "/diskCache" )
+		Gaffer.ValuePlug.setDiskCacheSizeLimit( 0 )
+		Gaffer.ValuePlug.resetDiskCacheStatistics()
+
+		n = GafferTest.CachingTestNode()
+		n["out"].setFlags( Gaffer.Plug.Flags.DiskCacheable, True )
+		for i in range( 0, 10 ) :
+			n["in"].setValue( str( i ) )
+			n["out"].getValue()
+
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 10 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheEvictions(), 10 )
+
+	def testDiskCacheRequiresFlag( self ) :
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.temporaryDirectory() + "/diskCache" )
+		Gaffer.ValuePlug.resetDiskCacheStatistics()
+
+		n = GafferTest.CachingTestNode()
+		n["in"].setValue( "f" )
+
+		self.assertFalse( n["out"].getFlags( Gaffer.Plug.Flags.DiskCacheable ) )
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "f" ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheMisses(), 0 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 0 )
+
+		n["out"].setFlags( Gaffer.Plug.Flags.DiskCacheable, True )
+		Gaffer.ValuePlug.clearCache()
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "f" ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheMisses(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 1 )
+
+	def testDiskCacheFilesRemovedExternally( self ) :
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.temporaryDirectory() + "/diskCache" )
+		Gaffer.ValuePlug.resetDiskCacheStatistics()
+
+		n = GafferTest.CachingTestNode()
+		n["out"].setFlags( Gaffer.Plug.Flags.DiskCacheable, True )
+		n["in"].setValue( "r" )
+		n["out"].getValue()
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 1 )
+
+		# Simulate eviction by another process. The missing
+		# file should be treated as a miss, and the value
+		# computed again.
+
+		shutil.rmtree( self.temporaryDirectory() + "/diskCache" )
+		Gaffer.ValuePlug.clearCache()
+
+		self.assertEqual( n["out"].getValue(), IECore.StringData( "r" ) )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheHits(), 0 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheMisses(), 2 )
+		self.assertEqual( Gaffer.ValuePlug.diskCacheWrites(), 2 )
+
+	def testMarkHashUnstable( self ) :
+
+		h1 = IECore.MurmurHash()
+		Gaffer.ValuePlug.markHashUnstable( h1 )
+		self.assertNotEqual( h1, IECore.MurmurHash() )
+
+		# The hash is consistent within a process, so as not to
+		# interfere with the memory cache.
+
+		h2 = IECore.MurmurHash()
+		Gaffer.ValuePlug.markHashUnstable( h2 )
+		self.assertEqual( h1, h2 )
+
+		# But differs between processes, so that unstable
+		# values can't be retrieved from the disk cache.
+
+		h3 = subprocess.check_output( [
+			"gaffer", "env", "python", "-c",
+			"import IECore, Gaffer; h = IECore.MurmurHash(); Gaffer.ValuePlug.markHashUnstable( h ); print h"
+		] ).strip()
+		self.assertNotEqual( h3, h1.toString() )
+
+	def testHashFileModificationTime( self ) :
+
+		fileName = self.temporaryDirectory() + "/test.txt"
+		with open( fileName, "w" ) as f :
+			f.write( "a" )
+
+		# Nothing is hashed unless the disk cache is enabled.
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( "" )
+		h = IECore.MurmurHash()
+		Gaffer.ValuePlug.hashFileModificationTime( fileName, h )
+		self.assertEqual( h, IECore.MurmurHash() )
+
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.temporaryDirectory() + "/diskCache" )
+		h1 = IECore.MurmurHash()
+		Gaffer.ValuePlug.hashFileModificationTime( fileName, h1 )
+		self.assertNotEqual( h1, IECore.MurmurHash() )
+
+		h2 = IECore.MurmurHash()
+		Gaffer.ValuePlug.hashFileModificationTime( fileName, h2 )
+		self.assertEqual( h1, h2 )
+
+		st = os.stat( fileName )
+		os.utime( fileName, ( st.st_atime, st.st_mtime + 10 ) )
+		h3 = IECore.MurmurHash()
+		Gaffer.ValuePlug.hashFileModificationTime( fileName, h3 )
+		self.assertNotEqual( h3, h1 )
+
+	def testHashCacheInvalidation( self ) :
+
+		a1 = GafferTest.AddNode()
+		a2 = GafferTest.AddNode()
+		a2["op1"].setInput( a1["sum"] )
+		b = GafferTest.AddNode()
+
+		a2["sum"].hash()
+		b["sum"].hash()
+
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+
+		a2["sum"].hash()
+		b["sum"].hash()
+
+		self.assertEqual( Gaffer.ValuePlug.hashCacheHits(), 2 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheMisses(), 0 )
+
+		# Dirtying a1 should invalidate the entries for a1 and a2,
+		# but not for the unrelated b.
+
+		a1["op1"].setValue( 1 )
+
+		a2["sum"].hash()
+		self.assertEqual( Gaffer.ValuePlug.hashCacheMisses(), 2 )
+
+		b["sum"].hash()
+		self.assertEqual( Gaffer.ValuePlug.hashCacheHits(), 3 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheMisses(), 2 )
+
+	def testHashCacheSizeLimit( self ) :
+
+		a = GafferTest.AddNode()
+		b = GafferTest.AddNode()
+
+		Gaffer.ValuePlug.setHashCacheSizeLimit( 1 )
+		a["sum"].hash()
+		b["sum"].hash()
+		Gaffer.ValuePlug.resetHashCacheStatistics()
+
+		# b should have evicted a from the cache.
+		a["sum"].hash()
+		self.assertEqual( Gaffer.ValuePlug.hashCacheMisses(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheHits(), 0 )
+
+		a["sum"].hash()
+		self.assertEqual( Gaffer.ValuePlug.hashCacheMisses(), 1 )
+		self.assertEqual( Gaffer.ValuePlug.hashCacheHits(), 1 )
+
 	def setUp( self ) :
 
 		GafferTest.TestCase.setUp( self )
 
 		self.__originalCacheMemoryLimit = Gaffer.ValuePlug.getCacheMemoryLimit()
+		self.__originalDiskCacheDirectory = Gaffer.ValuePlug.getDiskCacheDirectory()
+		self.__originalDiskCacheSizeLimit = Gaffer.ValuePlug.getDiskCacheSizeLimit()
+		self.__originalHashCacheSizeLimit = Gaffer.ValuePlug.getHashCacheSizeLimit()
 
 	def tearDown( self ) :
 
 		GafferTest.TestCase.tearDown( self )
 
 		Gaffer.ValuePlug.setCacheMemoryLimit( self.__originalCacheMemoryLimit )
+		Gaffer.ValuePlug.setDiskCacheDirectory( self.__originalDiskCacheDirectory )
+		Gaffer.ValuePlug.setDiskCacheSizeLimit( self.__originalDiskCacheSizeLimit )
+		Gaffer.ValuePlug.setHashCacheSizeLimit( self.__originalHashCacheSizeLimit )
 
 if __name__ == "__main__":
 	unittest.main()
@@ -128,6 +128,7 @@ from DownstreamIteratorTest import DownstreamIteratorTest
 from PerformanceMonitorTest import PerformanceMonitorTest
 from MetadataAlgoTest import MetadataAlgoTest
 from ContextMonitorTest import ContextMonitorTest
+from TraceMonitorTest import TraceMonitorTest
 from PlugAlgoTest import PlugAlgoTest
 from BoxInTest import BoxInTest
 from BoxOutTest import BoxOutTest
@@ -48,6 +48,7 @@
 
 #include "boost/bind.hpp"
 #include "boost/bind/placeholders.hpp"
+#include "boost/format.hpp"
 
 using namespace IECore;
 using namespace Gaffer;
@@ -257,6 +258,54 @@ const ObjectVectorPlug *Expression::executePlug() const
 	return getChild<ObjectVectorPlug>( g_firstPlugIndex + 4 );
 }
 
+void Expression::executeBatch( const ValuePlug *output, const std::vector<ConstContextPtr> &contexts, std::vector<IECore::ConstObjectPtr> &values ) const
+{
+	// Find the child of outPlug() which provides the value for output.
+	const ValuePlug *outPlugChild = output->source<ValuePlug>();
+	while( outPlugChild )
+	{
+		const ValuePlug *p = outPlugChild->parent<ValuePlug>();
+		if( p == outPlug() )
+		{
+			break;
+		}
+		outPlugChild = p;
+	}
+
+	if( !outPlugChild )
+	{
+		throw IECore::Exception( boost::str( boost::format( "Plug \"%s\" is not driven by expression \"%s\"" ) % output->fullName() % fullName() ) );
+	}
+
+	size_t index = 0;
+	for( ValuePlugIterator it( outPlug() ); !it.done() && *it != outPlugChild; ++it )
+	{
+		index++;
+	}
+
+	values.clear();
+	values.reserve( contexts.size() );
+	if( !m_engine )
+	{
+		values.resize( contexts.size() );
+		return;
+	}
+
+	std::vector<const ValuePlug *> inputs;
+	for( ValuePlugIterator it( inPlug() ); !it.done(); ++it )
+	{
+		inputs.push_back( it->get() );
+	}
+
+	std::vector<IECore::ConstObjectVectorPtr> results;
+	m_engine->executeBatch( contexts, inputs, results );
+
+	for( std::vector<IECore::ConstObjectVectorPtr>::const_iterator it = results.begin(), eIt = results.end(); it != eIt; ++it )
+	{
+		values.push_back( index < (*it)->members().size() ? (*it)->members()[index] : nullptr );
+	}
+}
+
 void Expression::affects( const Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	ComputeNode::affects( input, outputs );
@@ -521,6 +570,17 @@ void Expression::plugSet( const Plug *plug )
 // Expression::Engine implementation
 //////////////////////////////////////////////////////////////////////////
 
+void Expression::Engine::executeBatch( const std::vector<ConstContextPtr> &contexts, const std::vector<const ValuePlug *> &proxyInputs, std::vector<IECore::ConstObjectVectorPtr> &results ) const
+{
+	results.clear();
+	results.reserve( contexts.size() );
+	for( std::vector<ConstContextPtr>::const_iterator it = contexts.begin(), eIt = contexts.end(); it != eIt; ++it )
+	{
+		Context::Scope scope( it->get() );
+		results.push_back( execute( it->get(), proxyInputs ) );
+	}
+}
+
 Expression::EnginePtr Expression::Engine::create( const std::string engineType )
 {
 	const CreatorMap &m = creators();
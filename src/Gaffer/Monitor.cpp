@@ -66,6 +66,26 @@ bool Monitor::getActive() const
 	return Process::monitorRegistered( this );
 }
 
+void Monitor::cacheHit( const ValuePlug *plug )
+{
+}
+
+void Monitor::cacheMiss( const ValuePlug *plug )
+{
+}
+
+void Monitor::cacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes )
+{
+}
+
+void Monitor::cacheEviction( const IECore::MurmurHash &hash )
+{
+}
+
+void Monitor::duplicateCompute( const ValuePlug *plug )
+{
+}
+
 Monitor::Scope::Scope( Monitor *monitor )
 	:	m_monitor( monitor )
 {
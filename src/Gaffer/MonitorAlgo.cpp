@@ -204,6 +204,108 @@ struct HashesPerComputeMetric
 
 };
 
+struct CacheHitCountMetric
+{
+
+	typedef size_t ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.cacheHitCount;
+	}
+
+	const char *description() const
+	{
+		return "number of compute cache hits";
+	}
+
+};
+
+struct CacheMissCountMetric
+{
+
+	typedef size_t ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.cacheMissCount;
+	}
+
+	const char *description() const
+	{
+		return "number of compute cache misses";
+	}
+
+};
+
+struct CacheBytesInsertedMetric
+{
+
+	typedef size_t ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.cacheBytesInserted;
+	}
+
+	const char *description() const
+	{
+		return "bytes inserted into the compute cache";
+	}
+
+};
+
+struct CacheEvictionCountMetric
+{
+
+	typedef size_t ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.cacheEvictionCount;
+	}
+
+	const char *description() const
+	{
+		return "number of compute cache evictions";
+	}
+
+};
+
+struct DuplicateComputeCountMetric
+{
+
+	typedef size_t ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.duplicateComputeCount;
+	}
+
+	const char *description() const
+	{
+		return "number of computes of already cached values";
+	}
+
+};
+
+struct DuplicateComputeDurationMetric
+{
+
+	typedef boost::chrono::duration<double> ResultType;
+
+	ResultType operator() ( const PerformanceMonitor::Statistics &s ) const
+	{
+		return s.duplicateComputeDuration;
+	}
+
+	const char *description() const
+	{
+		return "time spent computing already cached values";
+	}
+
+};
+
 // Utility for invoking a templated functor with a particular metric.
 template<typename F>
 typename F::ResultType dispatchMetric( const F &f, MonitorAlgo::PerformanceMetric performanceMetric )
@@ -226,6 +328,18 @@ typename F::ResultType dispatchMetric( const F &f, MonitorAlgo::PerformanceMetri
 			return f( PerComputeDurationMetric() );
 		case MonitorAlgo::HashesPerCompute :
 			return f( HashesPerComputeMetric() );
+		case MonitorAlgo::CacheHitCount :
+			return f( CacheHitCountMetric() );
+		case MonitorAlgo::CacheMissCount :
+			return f( CacheMissCountMetric() );
+		case MonitorAlgo::CacheBytesInserted :
+			return f( CacheBytesInsertedMetric() );
+		case MonitorAlgo::CacheEvictionCount :
+			return f( CacheEvictionCountMetric() );
+		case MonitorAlgo::DuplicateComputeCount :
+			return f( DuplicateComputeCountMetric() );
+		case MonitorAlgo::DuplicateComputeDuration :
+			return f( DuplicateComputeDurationMetric() );
 		default :
 			return f( InvalidMetric() );
 	}
@@ -38,6 +38,7 @@
 
 #include "Gaffer/Plug.h"
 #include "Gaffer/Process.h"
+#include "Gaffer/ValuePlug.h"
 
 using namespace Gaffer;
 
@@ -51,8 +52,21 @@ static PerformanceMonitor::Statistics g_emptyStatistics;
 // PerformanceMonitor::Statistics
 //////////////////////////////////////////////////////////////////////////
 
-PerformanceMonitor::Statistics::Statistics( size_t hashCount, size_t computeCount, boost::chrono::nanoseconds hashDuration, boost::chrono::nanoseconds computeDuration )
-	:	hashCount( hashCount ), computeCount( computeCount ), hashDuration( hashDuration ), computeDuration( computeDuration )
+PerformanceMonitor::Statistics::Statistics(
+	size_t hashCount,
+	size_t computeCount,
+	boost::chrono::nanoseconds hashDuration,
+	boost::chrono::nanoseconds computeDuration,
+	size_t cacheHitCount,
+	size_t cacheMissCount,
+	size_t cacheBytesInserted,
+	size_t cacheEvictionCount,
+	size_t duplicateComputeCount,
+	boost::chrono::nanoseconds duplicateComputeDuration
+)
+	:	hashCount( hashCount ), computeCount( computeCount ), hashDuration( hashDuration ), computeDuration( computeDuration ),
+		cacheHitCount( cacheHitCount ), cacheMissCount( cacheMissCount ), cacheBytesInserted( cacheBytesInserted ), cacheEvictionCount( cacheEvictionCount ),
+		duplicateComputeCount( duplicateComputeCount ), duplicateComputeDuration( duplicateComputeDuration )
 {
 }
 
@@ -62,6 +76,12 @@ PerformanceMonitor::Statistics & PerformanceMonitor::Statistics::operator += ( c
 	computeCount += rhs.computeCount;
 	hashDuration += rhs.hashDuration;
 	computeDuration += rhs.computeDuration;
+	cacheHitCount += rhs.cacheHitCount;
+	cacheMissCount += rhs.cacheMissCount;
+	cacheBytesInserted += rhs.cacheBytesInserted;
+	cacheEvictionCount += rhs.cacheEvictionCount;
+	duplicateComputeCount += rhs.duplicateComputeCount;
+	duplicateComputeDuration += rhs.duplicateComputeDuration;
 	return *this;
 }
 
@@ -71,7 +91,13 @@ bool PerformanceMonitor::Statistics::operator == ( const Statistics &rhs )
 		hashCount == rhs.hashCount &&
 		computeCount == rhs.computeCount &&
 		hashDuration == rhs.hashDuration &&
-		computeDuration == rhs.computeDuration
+		computeDuration == rhs.computeDuration &&
+		cacheHitCount == rhs.cacheHitCount &&
+		cacheMissCount == rhs.cacheMissCount &&
+		cacheBytesInserted == rhs.cacheBytesInserted &&
+		cacheEvictionCount == rhs.cacheEvictionCount &&
+		duplicateComputeCount == rhs.duplicateComputeCount &&
+		duplicateComputeDuration == rhs.duplicateComputeDuration
 	;
 }
 
@@ -80,6 +106,15 @@ bool PerformanceMonitor::Statistics::operator != ( const Statistics &rhs )
 	return !( *this == rhs );
 }
 
+//////////////////////////////////////////////////////////////////////////
+// PerformanceMonitor::ThreadData
+//////////////////////////////////////////////////////////////////////////
+
+PerformanceMonitor::ThreadData::Duration::Duration( const Process *process, boost::chrono::nanoseconds *target, boost::chrono::nanoseconds *duplicateTarget )
+	:	process( process ), target( target ), duplicateTarget( duplicateTarget ), elapsed( 0 ), duplicate( false )
+{
+}
+
 //////////////////////////////////////////////////////////////////////////
 // PerformanceMonitor
 //////////////////////////////////////////////////////////////////////////
@@ -129,7 +164,7 @@ void PerformanceMonitor::processStarted( const Process *process )
 	boost::chrono::high_resolution_clock::time_point now = boost::chrono::high_resolution_clock::now();
 	if( !threadData.durationStack.empty() )
 	{
-		*(threadData.durationStack.top()) += now - threadData.then;
+		threadData.durationStack.top().elapsed += now - threadData.then;
 	}
 	threadData.then = now;
 
@@ -137,12 +172,12 @@ void PerformanceMonitor::processStarted( const Process *process )
 	if( type == g_hashType )
 	{
 		s.hashCount++;
-		threadData.durationStack.push( &s.hashDuration );
+		threadData.durationStack.push( ThreadData::Duration( process, &s.hashDuration, nullptr ) );
 	}
 	else
 	{
 		s.computeCount++;
-		threadData.durationStack.push( &s.computeDuration );
+		threadData.durationStack.push( ThreadData::Duration( process, &s.computeDuration, &s.duplicateComputeDuration ) );
 	}
 }
 
@@ -156,11 +191,64 @@ void PerformanceMonitor::processFinished( const Process *process )
 
 	ThreadData &threadData = m_threadData.local();
 	boost::chrono::high_resolution_clock::time_point now = boost::chrono::high_resolution_clock::now();
-	*(threadData.durationStack.top()) += now - threadData.then;
+	ThreadData::Duration &duration = threadData.durationStack.top();
+	duration.elapsed += now - threadData.then;
+	*(duration.target) += duration.elapsed;
+	if( duration.duplicate )
+	{
+		*(duration.duplicateTarget) += duration.elapsed;
+	}
 	threadData.durationStack.pop();
 	threadData.then = now;
 }
 
+void PerformanceMonitor::cacheHit( const ValuePlug *plug )
+{
+	m_threadData.local().statistics[plug].cacheHitCount++;
+}
+
+void PerformanceMonitor::cacheMiss( const ValuePlug *plug )
+{
+	m_threadData.local().statistics[plug].cacheMissCount++;
+}
+
+void PerformanceMonitor::cacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes )
+{
+	m_threadData.local().statistics[plug].cacheBytesInserted += bytes;
+
+	CacheEntries::accessor a;
+	m_cacheEntries.insert( a, hash );
+	a->second = plug;
+}
+
+void PerformanceMonitor::cacheEviction( const IECore::MurmurHash &hash )
+{
+	CacheEntries::accessor a;
+	if( !m_cacheEntries.find( a, hash ) )
+	{
+		// Inserted before we were monitoring.
+		return;
+	}
+
+	m_threadData.local().statistics[a->second].cacheEvictionCount++;
+	m_cacheEntries.erase( a );
+}
+
+void PerformanceMonitor::duplicateCompute( const ValuePlug *plug )
+{
+	ThreadData &threadData = m_threadData.local();
+	threadData.statistics[plug].duplicateComputeCount++;
+	// The compute process is still running, so we flag it
+	// for billing to `duplicateComputeDuration` when it
+	// finishes. We may have started monitoring part way
+	// through the process, in which case it won't be on
+	// our stack.
+	if( !threadData.durationStack.empty() && threadData.durationStack.top().process == Process::current() )
+	{
+		threadData.durationStack.top().duplicate = true;
+	}
+}
+
 void PerformanceMonitor::collate() const
 {
 	tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance>::iterator it, eIt;
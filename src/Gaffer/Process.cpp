@@ -140,6 +140,46 @@ void Process::handleException()
 	}
 }
 
+void Process::reportCacheHit( const ValuePlug *plug )
+{
+	for( Monitors::const_iterator it = g_activeMonitors.begin(), eIt = g_activeMonitors.end(); it != eIt; ++it )
+	{
+		(*it)->cacheHit( plug );
+	}
+}
+
+void Process::reportCacheMiss( const ValuePlug *plug )
+{
+	for( Monitors::const_iterator it = g_activeMonitors.begin(), eIt = g_activeMonitors.end(); it != eIt; ++it )
+	{
+		(*it)->cacheMiss( plug );
+	}
+}
+
+void Process::reportCacheInsertion( const ValuePlug *plug, const IECore::MurmurHash &hash, size_t bytes )
+{
+	for( Monitors::const_iterator it = g_activeMonitors.begin(), eIt = g_activeMonitors.end(); it != eIt; ++it )
+	{
+		(*it)->cacheInsertion( plug, hash, bytes );
+	}
+}
+
+void Process::reportCacheEviction( const IECore::MurmurHash &hash )
+{
+	for( Monitors::const_iterator it = g_activeMonitors.begin(), eIt = g_activeMonitors.end(); it != eIt; ++it )
+	{
+		(*it)->cacheEviction( hash );
+	}
+}
+
+void Process::reportDuplicateCompute( const ValuePlug *plug )
+{
+	for( Monitors::const_iterator it = g_activeMonitors.begin(), eIt = g_activeMonitors.end(); it != eIt; ++it )
+	{
+		(*it)->duplicateCompute( plug );
+	}
+}
+
 void Process::emitError( const std::string &error ) const
 {
 	const Plug *plug = m_downstream;
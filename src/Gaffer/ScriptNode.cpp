@@ -56,8 +56,17 @@
 #include "boost/bind/placeholders.hpp"
 #include "boost/filesystem/convenience.hpp"
 #include "boost/filesystem/path.hpp"
+#include "boost/regex.hpp"
 
+#include "tbb/enumerable_thread_specific.h"
+#include "tbb/task_group.h"
+
+#include <atomic>
+#include <chrono>
 #include <fstream>
+#include <memory>
+#include <mutex>
+#include <sstream>
 
 #include <unistd.h>
 
@@ -206,27 +215,184 @@ namespace
 
 std::string readFile( const std::string &fileName )
 {
-	std::ifstream f( fileName.c_str() );
+	std::ifstream f( fileName.c_str(), std::ios::in | std::ios::binary );
 	if( !f.good() )
 	{
 		throw IECore::IOException( "Unable to open file \"" + fileName + "\"" );
 	}
 
-	std::string s;
-	while( !f.eof() )
+	// Read the file in one go rather than line by line, since
+	// references to large files may be loaded many times by a
+	// single script.
+	std::stringstream s;
+	s << f.rdbuf();
+	if( f.bad() )
 	{
-		if( !f.good() )
+		throw IECore::IOException( "Failed to read from \"" + fileName + "\"" );
+	}
+
+	std::string result = s.str();
+	result += "\n";
+	return result;
+}
+
+std::atomic_bool g_parallelLoading( true );
+
+std::mutex g_loadStatisticsMutex;
+ScriptNode::LoadStatisticsMap g_loadStatistics;
+
+// Matches the `load()` calls generated by the serialiser for References.
+const boost::regex g_referenceLoadRegex( R"(^\S+\.load\( "([^"\n]+)" \)$)" );
+
+// Reads files on behalf of a top-level load, and any References loaded
+// within it. Each file is read only once, and when parallel loading is
+// enabled, the files for any References are read on TBB tasks as soon as
+// the file containing them has been read. Execution itself is unaffected,
+// remaining on the calling thread, in serialisation order.
+class Loader : boost::noncopyable
+{
+
+	public :
+
+		~Loader()
 		{
-			throw IECore::IOException( "Failed to read from \"" + fileName + "\"" );
+			m_tasks.wait();
 		}
 
-		std::string line;
-		std::getline( f, line );
-		s += line + "\n";
-	}
+		std::string read( const std::string &fileName )
+		{
+			bool created;
+			File &f = file( fileName, created );
+			readOnce( f );
+			if( f.exception )
+			{
+				std::rethrow_exception( f.exception );
+			}
+			return f.serialisation;
+		}
 
-	return s;
-}
+	private :
+
+		struct File
+		{
+			std::string fileName;
+			std::once_flag once;
+			std::string serialisation;
+			std::exception_ptr exception;
+		};
+
+		File &file( const std::string &fileName, bool &created )
+		{
+			std::lock_guard<std::mutex> lock( m_mutex );
+			std::unique_ptr<File> &f = m_files[fileName];
+			created = !f;
+			if( created )
+			{
+				f.reset( new File );
+				f->fileName = fileName;
+			}
+			return *f;
+		}
+
+		// If another thread is already reading the file, this waits
+		// for it to finish. Errors are stored so that they are only
+		// reported if the file is actually loaded.
+		void readOnce( File &f )
+		{
+			std::call_once(
+				f.once,
+				[this, &f] {
+					try
+					{
+						f.serialisation = readFile( f.fileName );
+					}
+					catch( ... )
+					{
+						f.exception = std::current_exception();
+						return;
+					}
+					prefetchReferences( f.serialisation );
+				}
+			);
+		}
+
+		void prefetchReferences( const std::string &serialisation )
+		{
+			if( !g_parallelLoading )
+			{
+				return;
+			}
+
+			for( boost::sregex_iterator it( serialisation.begin(), serialisation.end(), g_referenceLoadRegex ), eIt; it != eIt; ++it )
+			{
+				bool created;
+				File &f = file( (*it)[1].str(), created );
+				if( created )
+				{
+					m_tasks.run( [this, &f] { readOnce( f ); } );
+				}
+			}
+		}
+
+		tbb::task_group m_tasks;
+		std::mutex m_mutex;
+		std::map<std::string, std::unique_ptr<File>> m_files;
+
+};
+
+tbb::enumerable_thread_specific<Loader *> g_currentLoader( nullptr );
+
+// Scope used for each file loaded by the ScriptNode. Shares the
+// Loader belonging to any enclosing scope, so that References are
+// read as part of the top-level load, and records the LoadStatistics
+// for the file.
+class LoadScope : boost::noncopyable
+{
+
+	public :
+
+		LoadScope( const std::string &fileName )
+			:	m_fileName( fileName ), m_currentLoader( g_currentLoader.local() ), m_readTime( 0 ),
+				m_startTime( std::chrono::steady_clock::now() )
+		{
+			if( !m_currentLoader )
+			{
+				m_loader.reset( new Loader );
+				m_currentLoader = m_loader.get();
+			}
+		}
+
+		~LoadScope()
+		{
+			if( m_loader )
+			{
+				m_currentLoader = nullptr;
+			}
+
+			std::lock_guard<std::mutex> lock( g_loadStatisticsMutex );
+			ScriptNode::LoadStatistics &s = g_loadStatistics[m_fileName];
+			s.loads++;
+			s.readTime += m_readTime;
+			s.totalTime += std::chrono::duration<double>( std::chrono::steady_clock::now() - m_startTime ).count();
+		}
+
+		std::string read()
+		{
+			const std::chrono::steady_clock::time_point t = std::chrono::steady_clock::now();
+			const std::string result = m_currentLoader->read( m_fileName );
+			m_readTime += std::chrono::duration<double>( std::chrono::steady_clock::now() - t ).count();
+			return result;
+		}
+
+	private :
+
+		const std::string m_fileName;
+		Loader *&m_currentLoader;
+		std::unique_ptr<Loader> m_loader;
+		double m_readTime;
+		const std::chrono::steady_clock::time_point m_startTime;
+
+};
 
 } // namespace
 
@@ -698,7 +864,8 @@ bool ScriptNode::execute( const std::string &serialisation, Node *parent, bool c
 
 bool ScriptNode::executeFile( const std::string &fileName, Node *parent, bool continueOnError )
 {
-	const std::string serialisation = readFile( fileName );
+	LoadScope loadScope( fileName );
+	const std::string serialisation = loadScope.read();
 	return executeInternal( serialisation, parent, continueOnError, fileName );
 }
 
@@ -707,7 +874,8 @@ bool ScriptNode::load( bool continueOnError)
 	DirtyPropagationScope dirtyScope;
 
 	const std::string fileName = fileNamePlug()->getValue();
-	const std::string s = readFile( fileName );
+	LoadScope loadScope( fileName );
+	const std::string s = loadScope.read();
 
 	deleteNodes();
 	variablesPlug()->clearChildren();
@@ -744,6 +912,33 @@ bool ScriptNode::importFile( const std::string &fileName, Node *parent, bool con
 	return result;
 }
 
+void ScriptNode::setParallelLoading( bool parallelLoading )
+{
+	g_parallelLoading = parallelLoading;
+}
+
+bool ScriptNode::getParallelLoading()
+{
+	return g_parallelLoading;
+}
+
+ScriptNode::LoadStatistics::LoadStatistics()
+	:	loads( 0 ), readTime( 0 ), totalTime( 0 )
+{
+}
+
+ScriptNode::LoadStatisticsMap ScriptNode::loadStatistics()
+{
+	std::lock_guard<std::mutex> lock( g_loadStatisticsMutex );
+	return g_loadStatistics;
+}
+
+void ScriptNode::resetLoadStatistics()
+{
+	std::lock_guard<std::mutex> lock( g_loadStatisticsMutex );
+	g_loadStatistics.clear();
+}
+
 std::string ScriptNode::serialiseInternal( const Node *parent, const Set *filter ) const
 {
 	if( !g_serialiseFunction )
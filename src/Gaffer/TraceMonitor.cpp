@@ -0,0 +1,189 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2018, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//      * Redistributions of source code must retain the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer.
+//
+//      * Redistributions in binary form must reproduce the above
+//        copyright notice, this list of conditions and the following
+//        disclaimer in the documentation and/or other materials provided with
+//        the distribution.
+//
+//      * Neither the name of John Haddon nor the names of
+//        any other contributors to this software may be used to endorse or
+//        promote products derived from this software without specific prior
+//        written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "Gaffer/TraceMonitor.h"
+
+#include "Gaffer/Context.h"
+#include "Gaffer/Plug.h"
+#include "Gaffer/Process.h"
+#include "Gaffer/TypeIds.h"
+
+#include "IECore/Exception.h"
+
+#include "boost/format.hpp"
+
+#include <fstream>
+
+using namespace std;
+using namespace IECore;
+using namespace Gaffer;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+void writeString( std::ostream &stream, const std::string &s )
+{
+	stream << "\"";
+	for( std::string::const_iterator it = s.begin(), eIt = s.end(); it != eIt; ++it )
+	{
+		if( *it == '"' || *it == '\\' )
+		{
+			stream << '\\';
+		}
+		stream << *it;
+	}
+	stream << "\"";
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// TraceMonitor::ThreadData
+//////////////////////////////////////////////////////////////////////////
+
+TraceMonitor::ThreadData::ThreadData()
+	:	threadIndex( -1 ), depth( 0 )
+{
+}
+
+//////////////////////////////////////////////////////////////////////////
+// TraceMonitor
+//////////////////////////////////////////////////////////////////////////
+
+TraceMonitor::TraceMonitor()
+	:	m_numThreads( 0 ), m_start( Clock::now() )
+{
+}
+
+TraceMonitor::~TraceMonitor()
+{
+}
+
+void TraceMonitor::writeTrace( std::ostream &stream ) const
+{
+	stream << "{\n\"displayTimeUnit\" : \"ms\",\n\"traceEvents\" : [\n";
+
+	bool first = true;
+	for( tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance>::const_iterator it = m_threadData.begin(), eIt = m_threadData.end(); it != eIt; ++it )
+	{
+		if( !first )
+		{
+			stream << ",\n";
+		}
+		first = false;
+
+		stream << boost::format( "{ \"ph\" : \"M\", \"name\" : \"thread_name\", \"pid\" : 0, \"tid\" : %d, \"args\" : { \"name\" : \"Thread %d\" } }" ) % it->threadIndex % it->threadIndex;
+
+		for( std::vector<Event>::const_iterator eventIt = it->events.begin(), eventEIt = it->events.end(); eventIt != eventEIt; ++eventIt )
+		{
+			const double time = boost::chrono::duration<double, boost::micro>( eventIt->time - m_start ).count();
+			stream << boost::format( ",\n{ \"ph\" : \"%s\", \"pid\" : 0, \"tid\" : %d, \"ts\" : %.3f" ) % ( eventIt->plug ? "B" : "E" ) % it->threadIndex % time;
+			if( eventIt->plug )
+			{
+				stream << ", \"name\" : ";
+				writeString( stream, eventIt->plug->relativeName( eventIt->plug->ancestor( (IECore::TypeId)ScriptNodeTypeId ) ) );
+				stream << ", \"cat\" : ";
+				writeString( stream, eventIt->type.string() );
+				stream << ", \"args\" : { \"context\" : \"" << eventIt->contextHash.toString() << "\" }";
+			}
+			stream << " }";
+		}
+	}
+
+	stream << "\n]\n}\n";
+}
+
+void TraceMonitor::writeTrace( const std::string &fileName ) const
+{
+	std::ofstream stream( fileName.c_str() );
+	if( !stream.good() )
+	{
+		throw IECore::IOException( "Unable to open file \"" + fileName + "\"" );
+	}
+	writeTrace( stream );
+}
+
+void TraceMonitor::clear()
+{
+	for( tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance>::iterator it = m_threadData.begin(), eIt = m_threadData.end(); it != eIt; ++it )
+	{
+		it->events.clear();
+	}
+}
+
+void TraceMonitor::processStarted( const Process *process )
+{
+	ThreadData &d = threadData();
+	d.depth++;
+
+	d.events.push_back( Event() );
+	Event &event = d.events.back();
+	event.plug = process->plug();
+	event.type = process->type();
+	event.contextHash = process->context()->hash();
+	event.time = Clock::now();
+}
+
+void TraceMonitor::processFinished( const Process *process )
+{
+	const Clock::time_point now = Clock::now();
+
+	ThreadData &d = threadData();
+	if( !d.depth )
+	{
+		// Process started before we were active.
+		return;
+	}
+	d.depth--;
+
+	d.events.push_back( Event() );
+	d.events.back().time = now;
+}
+
+TraceMonitor::ThreadData &TraceMonitor::threadData()
+{
+	bool exists;
+	ThreadData &d = m_threadData.local( exists );
+	if( !exists )
+	{
+		d.threadIndex = m_numThreads++;
+	}
+	return d;
+}
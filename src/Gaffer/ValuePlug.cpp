@@ -43,11 +43,36 @@
 #include "Gaffer/Private/IECorePreview/LRUCache.h"
 #include "Gaffer/Process.h"
 
+#include "IECore/FileIndexedIO.h"
+
 #include "boost/bind.hpp"
+#include "boost/filesystem.hpp"
 #include "boost/format.hpp"
-#include "boost/unordered_map.hpp"
+#include "boost/multi_index/hashed_index.hpp"
+#include "boost/multi_index/member.hpp"
+#include "boost/multi_index/sequenced_index.hpp"
+#include "boost/multi_index_container.hpp"
+#include "boost/unordered_set.hpp"
 
+#include "tbb/atomic.h"
 #include "tbb/enumerable_thread_specific.h"
+#include "tbb/spin_rw_mutex.h"
+
+#include <algorithm>
+#include <atomic>
+#include <ctime>
+#include <limits>
+#include <vector>
+
+// Headers needed to list the loaded libraries - these differ
+// between OS X and Linux.
+#ifdef __APPLE__
+#include <mach-o/dyld.h>
+#else
+#include <link.h>
+#endif
+
+#include <unistd.h>
 
 using namespace Gaffer;
 
@@ -77,6 +102,467 @@ inline const ValuePlug *sourcePlug( const ValuePlug *p )
 	return p;
 }
 
+// A value unique to this process, used by `ValuePlug::markHashUnstable()`
+// to prevent hashes which are only meaningful within this process from
+// matching those from any other.
+const IECore::MurmurHash &processHash()
+{
+	static IECore::MurmurHash g_processHash = [] {
+		IECore::MurmurHash h;
+		h.append( (uint64_t)getpid() );
+		h.append( boost::filesystem::unique_path().string() );
+		return h;
+	}();
+	return g_processHash;
+}
+
+// Hashes are only meaningful to the code which computed them, and a
+// rebuilt library may compute different values for the same hashes.
+// We can't know which libraries contain the code for the nodes being
+// computed, so the disk cache is keyed on the identity of every library
+// loaded into the process. The `librariesGeneration()` function is
+// cheap, and returns a new value whenever libraries have been loaded,
+// so that we know when to call the more expensive `librariesHash()`.
+
+#ifdef __APPLE__
+
+size_t librariesGeneration()
+{
+	return _dyld_image_count();
+}
+
+void libraryNames( std::vector<std::string> &names )
+{
+	for( uint32_t i = 0, e = _dyld_image_count(); i < e; ++i )
+	{
+		names.push_back( _dyld_get_image_name( i ) );
+	}
+}
+
+#else
+
+int librariesGenerationCallback( dl_phdr_info *info, size_t size, void *data )
+{
+	// The count of library loads is the same for every
+	// library, so we only need to visit the first.
+	*static_cast<size_t *>( data ) = info->dlpi_adds;
+	return 1;
+}
+
+size_t librariesGeneration()
+{
+	size_t result = 0;
+	dl_iterate_phdr( librariesGenerationCallback, &result );
+	return result;
+}
+
+int libraryNamesCallback( dl_phdr_info *info, size_t size, void *data )
+{
+	static_cast<std::vector<std::string> *>( data )->push_back( info->dlpi_name );
+	return 0;
+}
+
+void libraryNames( std::vector<std::string> &names )
+{
+	dl_iterate_phdr( libraryNamesCallback, &names );
+}
+
+#endif
+
+IECore::MurmurHash librariesHash()
+{
+	std::vector<std::string> names;
+	libraryNames( names );
+	// Sort so that the result doesn't depend on
+	// the order in which libraries were loaded.
+	std::sort( names.begin(), names.end() );
+
+	IECore::MurmurHash result;
+	boost::system::error_code ec;
+	for( std::vector<std::string>::const_iterator it = names.begin(), eIt = names.end(); it != eIt; ++it )
+	{
+		if( it->empty() )
+		{
+			// The main program.
+			continue;
+		}
+		result.append( *it );
+		result.append( (uint64_t)boost::filesystem::file_size( *it, ec ) );
+		result.append( (uint64_t)boost::filesystem::last_write_time( *it, ec ) );
+	}
+	return result;
+}
+
+// A second level cache for computed values, stored as files in a directory
+// which may be shared between processes. Files are named by the hash of
+// the value, and are written atomically by renaming from a temporary file,
+// so that concurrent readers in other processes never see partial results.
+//
+// We keep an index of the files in the cache, so that a miss doesn't need
+// to touch the filesystem. The index is built when the cache is first
+// used, and is rebuilt each time we evict files, at which point it also
+// picks up files written by other processes in the meantime.
+//
+// The last write time of each file is used to evict the least recently
+// used files when the cache exceeds its size limit. Rather than update it
+// every time we read a file, we record our reads and update the times in
+// batches.
+class DiskCache
+{
+
+	public :
+
+		DiskCache()
+			:	m_saltGeneration( std::numeric_limits<size_t>::max() ), m_indexValid( false ), m_currentSize( 0 )
+		{
+			m_enabled = false;
+			m_sizeLimit = 1024 * 1024 * 1024 * 10ul; // 10 gig
+			resetStatistics();
+		}
+
+		void setDirectory( const std::string &directory )
+		{
+			Mutex::scoped_lock lock( m_mutex, /* write = */ true );
+			m_directory = directory;
+			m_enabled = !directory.empty();
+			m_indexValid = false;
+			m_index.clear();
+			m_reads.clear();
+		}
+
+		std::string getDirectory() const
+		{
+			Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+			return m_directory;
+		}
+
+		void setSizeLimit( size_t bytes )
+		{
+			m_sizeLimit = bytes;
+		}
+
+		size_t getSizeLimit() const
+		{
+			return m_sizeLimit;
+		}
+
+		bool enabled() const
+		{
+			return m_enabled;
+		}
+
+		IECore::ConstObjectPtr get( const IECore::MurmurHash &hash )
+		{
+			if( !m_enabled )
+			{
+				return nullptr;
+			}
+
+			const std::string name = fileName( hash );
+			boost::filesystem::path path;
+			{
+				Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+				if( !m_indexValid )
+				{
+					lock.upgrade_to_writer();
+					if( !m_indexValid )
+					{
+						scan( nullptr );
+					}
+				}
+				if( !m_index.count( name ) )
+				{
+					m_misses++;
+					return nullptr;
+				}
+				path = filePath( name );
+			}
+
+			IECore::ConstObjectPtr result;
+			try
+			{
+				IECore::IndexedIOPtr io = new IECore::FileIndexedIO( path.string(), IECore::IndexedIO::rootPath, IECore::IndexedIO::Read );
+				result = IECore::Object::load( io, g_entryName );
+			}
+			catch( ... )
+			{
+				// The file may have been evicted by another process.
+				// Either way, we treat it as a miss and compute the
+				// value from scratch.
+			}
+
+			Mutex::scoped_lock lock( m_mutex, /* write = */ true );
+			if( !result )
+			{
+				m_index.erase( name );
+				m_misses++;
+				return nullptr;
+			}
+
+			// Record the access for the benefit of the eviction policy.
+			m_reads.push_back( path );
+			if( m_reads.size() >= g_maxReads )
+			{
+				updateReadTimes();
+			}
+			m_hits++;
+			return result;
+		}
+
+		void set( const IECore::MurmurHash &hash, const IECore::Object *value )
+		{
+			if( !m_enabled )
+			{
+				return;
+			}
+
+			const std::string name = fileName( hash );
+			boost::filesystem::path path;
+			{
+				Mutex::scoped_lock lock( m_mutex, /* write = */ false );
+				if( m_index.count( name ) )
+				{
+					return;
+				}
+				path = filePath( name );
+			}
+
+			boost::system::error_code ec;
+			boost::filesystem::create_directories( path.parent_path(), ec );
+			const boost::filesystem::path tempPath = path.string() + boost::filesystem::unique_path( ".%%%%%%%%.tmp" ).string();
+			size_t size = 0;
+			try
+			{
+				{
+					IECore::IndexedIOPtr io = new IECore::FileIndexedIO( tempPath.string(), IECore::IndexedIO::rootPath, IECore::IndexedIO::Write );
+					value->save( io, g_entryName );
+				}
+				size = boost::filesystem::file_size( tempPath );
+				boost::filesystem::rename( tempPath, path );
+			}
+			catch( ... )
+			{
+				// Not all objects can be serialised, and we may have
+				// lost a race with an evicting process. Neither is
+				// a reason to fail the computation.
+				boost::filesystem::remove( tempPath, ec );
+				return;
+			}
+
+			Mutex::scoped_lock lock( m_mutex, /* write = */ true );
+			m_writes++;
+			if( !m_indexValid )
+			{
+				scan( nullptr );
+			}
+			else if( m_index.insert( name ).second )
+			{
+				// After the initial scan we only track our own writes,
+				// so we may underestimate the size of a cache shared
+				// with other processes, but the next eviction will
+				// correct that.
+				m_currentSize += size;
+			}
+
+			if( m_currentSize > m_sizeLimit )
+			{
+				evict();
+			}
+		}
+
+		size_t hits() const
+		{
+			return m_hits;
+		}
+
+		size_t misses() const
+		{
+			return m_misses;
+		}
+
+		size_t writes() const
+		{
+			return m_writes;
+		}
+
+		size_t evictions() const
+		{
+			return m_evictions;
+		}
+
+		void resetStatistics()
+		{
+			m_hits = 0;
+			m_misses = 0;
+			m_writes = 0;
+			m_evictions = 0;
+		}
+
+		void clear()
+		{
+			Mutex::scoped_lock lock( m_mutex, /* write = */ true );
+			if( m_directory.empty() )
+			{
+				return;
+			}
+
+			boost::system::error_code ec;
+			for( boost::filesystem::directory_iterator it( m_directory, ec ), eIt; it != eIt; it.increment( ec ) )
+			{
+				boost::filesystem::remove_all( it->path(), ec );
+			}
+			m_index.clear();
+			m_reads.clear();
+			m_currentSize = 0;
+			m_indexValid = true;
+		}
+
+	private :
+
+		typedef tbb::spin_rw_mutex Mutex;
+
+		std::string fileName( const IECore::MurmurHash &hash )
+		{
+			IECore::MurmurHash saltedHash = salt();
+			saltedHash.append( hash );
+			return saltedHash.toString() + ".fio";
+		}
+
+		// Must be called with m_mutex held.
+		boost::filesystem::path filePath( const std::string &fileName ) const
+		{
+			// Use a level of subdirectories to keep the number
+			// of files in each directory manageable.
+			boost::filesystem::path result = m_directory;
+			result /= fileName.substr( 0, 2 );
+			result /= fileName;
+			return result;
+		}
+
+		IECore::MurmurHash salt()
+		{
+			const size_t generation = librariesGeneration();
+			{
+				tbb::spin_rw_mutex::scoped_lock lock( m_saltMutex, /* write = */ false );
+				if( generation == m_saltGeneration )
+				{
+					return m_salt;
+				}
+			}
+
+			IECore::MurmurHash salt = librariesHash();
+			salt.append( GAFFER_MILESTONE_VERSION );
+			salt.append( GAFFER_MAJOR_VERSION );
+			salt.append( GAFFER_MINOR_VERSION );
+			salt.append( GAFFER_PATCH_VERSION );
+
+			tbb::spin_rw_mutex::scoped_lock lock( m_saltMutex, /* write = */ true );
+			m_salt = salt;
+			m_saltGeneration = generation;
+			return salt;
+		}
+
+		typedef std::pair<time_t, std::pair<boost::filesystem::path, size_t> > File;
+
+		// Rebuilds the index and the current size from the contents
+		// of the directory, optionally returning the files found.
+		// Must be called with m_mutex held for writing.
+		void scan( std::vector<File> *files )
+		{
+			m_index.clear();
+			m_currentSize = 0;
+			m_indexValid = true;
+
+			boost::system::error_code ec;
+			for( boost::filesystem::recursive_directory_iterator it( m_directory, ec ), eIt; it != eIt; it.increment( ec ) )
+			{
+				if( ec || !boost::filesystem::is_regular_file( it->path(), ec ) || it->path().extension() != ".fio" )
+				{
+					continue;
+				}
+				const size_t size = boost::filesystem::file_size( it->path(), ec );
+				if( ec )
+				{
+					continue;
+				}
+				m_index.insert( it->path().filename().string() );
+				m_currentSize += size;
+				if( files )
+				{
+					files->push_back( File( boost::filesystem::last_write_time( it->path(), ec ), std::make_pair( it->path(), size ) ) );
+				}
+			}
+		}
+
+		// Must be called with m_mutex held for writing.
+		void updateReadTimes()
+		{
+			const time_t now = time( nullptr );
+			boost::system::error_code ec;
+			for( std::vector<boost::filesystem::path>::const_iterator it = m_reads.begin(), eIt = m_reads.end(); it != eIt; ++it )
+			{
+				boost::filesystem::last_write_time( *it, now, ec );
+			}
+			m_reads.clear();
+		}
+
+		// Must be called with m_mutex held for writing.
+		void evict()
+		{
+			updateReadTimes();
+
+			std::vector<File> files;
+			scan( &files );
+			std::sort( files.begin(), files.end() );
+
+			// Evict down to a little below the limit, so that we're
+			// not rescanning the directory for every subsequent write.
+			const size_t targetSize = m_sizeLimit - m_sizeLimit / 10;
+			boost::system::error_code ec;
+			for( std::vector<File>::const_iterator it = files.begin(), eIt = files.end(); it != eIt && m_currentSize > targetSize; ++it )
+			{
+				if( boost::filesystem::remove( it->second.first, ec ) )
+				{
+					m_index.erase( it->second.first.filename().string() );
+					m_currentSize -= std::min( m_currentSize, it->second.second );
+					m_evictions++;
+				}
+			}
+		}
+
+		static const IECore::IndexedIO::EntryID g_entryName;
+		static const size_t g_maxReads = 1000;
+
+		tbb::spin_rw_mutex m_saltMutex;
+		IECore::MurmurHash m_salt;
+		size_t m_saltGeneration;
+
+		tbb::atomic<bool> m_enabled;
+		tbb::atomic<size_t> m_sizeLimit;
+
+		// Protects all the members below.
+		mutable Mutex m_mutex;
+		std::string m_directory;
+		bool m_indexValid;
+		boost::unordered_set<std::string> m_index;
+		size_t m_currentSize;
+		std::vector<boost::filesystem::path> m_reads;
+
+		tbb::atomic<size_t> m_hits;
+		tbb::atomic<size_t> m_misses;
+		tbb::atomic<size_t> m_writes;
+		tbb::atomic<size_t> m_evictions;
+
+};
+
+const IECore::IndexedIO::EntryID DiskCache::g_entryName( "value" );
+
+DiskCache &diskCache()
+{
+	static DiskCache g_diskCache;
+	return g_diskCache;
+}
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -119,61 +605,102 @@ class ValuePlug::HashProcess : public Process
 			// from our cache, and if we can't we'll compute it using a HashProcess instance.
 
 			ThreadData &threadData = g_threadData.local();
-			if( !Process::current() )
-			{
-				// Starting a new root computation.
-				if( ++(threadData.cacheClearCount) == 3200 )
-				{
-					// Prevent unbounded growth in the hash cache
-					// if many computations are being performed
-					// without any plugs being dirtied in between,
-					// by clearing it after every Nth computation.
-					// N == 3200 was observed to be 6x faster than
-					// N == 100 for a procedural instancing scene at
-					// a memory cost of about 100 mb.
-					threadData.clearCache = 1;
-				}
-			}
-
-			if( threadData.clearCache )
+			const uint64_t clearCount = g_clearCount;
+			if( threadData.clearCount != clearCount )
 			{
+				// `clearCache()` has been called since this thread
+				// last used its cache.
 				threadData.cache.clear();
-				threadData.cacheClearCount = 0;
-				threadData.clearCache = 0;
+				threadData.clearCount = clearCount;
 			}
 
 			const Context *currentContext = Context::current();
 			const CacheKey key( p, currentContext->hash() );
-			Cache::iterator it = threadData.cache.find( key );
-			if( it != threadData.cache.end() )
+			Cache::nth_index<1>::type &index = threadData.cache.get<1>();
+			Cache::nth_index<1>::type::iterator it = index.find( key );
+			if( it != index.end() )
 			{
-				return it->second;
+				if( it->generation == p->m_hashCacheGeneration )
+				{
+					// Hit. Move to the front of the list, so that the
+					// least recently used entries are at the back.
+					threadData.cache.relocate( threadData.cache.begin(), threadData.cache.project<0>( it ) );
+					threadData.hits++;
+					return it->hash;
+				}
+				// The plug has been dirtied since we computed
+				// this entry, so it is of no further use.
+				index.erase( it );
 			}
 
+			threadData.misses++;
 			HashProcess process( p, plug, currentContext );
-			threadData.cache[key] = process.m_result;
+
+			threadData.cache.push_front( CacheEntry( key, p->m_hashCacheGeneration, process.m_result ) );
+			const size_t sizeLimit = g_cacheSizeLimit;
+			while( threadData.cache.size() > sizeLimit )
+			{
+				threadData.cache.pop_back();
+			}
+
 			return process.m_result;
 		}
 
-		static void clearCache()
+		static size_t getCacheSizeLimit()
+		{
+			return g_cacheSizeLimit;
+		}
+
+		static void setCacheSizeLimit( size_t entries )
+		{
+			// Threads will trim their caches to the new
+			// limit the next time they add an entry.
+			g_cacheSizeLimit = entries;
+		}
+
+		static size_t cacheHits()
 		{
-			// The docs for enumerable_thread_specific aren't particularly clear
-			// on whether or not it's ok to iterate an e_t_s while concurrently using
-			// local(), which is what we do here. So far in practice it seems to be
-			// OK.
-			tbb::enumerable_thread_specific<ThreadData>::iterator it, eIt;
-			for( it = g_threadData.begin(), eIt = g_threadData.end(); it != eIt; ++it )
+			size_t result = 0;
+			for( ThreadDataContainer::const_iterator it = g_threadData.begin(), eIt = g_threadData.end(); it != eIt; ++it )
 			{
-				// We can't clear the cache now, because it is most likely
-				// in use by the owning thread. Instead we set this flag to
-				// politely request that the thread clears the cache itself
-				// at its earliest convenience - in the HashProcess constructor.
-				// This delay in clearing is OK, because it is illegal to modify
-				// a graph while a computation is being performed with it, and
-				// we know that the plug requesting the clear will be removed
-				// from the cache before the next computation starts.
-				it->clearCache = 1;
+				result += it->hits;
 			}
+			return result;
+		}
+
+		static size_t cacheMisses()
+		{
+			size_t result = 0;
+			for( ThreadDataContainer::const_iterator it = g_threadData.begin(), eIt = g_threadData.end(); it != eIt; ++it )
+			{
+				result += it->misses;
+			}
+			return result;
+		}
+
+		static void resetCacheStatistics()
+		{
+			for( ThreadDataContainer::iterator it = g_threadData.begin(), eIt = g_threadData.end(); it != eIt; ++it )
+			{
+				it->hits = 0;
+				it->misses = 0;
+			}
+		}
+
+		// Invalidates the caches for all threads. We can't safely
+		// modify the caches of other threads, so each thread clears
+		// its own cache the next time it is used.
+		static void clearCache()
+		{
+			g_clearCount++;
+		}
+
+		// Returns a new generation for a plug which has just been
+		// created or dirtied, invalidating any existing cache entries
+		// for it.
+		static uint64_t newGeneration()
+		{
+			return ++g_generation;
 		}
 
 		static const IECore::InternedString staticType;
@@ -215,31 +742,62 @@ class ValuePlug::HashProcess : public Process
 		//
 		// We address this problem by keeping a per-thread cache of hashes, indexed
 		// by the plug the hash is for and the context the hash was performed in. The
-		// typedefs below describe that data structure. We use Plug::dirty() to empty
-		// the caches, because they are invalidated whenever an upstream value or
-		// connection is changed. We also clear the cache unconditionally every N
-		// computations, to prevent unbounded growth.
+		// typedefs below describe that data structure. Each entry is tagged with the
+		// generation of the plug at the time the hash was computed, and
+		// ValuePlug::dirty() gives the plug a new generation, so that entries are
+		// invalidated whenever an upstream value or connection is changed. Because
+		// dirtiness is propagated to all affected plugs, this invalidates only the
+		// entries downstream of the change. The cache is bounded in size, with the
+		// least recently used entries being evicted one at a time as new entries
+		// are added.
 		typedef std::pair<const ValuePlug *, IECore::MurmurHash> CacheKey;
-		typedef boost::unordered_map<CacheKey, IECore::MurmurHash> Cache;
+
+		struct CacheEntry
+		{
+			CacheEntry( const CacheKey &key, uint64_t generation, const IECore::MurmurHash &hash )
+				:	key( key ), generation( generation ), hash( hash )
+			{
+			}
+			CacheKey key;
+			uint64_t generation;
+			IECore::MurmurHash hash;
+		};
+
+		typedef boost::multi_index::multi_index_container<
+			CacheEntry,
+			boost::multi_index::indexed_by<
+				boost::multi_index::sequenced<>,
+				boost::multi_index::hashed_unique<
+					boost::multi_index::member<CacheEntry, CacheKey, &CacheEntry::key>
+				>
+			>
+		> Cache;
 
 		// To support multithreading, each thread has it's own state.
 		struct ThreadData
 		{
-			ThreadData() : cacheClearCount( 0 ) {}
-			int cacheClearCount;
+			ThreadData() : clearCount( g_clearCount ), hits( 0 ), misses( 0 ) {}
 			Cache cache;
-			// Flag to request that hashCache be cleared.
-			tbb::atomic<int> clearCache;
+			uint64_t clearCount;
+			size_t hits;
+			size_t misses;
 		};
 
-		static tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance > g_threadData;
+		typedef tbb::enumerable_thread_specific<ThreadData, tbb::cache_aligned_allocator<ThreadData>, tbb::ets_key_per_instance > ThreadDataContainer;
+		static ThreadDataContainer g_threadData;
+		static std::atomic<size_t> g_cacheSizeLimit;
+		static std::atomic<uint64_t> g_generation;
+		static std::atomic<uint64_t> g_clearCount;
 
 		IECore::MurmurHash m_result;
 
 };
 
 const IECore::InternedString ValuePlug::HashProcess::staticType( "computeNode:hash" );
-tbb::enumerable_thread_specific<ValuePlug::HashProcess::ThreadData, tbb::cache_aligned_allocator<ValuePlug::HashProcess::ThreadData>, tbb::ets_key_per_instance > ValuePlug::HashProcess::g_threadData;
+ValuePlug::HashProcess::ThreadDataContainer ValuePlug::HashProcess::g_threadData;
+std::atomic<size_t> ValuePlug::HashProcess::g_cacheSizeLimit( 100000 );
+std::atomic<uint64_t> ValuePlug::HashProcess::g_generation( 0 );
+std::atomic<uint64_t> ValuePlug::HashProcess::g_clearCount( 0 );
 
 //////////////////////////////////////////////////////////////////////////
 // The ComputeProcess manages the task of calling ComputeNode::compute()
@@ -295,10 +853,33 @@ class ValuePlug::ComputeProcess : public Process
 				// result if we have.
 				IECore::MurmurHash hash = precomputedHash ? *precomputedHash : p->hash();
 				IECore::ConstObjectPtr result = g_cache.get( hash );
-				if( result || cachedOnly )
+				if( result )
 				{
+					reportCacheHit( p );
 					return result;
 				}
+				else if( cachedOnly )
+				{
+					return result;
+				}
+
+				reportCacheMiss( p );
+
+				// Then see if the work has been done already by another
+				// process sharing our disk cache.
+				DiskCache &secondLevelCache = diskCache();
+				const bool diskCacheable = p->getFlags( Plug::DiskCacheable ) && secondLevelCache.enabled();
+				if( diskCacheable )
+				{
+					result = secondLevelCache.get( hash );
+					if( result )
+					{
+						const size_t memoryUsage = result->memoryUsage();
+						g_cache.set( hash, result, memoryUsage );
+						reportCacheInsertion( p, hash, memoryUsage );
+						return result;
+					}
+				}
 
 				// Otherwise, use a ComputeProcess instance to do the work.
 				ComputeProcess process( p, plug );
@@ -315,7 +896,17 @@ class ValuePlug::ComputeProcess : public Process
 				/// overhead, and at some point we'll need to address that.
 				if( !g_cache.get( hash ) )
 				{
-					g_cache.set( hash, process.m_result, process.m_result->memoryUsage() );
+					const size_t memoryUsage = process.m_result->memoryUsage();
+					g_cache.set( hash, process.m_result, memoryUsage );
+					reportCacheInsertion( p, hash, memoryUsage );
+					if( diskCacheable )
+					{
+						secondLevelCache.set( hash, process.m_result.get() );
+					}
+				}
+				else
+				{
+					reportDuplicateCompute( p );
 				}
 				return process.m_result;
 			}
@@ -397,6 +988,11 @@ class ValuePlug::ComputeProcess : public Process
 			return nullptr;
 		}
 
+		static void cacheRemovalCallback( const IECore::MurmurHash &h, const IECore::ConstObjectPtr &value )
+		{
+			reportCacheEviction( h );
+		}
+
 		// A cache mapping from ValuePlug::hash() to the result of the previous computation
 		// for that hash. This allows us to cache results for faster repeat evaluation
 		typedef IECorePreview::LRUCache<IECore::MurmurHash, IECore::ConstObjectPtr> Cache;
@@ -407,7 +1003,7 @@ class ValuePlug::ComputeProcess : public Process
 };
 
 const IECore::InternedString ValuePlug::ComputeProcess::staticType( "computeNode:compute" );
-ValuePlug::ComputeProcess::Cache ValuePlug::ComputeProcess::g_cache( nullGetter, 1024 * 1024 * 1024 * 1 ); // 1 gig
+ValuePlug::ComputeProcess::Cache ValuePlug::ComputeProcess::g_cache( nullGetter, cacheRemovalCallback, 1024 * 1024 * 1024 * 1 ); // 1 gig
 
 //////////////////////////////////////////////////////////////////////////
 // SetValueAction implementation
@@ -482,14 +1078,19 @@ IE_CORE_DEFINERUNTIMETYPED( ValuePlug );
 /// even creating the values before figuring out if we've already got them somewhere).
 ValuePlug::ValuePlug( const std::string &name, Direction direction,
 	IECore::ConstObjectPtr defaultValue, unsigned flags )
-	:	Plug( name, direction, flags ), m_defaultValue( defaultValue ), m_staticValue( defaultValue )
+	:	Plug( name, direction, flags ), m_defaultValue( defaultValue ), m_staticValue( defaultValue ),
+		// Giving each new plug a unique generation means that a plug which
+		// just happens to reuse the address of a deleted plug won't end up
+		// inadvertently also reusing its hash cache entries.
+		m_hashCacheGeneration( HashProcess::newGeneration() )
 {
 	assert( m_defaultValue );
 	assert( m_staticValue );
 }
 
 ValuePlug::ValuePlug( const std::string &name, Direction direction, unsigned flags )
-	:	Plug( name, direction, flags ), m_defaultValue( nullptr ), m_staticValue( nullptr )
+	:	Plug( name, direction, flags ), m_defaultValue( nullptr ), m_staticValue( nullptr ),
+		m_hashCacheGeneration( HashProcess::newGeneration() )
 {
 	// We expect to have children added/removed, so arrange to deal with that
 	// appropriately. The other constructor above is for leaf plugs (this is
@@ -500,10 +1101,6 @@ ValuePlug::ValuePlug( const std::string &name, Direction direction, unsigned fla
 
 ValuePlug::~ValuePlug()
 {
-	// Clear hash cache, so that a newly created plug that just
-	// happens to reuse our address won't end up inadvertently also
-	// reusing our cache entries.
-	HashProcess::clearCache();
 }
 
 bool ValuePlug::acceptsChild( const GraphComponent *potentialChild ) const
@@ -755,10 +1352,8 @@ void ValuePlug::emitPlugSet()
 
 void ValuePlug::dirty()
 {
-	/// \todo We might want to investigate methods of doing a
-	/// more fine grained clearing of only the dirtied plugs,
-	/// rather than clearing the whole cache.
-	HashProcess::clearCache();
+	// Invalidates all hash cache entries for this plug.
+	m_hashCacheGeneration = HashProcess::newGeneration();
 }
 
 size_t ValuePlug::getCacheMemoryLimit()
@@ -780,3 +1375,100 @@ void ValuePlug::clearCache()
 {
 	ComputeProcess::clearCache();
 }
+
+size_t ValuePlug::getHashCacheSizeLimit()
+{
+	return HashProcess::getCacheSizeLimit();
+}
+
+void ValuePlug::setHashCacheSizeLimit( size_t entries )
+{
+	HashProcess::setCacheSizeLimit( entries );
+}
+
+void ValuePlug::clearHashCache()
+{
+	HashProcess::clearCache();
+}
+
+size_t ValuePlug::hashCacheHits()
+{
+	return HashProcess::cacheHits();
+}
+
+size_t ValuePlug::hashCacheMisses()
+{
+	return HashProcess::cacheMisses();
+}
+
+void ValuePlug::resetHashCacheStatistics()
+{
+	HashProcess::resetCacheStatistics();
+}
+
+void ValuePlug::markHashUnstable( IECore::MurmurHash &h )
+{
+	h.append( processHash() );
+}
+
+void ValuePlug::hashFileModificationTime( const std::string &fileName, IECore::MurmurHash &h )
+{
+	if( !diskCache().enabled() )
+	{
+		return;
+	}
+
+	boost::system::error_code ec;
+	h.append( (uint64_t)boost::filesystem::last_write_time( fileName, ec ) );
+	h.append( (uint64_t)boost::filesystem::file_size( fileName, ec ) );
+}
+
+void ValuePlug::setDiskCacheDirectory( const std::string &directory )
+{
+	diskCache().setDirectory( directory );
+}
+
+std::string ValuePlug::getDiskCacheDirectory()
+{
+	return diskCache().getDirectory();
+}
+
+size_t ValuePlug::getDiskCacheSizeLimit()
+{
+	return diskCache().getSizeLimit();
+}
+
+void ValuePlug::setDiskCacheSizeLimit( size_t bytes )
+{
+	diskCache().setSizeLimit( bytes );
+}
+
+void ValuePlug::clearDiskCache()
+{
+	diskCache().clear();
+}
+
+size_t ValuePlug::diskCacheHits()
+{
+	return diskCache().hits();
+}
+
+size_t ValuePlug::diskCacheMisses()
+{
+	return diskCache().misses();
+}
+
+size_t ValuePlug::diskCacheWrites()
+{
+	return diskCache().writes();
+}
+
+size_t ValuePlug::diskCacheEvictions()
+{
+	return diskCache().evictions();
+}
+
+void ValuePlug::resetDiskCacheStatistics()
+{
+	diskCache().resetStatistics();
+}
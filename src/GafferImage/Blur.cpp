@@ -41,13 +41,56 @@
 
 #include "Gaffer/StringPlug.h"
 
+#include <cmath>
+
 using namespace Imath;
 using namespace Gaffer;
 using namespace GafferImage;
 
-IE_CORE_DEFINERUNTIMETYPED( Blur );
+//////////////////////////////////////////////////////////////////////////
+// Utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
 
 const char *g_blurFilterName = "smoothGaussian";
+const size_t g_numBoxes = 3;
+
+// Returns the widths of `g_numBoxes` box filters which, when applied in
+// sequence, approximate a gaussian with the specified standard deviation.
+// See "Fast Almost-Gaussian Filtering", Peter Kovesi, 2010.
+int boxWidth( float sigma, size_t index )
+{
+	const float n = g_numBoxes;
+	const float idealWidth = sqrtf( 12.0f * sigma * sigma / n + 1.0f );
+
+	int lowerWidth = floorf( idealWidth );
+	if( lowerWidth % 2 == 0 )
+	{
+		lowerWidth--;
+	}
+
+	const float idealNumLower = ( 12.0f * sigma * sigma - n * lowerWidth * lowerWidth - 4.0f * n * lowerWidth - 3.0f * n ) / ( -4.0f * lowerWidth - 4.0f );
+	const int numLower = roundf( idealNumLower );
+
+	return (int)index < numLower ? lowerWidth : lowerWidth + 2;
+}
+
+// The standard deviation of the smoothGaussian filter, when scaled to
+// match a particular blur radius.
+float sigma( float radius )
+{
+	return ( 1.0f + radius ) / sqrtf( 10.0f );
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// Blur
+//////////////////////////////////////////////////////////////////////////
+
+IE_CORE_DEFINERUNTIMETYPED( Blur );
 
 size_t Blur::g_firstPlugIndex = 0;
 
@@ -78,6 +121,34 @@ Blur::Blur( const std::string &name )
 	resampledDataWindowPlug()->setInput( resample->outPlug()->dataWindowPlug() );
 	resampledChannelDataPlug()->setInput( resample->outPlug()->channelDataPlug() );
 
+	addChild( new IntPlug( "mode", Plug::In, Exact, Exact, Approximate ) );
+
+	ValuePlugPtr boxFilterScales = new ValuePlug( "__boxFilterScales", Plug::Out );
+	addChild( boxFilterScales );
+	addChild( new AtomicBox2iPlug( "__approximateDataWindow", Plug::In, Box2i(), Plug::Default & ~Plug::Serialisable ) );
+	addChild( new FloatVectorDataPlug( "__approximateChannelData", Plug::In, ImagePlug::blackTile(), Plug::Default & ~Plug::Serialisable ) );
+
+	ImagePlug *boxInput = inPlug();
+	for( size_t i = 0; i < g_numBoxes; ++i )
+	{
+		V2fPlugPtr boxFilterScale = new V2fPlug( "box" + std::to_string( i ), Plug::Out );
+		boxFilterScales->addChild( boxFilterScale );
+
+		ResamplePtr boxResample = new Resample( "__boxResample" + std::to_string( i ) );
+		addChild( boxResample );
+
+		boxResample->inPlug()->setInput( boxInput );
+		boxResample->filterPlug()->setValue( "box" );
+		boxResample->boundingModePlug()->setInput( boundingModePlug() );
+		boxResample->filterScalePlug()->setInput( boxFilterScale );
+		boxResample->expandDataWindowPlug()->setValue( true );
+
+		boxInput = boxResample->outPlug();
+	}
+
+	approximateDataWindowPlug()->setInput( boxInput->dataWindowPlug() );
+	approximateChannelDataPlug()->setInput( boxInput->channelDataPlug() );
+
 	outPlug()->formatPlug()->setInput( inPlug()->formatPlug() );
 	outPlug()->metadataPlug()->setInput( inPlug()->metadataPlug() );
 	outPlug()->channelNamesPlug()->setInput( inPlug()->channelNamesPlug() );
@@ -157,13 +228,64 @@ const Resample *Blur::resample() const
 	return getChild<Resample>( g_firstPlugIndex + 6 );
 }
 
+Gaffer::IntPlug *Blur::modePlug()
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 7 );
+}
+
+const Gaffer::IntPlug *Blur::modePlug() const
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 7 );
+}
+
+Gaffer::ValuePlug *Blur::boxFilterScalesPlug()
+{
+	return getChild<ValuePlug>( g_firstPlugIndex + 8 );
+}
+
+const Gaffer::ValuePlug *Blur::boxFilterScalesPlug() const
+{
+	return getChild<ValuePlug>( g_firstPlugIndex + 8 );
+}
+
+Gaffer::AtomicBox2iPlug *Blur::approximateDataWindowPlug()
+{
+	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 9 );
+}
+
+const Gaffer::AtomicBox2iPlug *Blur::approximateDataWindowPlug() const
+{
+	return getChild<AtomicBox2iPlug>( g_firstPlugIndex + 9 );
+}
+
+Gaffer::FloatVectorDataPlug *Blur::approximateChannelDataPlug()
+{
+	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 10 );
+}
+
+const Gaffer::FloatVectorDataPlug *Blur::approximateChannelDataPlug() const
+{
+	return getChild<FloatVectorDataPlug>( g_firstPlugIndex + 10 );
+}
+
+Resample *Blur::boxResample( size_t index )
+{
+	return getChild<Resample>( g_firstPlugIndex + 11 + index );
+}
+
+const Resample *Blur::boxResample( size_t index ) const
+{
+	return getChild<Resample>( g_firstPlugIndex + 11 + index );
+}
+
 void Blur::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	ImageProcessor::affects( input, outputs );
 
 	if(
 		input == expandDataWindowPlug() ||
-		input == resampledDataWindowPlug()
+		input == resampledDataWindowPlug() ||
+		input == approximateDataWindowPlug()
 	)
 	{
 		outputs.push_back( outPlug()->dataWindowPlug() );
@@ -171,22 +293,36 @@ void Blur::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs )
 	else if( input->parent<V2fPlug>() == radiusPlug() )
 	{
 		outputs.push_back( filterScalePlug()->getChild<ValuePlug>( input->getName() ) );
+		for( ValuePlugIterator it( boxFilterScalesPlug() ); !it.done(); ++it )
+		{
+			outputs.push_back( (*it)->getChild<ValuePlug>( input->getName() ) );
+		}
 		outputs.push_back( outPlug()->dataWindowPlug() );
 		outputs.push_back( outPlug()->channelDataPlug() );
 	}
 	else if(
-		input == resampledChannelDataPlug()
+		input == resampledChannelDataPlug() ||
+		input == approximateChannelDataPlug()
 	)
 	{
 		outputs.push_back( outPlug()->channelDataPlug() );
 	}
+	else if( input == modePlug() )
+	{
+		outputs.push_back( outPlug()->dataWindowPlug() );
+		outputs.push_back( outPlug()->channelDataPlug() );
+	}
 }
 
 void Blur::hash( const ValuePlug *output, const Context *context, IECore::MurmurHash &h ) const
 {
 	ImageProcessor::hash( output, context, h );
 
-	if( output->parent<ValuePlug>() == filterScalePlug() )
+	const ValuePlug *parent = output->parent<ValuePlug>();
+	if(
+		parent == filterScalePlug() ||
+		( parent && parent->parent<ValuePlug>() == boxFilterScalesPlug() )
+	)
 	{
 		radiusPlug()->getChild<ValuePlug>( output->getName() )->hash( h );
 	}
@@ -214,6 +350,22 @@ void Blur::compute( ValuePlug *output, const Context *context ) const
 		return;
 	}
 
+	const ValuePlug *boxFilterScale = output->parent<ValuePlug>();
+	if( boxFilterScale && boxFilterScale->parent<ValuePlug>() == boxFilterScalesPlug() )
+	{
+		size_t index = 0;
+		while( boxFilterScalesPlug()->getChild<ValuePlug>( index ) != boxFilterScale )
+		{
+			index++;
+		}
+
+		// The box filter has a width of 1, so the scale is just the
+		// width in pixels.
+		const float radius = radiusPlug()->getChild<FloatPlug>( output->getName() )->getValue();
+		static_cast<FloatPlug *>( output )->setValue( boxWidth( sigma( radius ), index ) );
+		return;
+	}
+
 	ImageProcessor::compute( output, context );
 }
 
@@ -221,7 +373,14 @@ void Blur::hashDataWindow( const GafferImage::ImagePlug *parent, const Gaffer::C
 {
 	if( radiusPlug()->getValue() != V2f( 0 ) && expandDataWindowPlug()->getValue() )
 	{
-		h = resampledDataWindowPlug()->hash();
+		if( modePlug()->getValue() == Approximate )
+		{
+			h = approximateDataWindowPlug()->hash();
+		}
+		else
+		{
+			h = resampledDataWindowPlug()->hash();
+		}
 	}
 	else
 	{
@@ -233,6 +392,10 @@ Imath::Box2i Blur::computeDataWindow( const Gaffer::Context *context, const Imag
 {
 	if( radiusPlug()->getValue() != V2f( 0 ) && expandDataWindowPlug()->getValue() )
 	{
+		if( modePlug()->getValue() == Approximate )
+		{
+			return approximateDataWindowPlug()->getValue();
+		}
 		return resampledDataWindowPlug()->getValue();
 	}
 	else
@@ -245,7 +408,14 @@ void Blur::hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::
 {
 	if( radiusPlug()->getValue() != V2f( 0 ) )
 	{
-		h = resampledChannelDataPlug()->hash();
+		if( modePlug()->getValue() == Approximate )
+		{
+			h = approximateChannelDataPlug()->hash();
+		}
+		else
+		{
+			h = resampledChannelDataPlug()->hash();
+		}
 	}
 	else
 	{
@@ -257,6 +427,10 @@ IECore::ConstFloatVectorDataPtr Blur::computeChannelData( const std::string &cha
 {
 	if( radiusPlug()->getValue() != V2f( 0 ) )
 	{
+		if( modePlug()->getValue() == Approximate )
+		{
+			return approximateChannelDataPlug()->getValue();
+		}
 		return resampledChannelDataPlug()->getValue();
 	}
 	else
@@ -37,21 +37,41 @@
 
 #include "GafferImage/ChannelDataProcessor.h"
 
+#include "GafferImage/ImageAlgo.h"
+
+#include "Gaffer/Context.h"
+
 #include "IECore/StringAlgo.h"
 
+using namespace std;
+using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
+namespace
+{
+
+const IECore::InternedString g_layerNameKey( "image:channelDataProcessor:__layerName" );
+
+} // namespace
+
 IE_CORE_DEFINERUNTIMETYPED( ChannelDataProcessor );
 
 size_t ChannelDataProcessor::g_firstPlugIndex = 0;
 
-ChannelDataProcessor::ChannelDataProcessor( const std::string &name )
-	:	ImageProcessor( name )
+ChannelDataProcessor::ChannelDataProcessor( const std::string &name, bool processLayers )
+	:	ImageProcessor( name ), m_processLayers( processLayers )
 {
 	storeIndexOfNextChild( g_firstPlugIndex );
 
 	addChild( new StringPlug( "channels", Gaffer::Plug::In, "[RGB]" ) );
+	addChild(
+		new ObjectPlug(
+			"__layerData",
+			Gaffer::Plug::Out,
+			new ObjectVector
+		)
+	);
 
 	// We don't ever want to change these, so we make pass-through connections.
 	outPlug()->formatPlug()->setInput( inPlug()->formatPlug() );
@@ -74,6 +94,16 @@ const Gaffer::StringPlug *ChannelDataProcessor::channelsPlug() const
 	return getChild<StringPlug>( g_firstPlugIndex );
 }
 
+Gaffer::ObjectPlug *ChannelDataProcessor::layerDataPlug()
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 1 );
+}
+
+const Gaffer::ObjectPlug *ChannelDataProcessor::layerDataPlug() const
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 1 );
+}
+
 void ChannelDataProcessor::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	ImageProcessor::affects( input, outputs );
@@ -85,6 +115,18 @@ void ChannelDataProcessor::affects( const Gaffer::Plug *input, AffectedPlugsCont
 	{
 		outputs.push_back( outPlug()->channelDataPlug() );
 	}
+	else if( input == outPlug()->channelDataPlug() && m_processLayers )
+	{
+		// Derived classes declare the inputs which affect the output
+		// channel data, and those same inputs affect the layer data
+		// it is computed from.
+		outputs.push_back( layerDataPlug() );
+	}
+
+	if( input == inPlug()->channelNamesPlug() && m_processLayers )
+	{
+		outputs.push_back( layerDataPlug() );
+	}
 }
 
 bool ChannelDataProcessor::channelEnabled( const std::string &channel ) const
@@ -97,9 +139,110 @@ bool ChannelDataProcessor::channelEnabled( const std::string &channel ) const
 	return IECore::StringAlgo::matchMultiple( channel, channelsPlug()->getValue() );
 }
 
+void ChannelDataProcessor::hash( const Gaffer::ValuePlug *output, const Gaffer::Context *context, IECore::MurmurHash &h ) const
+{
+	ImageProcessor::hash( output, context, h );
+
+	if( output == layerDataPlug() )
+	{
+		// The layer data is equivalent to the channel data for
+		// each of the channels in the layer.
+		ImagePlug::ChannelDataScope channelDataScope( context );
+		for( const auto &channel : layerChannels( context ) )
+		{
+			channelDataScope.setChannelName( channel );
+			h.append( channel );
+			hashChannelData( outPlug(), Context::current(), h );
+		}
+	}
+}
+
+void ChannelDataProcessor::compute( Gaffer::ValuePlug *output, const Gaffer::Context *context ) const
+{
+	if( output == layerDataPlug() )
+	{
+		const vector<string> channels = layerChannels( context );
+
+		vector<FloatVectorDataPtr> outData;
+		{
+			ImagePlug::ChannelDataScope channelDataScope( context );
+			for( const auto &channel : channels )
+			{
+				channelDataScope.setChannelName( channel );
+				outData.push_back( inPlug()->channelDataPlug()->getValue()->copy() );
+			}
+		}
+
+		processLayerData( context, outPlug(), channels, outData );
+
+		// Store the results by color index, so that
+		// computeChannelData() can find them easily.
+		ObjectVectorPtr result = new ObjectVector();
+		result->members().resize( 4 );
+		for( size_t i = 0; i < channels.size(); ++i )
+		{
+			result->members()[ImageAlgo::colorIndex( channels[i] )] = outData[i];
+		}
+
+		static_cast<ObjectPlug *>( output )->setValue( result );
+		return;
+	}
+
+	ImageProcessor::compute( output, context );
+}
+
 IECore::ConstFloatVectorDataPtr ChannelDataProcessor::computeChannelData( const std::string &channelName, const Imath::V2i &tileOrigin, const Gaffer::Context *context, const ImagePlug *parent ) const
 {
+	const int colorIndex = m_processLayers ? ImageAlgo::colorIndex( channelName ) : -1;
+	if( colorIndex >= 0 )
+	{
+		ConstObjectVectorPtr layerData;
+		{
+			Context::EditableScope layerScope( context );
+			layerScope.set( g_layerNameKey, ImageAlgo::layerName( channelName ) );
+			layerData = boost::static_pointer_cast<const ObjectVector>( layerDataPlug()->getValue() );
+		}
+		if( const Object *channelData = layerData->members()[colorIndex].get() )
+		{
+			return static_cast<const FloatVectorData *>( channelData );
+		}
+	}
+
 	IECore::FloatVectorDataPtr outData = inPlug()->channelData( channelName, tileOrigin )->copy();
 	processChannelData( context, parent, channelName, outData );
 	return outData;
 }
+
+void ChannelDataProcessor::processLayerData( const Gaffer::Context *context, const ImagePlug *parent, const std::vector<std::string> &channels, const std::vector<IECore::FloatVectorDataPtr> &outData ) const
+{
+	ImagePlug::ChannelDataScope channelDataScope( context );
+	for( size_t i = 0; i < channels.size(); ++i )
+	{
+		channelDataScope.setChannelName( channels[i] );
+		processChannelData( Context::current(), parent, channels[i], outData[i] );
+	}
+}
+
+std::vector<std::string> ChannelDataProcessor::layerChannels( const Gaffer::Context *context ) const
+{
+	ConstStringVectorDataPtr channelNamesData;
+	{
+		ImagePlug::GlobalScope globalScope( context );
+		channelNamesData = inPlug()->channelNamesPlug()->getValue();
+	}
+	const vector<string> &channelNames = channelNamesData->readable();
+
+	const string &layerName = context->get<string>( g_layerNameKey );
+
+	vector<string> result;
+	for( const auto &baseName : { "R", "G", "B", "A" } )
+	{
+		const string channelName = ImageAlgo::channelName( layerName, baseName );
+		if( ImageAlgo::channelExists( channelNames, channelName ) && channelEnabled( channelName ) )
+		{
+			result.push_back( channelName );
+		}
+	}
+
+	return result;
+}
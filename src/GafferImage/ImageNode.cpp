@@ -175,6 +175,10 @@ void ImageNode::hashChannelNames( const GafferImage::ImagePlug *parent, const Ga
 void ImageNode::hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	ComputeNode::hash( parent->channelDataPlug(), context, h );
+	// The tile size is a process-wide setting, so we must include it
+	// to avoid sharing cache entries between processes using different
+	// tile sizes.
+	h.append( ImagePlug::tileSize() );
 }
 
 void ImageNode::compute( ValuePlug *output, const Context *context ) const
@@ -43,6 +43,8 @@
 
 #include "Gaffer/Context.h"
 
+#include "boost/format.hpp"
+
 using namespace std;
 using namespace tbb;
 using namespace Imath;
@@ -184,16 +186,72 @@ ImagePlug::~ImagePlug()
 {
 }
 
+//////////////////////////////////////////////////////////////////////////
+// Tile size
+//////////////////////////////////////////////////////////////////////////
+
+int ImagePlug::g_tileSizeLog2 = 6;
+
+namespace
+{
+
+IECore::ConstFloatVectorDataPtr constantTile( float value )
+{
+	return new IECore::FloatVectorData( std::vector<float>( ImagePlug::tileSize() * ImagePlug::tileSize(), value ) );
+}
+
+IECore::ConstFloatVectorDataPtr &whiteTileStorage()
+{
+	static IECore::ConstFloatVectorDataPtr g_whiteTile( constantTile( 1.0f ) );
+	return g_whiteTile;
+}
+
+IECore::ConstFloatVectorDataPtr &blackTileStorage()
+{
+	static IECore::ConstFloatVectorDataPtr g_blackTile( constantTile( 0.0f ) );
+	return g_blackTile;
+}
+
+} // namespace
+
+void ImagePlug::setTileSize( int tileSize )
+{
+	int log2 = 0;
+	while( ( 1 << log2 ) < tileSize )
+	{
+		log2++;
+	}
+
+	if( ( 1 << log2 ) != tileSize || log2 < 4 || log2 > 10 )
+	{
+		throw IECore::Exception( boost::str( boost::format( "Invalid tile size %d (must be a power of two between 16 and 1024)" ) % tileSize ) );
+	}
+
+	if( log2 == g_tileSizeLog2 )
+	{
+		return;
+	}
+
+	g_tileSizeLog2 = log2;
+	whiteTileStorage() = constantTile( 1.0f );
+	blackTileStorage() = constantTile( 0.0f );
+
+	// Cached values and hashes were computed for the old tile size,
+	// and must not be reused. Stale hashes would be particularly
+	// harmful, since they would be used to store values for the
+	// new tile size, including in the disk cache.
+	ValuePlug::clearCache();
+	ValuePlug::clearHashCache();
+}
+
 const IECore::FloatVectorData *ImagePlug::whiteTile()
 {
-	static IECore::ConstFloatVectorDataPtr g_whiteTile( new IECore::FloatVectorData( std::vector<float>( ImagePlug::tileSize()*ImagePlug::tileSize(), 1. ) ) );
-	return g_whiteTile.get();
+	return whiteTileStorage().get();
 };
 
 const IECore::FloatVectorData *ImagePlug::blackTile()
 {
-	static IECore::ConstFloatVectorDataPtr g_blackTile( new IECore::FloatVectorData( std::vector<float>( ImagePlug::tileSize()*ImagePlug::tileSize(), 0. ) ) );
-	return g_blackTile.get();
+	return blackTileStorage().get();
 };
 
 bool ImagePlug::acceptsChild( const GraphComponent *potentialChild ) const
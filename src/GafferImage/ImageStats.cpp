@@ -36,15 +36,22 @@
 
 #include "GafferImage/ImageStats.h"
 
+#include "GafferImage/BufferAlgo.h"
 #include "GafferImage/FormatPlug.h"
 #include "GafferImage/ImageAlgo.h"
-#include "GafferImage/Sampler.h"
 
 #include "Gaffer/BoxPlug.h"
 #include "Gaffer/ScriptNode.h"
 #include "Gaffer/TypedPlug.h"
 
+#include "IECore/CompoundData.h"
+#include "IECore/NullObject.h"
+#include "IECore/SimpleTypedData.h"
+#include "IECore/VectorTypedData.h"
+
 using namespace std;
+using namespace Imath;
+using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
@@ -72,6 +79,76 @@ int colorIndex( const ValuePlug *plug )
 	return -1;
 }
 
+// Statistics for a region of a single channel. Statistics
+// for separate regions may be merged to give the statistics
+// for their union.
+struct Statistics
+{
+
+	Statistics( size_t bins )
+		:	sum( 0 ), min( Imath::limits<float>::max() ), max( -Imath::limits<float>::max() ), count( 0 ), histogram( bins, 0 )
+	{
+	}
+
+	Statistics( const CompoundData *data )
+		:	sum( data->member<DoubleData>( "sum" )->readable() ),
+			min( data->member<FloatData>( "min" )->readable() ),
+			max( data->member<FloatData>( "max" )->readable() ),
+			count( data->member<UInt64Data>( "count" )->readable() ),
+			histogram( data->member<UInt64VectorData>( "histogram" )->readable() )
+	{
+	}
+
+	void merge( const Statistics &other )
+	{
+		sum += other.sum;
+		min = std::min( min, other.min );
+		max = std::max( max, other.max );
+		count += other.count;
+		for( size_t i = 0, e = std::min( histogram.size(), other.histogram.size() ); i < e; ++i )
+		{
+			histogram[i] += other.histogram[i];
+		}
+	}
+
+	CompoundDataPtr data() const
+	{
+		CompoundDataPtr result = new CompoundData;
+		result->writable()["sum"] = new DoubleData( sum );
+		result->writable()["min"] = new FloatData( min );
+		result->writable()["max"] = new FloatData( max );
+		result->writable()["count"] = new UInt64Data( count );
+		result->writable()["histogram"] = new UInt64VectorData( histogram );
+		return result;
+	}
+
+	// Returns the value below which `percentile` percent of the
+	// values lie, interpolating linearly within the histogram bins.
+	float percentile( float percentile, const V2f &range ) const
+	{
+		const float binWidth = ( range[1] - range[0] ) / histogram.size();
+		const double target = std::max( 0.0f, std::min( percentile, 100.0f ) ) / 100.0 * count;
+		uint64_t cumulative = 0;
+		for( size_t i = 0; i < histogram.size(); ++i )
+		{
+			if( histogram[i] && cumulative + histogram[i] >= target )
+			{
+				const double f = ( target - cumulative ) / histogram[i];
+				return range[0] + ( i + f ) * binWidth;
+			}
+			cumulative += histogram[i];
+		}
+		return range[1];
+	}
+
+	double sum;
+	float min;
+	float max;
+	uint64_t count;
+	vector<uint64_t> histogram;
+
+};
+
 } // namespace
 
 //////////////////////////////////////////////////////////////////////////
@@ -100,6 +177,15 @@ ImageStats::ImageStats( const std::string &name )
 	addChild( new Color4fPlug( "average", Gaffer::Plug::Out, Imath::Color4f( 0, 0, 0, 1 ) ) );
 	addChild( new Color4fPlug( "min", Gaffer::Plug::Out, Imath::Color4f( 0, 0, 0, 1 ) ) );
 	addChild( new Color4fPlug( "max", Gaffer::Plug::Out, Imath::Color4f( 0, 0, 0, 1 ) ) );
+
+	addChild( new V2fPlug( "histogramRange", Gaffer::Plug::In, V2f( 0, 1 ) ) );
+	addChild( new IntPlug( "histogramBins", Gaffer::Plug::In, 256, 1, 65536 ) );
+	addChild( new FloatPlug( "percentile", Gaffer::Plug::In, 50, 0, 100 ) );
+	addChild( new AtomicCompoundDataPlug( "histogram", Gaffer::Plug::Out, new CompoundData ) );
+	addChild( new Color4fPlug( "percentileValue", Gaffer::Plug::Out, Imath::Color4f( 0, 0, 0, 1 ) ) );
+
+	addChild( new ObjectPlug( "__tileStats", Gaffer::Plug::Out, NullObject::defaultNullObject() ) );
+	addChild( new ObjectPlug( "__channelStats", Gaffer::Plug::Out, NullObject::defaultNullObject() ) );
 }
 
 ImageStats::~ImageStats()
@@ -166,15 +252,104 @@ const Color4fPlug *ImageStats::maxPlug() const
 	return getChild<Color4fPlug>( g_firstPlugIndex + 5 );
 }
 
+Gaffer::V2fPlug *ImageStats::histogramRangePlug()
+{
+	return getChild<V2fPlug>( g_firstPlugIndex + 6 );
+}
+
+const Gaffer::V2fPlug *ImageStats::histogramRangePlug() const
+{
+	return getChild<V2fPlug>( g_firstPlugIndex + 6 );
+}
+
+Gaffer::IntPlug *ImageStats::histogramBinsPlug()
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 7 );
+}
+
+const Gaffer::IntPlug *ImageStats::histogramBinsPlug() const
+{
+	return getChild<IntPlug>( g_firstPlugIndex + 7 );
+}
+
+Gaffer::FloatPlug *ImageStats::percentilePlug()
+{
+	return getChild<FloatPlug>( g_firstPlugIndex + 8 );
+}
+
+const Gaffer::FloatPlug *ImageStats::percentilePlug() const
+{
+	return getChild<FloatPlug>( g_firstPlugIndex + 8 );
+}
+
+Gaffer::AtomicCompoundDataPlug *ImageStats::histogramPlug()
+{
+	return getChild<AtomicCompoundDataPlug>( g_firstPlugIndex + 9 );
+}
+
+const Gaffer::AtomicCompoundDataPlug *ImageStats::histogramPlug() const
+{
+	return getChild<AtomicCompoundDataPlug>( g_firstPlugIndex + 9 );
+}
+
+Gaffer::Color4fPlug *ImageStats::percentileValuePlug()
+{
+	return getChild<Color4fPlug>( g_firstPlugIndex + 10 );
+}
+
+const Gaffer::Color4fPlug *ImageStats::percentileValuePlug() const
+{
+	return getChild<Color4fPlug>( g_firstPlugIndex + 10 );
+}
+
+Gaffer::ObjectPlug *ImageStats::tileStatsPlug()
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 11 );
+}
+
+const Gaffer::ObjectPlug *ImageStats::tileStatsPlug() const
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 11 );
+}
+
+Gaffer::ObjectPlug *ImageStats::channelStatsPlug()
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 12 );
+}
+
+const Gaffer::ObjectPlug *ImageStats::channelStatsPlug() const
+{
+	return getChild<ObjectPlug>( g_firstPlugIndex + 12 );
+}
+
 void ImageStats::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	ComputeNode::affects( input, outputs );
+
 	if(
 		input == inPlug()->dataWindowPlug() ||
-		input == inPlug()->channelNamesPlug() ||
 		input == inPlug()->channelDataPlug() ||
-		input == channelsPlug() ||
-		areaPlug()->isAncestorOf( input )
+		areaPlug()->isAncestorOf( input ) ||
+		histogramRangePlug()->isAncestorOf( input ) ||
+		input == histogramBinsPlug()
+	)
+	{
+		outputs.push_back( tileStatsPlug() );
+	}
+
+	if(
+		input == tileStatsPlug() ||
+		areaPlug()->isAncestorOf( input ) ||
+		input == histogramBinsPlug()
+	)
+	{
+		outputs.push_back( channelStatsPlug() );
+	}
+
+	if(
+		input == channelStatsPlug() ||
+		input == inPlug()->channelNamesPlug() ||
+		input == channelsPlug()
 	)
 	{
 		for( unsigned int i = 0; i < 4; ++i )
@@ -182,8 +357,20 @@ void ImageStats::affects( const Gaffer::Plug *input, AffectedPlugsContainer &out
 			outputs.push_back( minPlug()->getChild(i) );
 			outputs.push_back( averagePlug()->getChild(i) );
 			outputs.push_back( maxPlug()->getChild(i) );
+			outputs.push_back( percentileValuePlug()->getChild(i) );
+		}
+		outputs.push_back( histogramPlug() );
+	}
+
+	if(
+		input == percentilePlug() ||
+		histogramRangePlug()->isAncestorOf( input )
+	)
+	{
+		for( unsigned int i = 0; i < 4; ++i )
+		{
+			outputs.push_back( percentileValuePlug()->getChild(i) );
 		}
-		return;
 	}
 }
 
@@ -191,6 +378,71 @@ void ImageStats::hash( const ValuePlug *output, const Context *context, IECore::
 {
 	ComputeNode::hash( output, context, h);
 
+	if( output == tileStatsPlug() )
+	{
+		const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+		const Box2i tileBound( tileOrigin, tileOrigin + V2i( ImagePlug::tileSize() ) );
+		Box2i validBound;
+		Box2i dataBound;
+		{
+			ImagePlug::GlobalScope c( context );
+			// Tiles which are entirely within the area have the same hash
+			// regardless of the area, so moving the area only requires
+			// the tiles at the edges to be recomputed.
+			validBound = BufferAlgo::intersection( tileBound, areaPlug()->getValue() );
+			dataBound = BufferAlgo::intersection( validBound, inPlug()->dataWindowPlug()->getValue() );
+			histogramRangePlug()->hash( h );
+			histogramBinsPlug()->hash( h );
+		}
+		h.append( validBound );
+		h.append( dataBound );
+		if( !BufferAlgo::empty( dataBound ) )
+		{
+			inPlug()->channelDataPlug()->hash( h );
+		}
+		return;
+	}
+	else if( output == channelStatsPlug() )
+	{
+		const Box2i area = areaPlug()->getValue();
+		histogramBinsPlug()->hash( h );
+		if( BufferAlgo::empty( area ) )
+		{
+			// Matches the empty statistics output by `compute()`,
+			// regardless of the particular empty area.
+			return;
+		}
+		h.append( area );
+
+		ImagePlug::ChannelDataScope tileScope( context );
+		V2i tileOrigin;
+		const V2i minTileOrigin = ImagePlug::tileOrigin( area.min );
+		for( tileOrigin.y = minTileOrigin.y; tileOrigin.y < area.max.y; tileOrigin.y += ImagePlug::tileSize() )
+		{
+			for( tileOrigin.x = minTileOrigin.x; tileOrigin.x < area.max.x; tileOrigin.x += ImagePlug::tileSize() )
+			{
+				tileScope.setTileOrigin( tileOrigin );
+				tileStatsPlug()->hash( h );
+			}
+		}
+		return;
+	}
+	else if( output == histogramPlug() )
+	{
+		for( int i = 0; i < 4; ++i )
+		{
+			const std::string channelName = this->channelName( i );
+			if( !channelName.empty() )
+			{
+				ImagePlug::ChannelDataScope channelScope( context );
+				channelScope.setChannelName( channelName );
+				h.append( channelName );
+				channelStatsPlug()->hash( h );
+			}
+		}
+		return;
+	}
+
 	const int colorIndex = ::colorIndex( output );
 	if( colorIndex == -1 )
 	{
@@ -207,12 +459,124 @@ void ImageStats::hash( const ValuePlug *output, const Context *context, IECore::
 		return;
 	}
 
-	Sampler s( inPlug(), channelName, area );
-	s.hash( h );
+	if( output->parent<Plug>() == percentileValuePlug() )
+	{
+		percentilePlug()->hash( h );
+		histogramRangePlug()->hash( h );
+	}
+
+	ImagePlug::ChannelDataScope channelScope( context );
+	channelScope.setChannelName( channelName );
+	channelStatsPlug()->hash( h );
 }
 
 void ImageStats::compute( ValuePlug *output, const Context *context ) const
 {
+	if( output == tileStatsPlug() )
+	{
+		const V2i tileOrigin = context->get<V2i>( ImagePlug::tileOriginContextName );
+		const Box2i tileBound( tileOrigin, tileOrigin + V2i( ImagePlug::tileSize() ) );
+
+		Box2i validBound;
+		Box2i dataBound;
+		V2f range;
+		int bins;
+		{
+			ImagePlug::GlobalScope c( context );
+			validBound = BufferAlgo::intersection( tileBound, areaPlug()->getValue() );
+			dataBound = BufferAlgo::intersection( validBound, inPlug()->dataWindowPlug()->getValue() );
+			range = histogramRangePlug()->getValue();
+			bins = histogramBinsPlug()->getValue();
+		}
+
+		Statistics statistics( bins );
+		const float binScale = range[1] > range[0] ? bins / ( range[1] - range[0] ) : 0.0f;
+		auto add = [&statistics, &range, binScale, bins]( float v, uint64_t n ) {
+			statistics.min = std::min( v, statistics.min );
+			statistics.max = std::max( v, statistics.max );
+			statistics.sum += v * n;
+			statistics.count += n;
+			const float b = ( v - range[0] ) * binScale;
+			// Written so that NaNs fall in the first bin.
+			const int bin = b > 0.0f ? std::min( (int)b, bins - 1 ) : 0;
+			statistics.histogram[bin] += n;
+		};
+
+		// Pixels outside the data window are black.
+		const uint64_t validArea = (uint64_t)validBound.size().x * validBound.size().y;
+		const uint64_t dataArea = BufferAlgo::empty( dataBound ) ? 0 : (uint64_t)dataBound.size().x * dataBound.size().y;
+		if( validArea > dataArea )
+		{
+			add( 0.0f, validArea - dataArea );
+		}
+
+		if( dataArea )
+		{
+			ConstFloatVectorDataPtr channelData = inPlug()->channelDataPlug()->getValue();
+			const vector<float> &channel = channelData->readable();
+			for( int y = dataBound.min.y; y < dataBound.max.y; ++y )
+			{
+				const float *row = &channel[( y - tileOrigin.y ) * ImagePlug::tileSize() - tileOrigin.x];
+				for( int x = dataBound.min.x; x < dataBound.max.x; ++x )
+				{
+					add( row[x], 1 );
+				}
+			}
+		}
+
+		static_cast<ObjectPlug *>( output )->setValue( statistics.data() );
+		return;
+	}
+	else if( output == channelStatsPlug() )
+	{
+		const Box2i area = areaPlug()->getValue();
+		Statistics statistics( histogramBinsPlug()->getValue() );
+		if( BufferAlgo::empty( area ) )
+		{
+			static_cast<ObjectPlug *>( output )->setValue( statistics.data() );
+			return;
+		}
+
+		ImageAlgo::parallelGatherTiles(
+			inPlug(),
+			// Tile
+			[this] ( const ImagePlug *imagePlug, const V2i &tileOrigin )
+			{
+				return tileStatsPlug()->getValue();
+			},
+			// Gather
+			[&statistics] ( const ImagePlug *imagePlug, const V2i &tileOrigin, ConstObjectPtr &tileStats )
+			{
+				statistics.merge( Statistics( static_cast<const CompoundData *>( tileStats.get() ) ) );
+			},
+			area
+		);
+
+		static_cast<ObjectPlug *>( output )->setValue( statistics.data() );
+		return;
+	}
+	else if( output == histogramPlug() )
+	{
+		CompoundDataPtr result = new CompoundData;
+		for( int i = 0; i < 4; ++i )
+		{
+			const std::string channelName = this->channelName( i );
+			if( !channelName.empty() )
+			{
+				ConstCompoundDataPtr channelStats;
+				{
+					ImagePlug::ChannelDataScope channelScope( context );
+					channelScope.setChannelName( channelName );
+					channelStats = boost::static_pointer_cast<const CompoundData>( channelStatsPlug()->getValue() );
+				}
+				const vector<uint64_t> &histogram = channelStats->member<UInt64VectorData>( "histogram" )->readable();
+				result->writable()[channelName] = new IntVectorData( vector<int>( histogram.begin(), histogram.end() ) );
+			}
+		}
+		static_cast<AtomicCompoundDataPlug *>( output )->setValue( result );
+		return;
+	}
+
 	const int colorIndex = ::colorIndex( output );
 	if( colorIndex == -1 )
 	{
@@ -230,36 +594,32 @@ void ImageStats::compute( ValuePlug *output, const Context *context ) const
 		return;
 	}
 
-	// Loop over the ROI and compute the min, max and average channel values and then set our outputs.
-	Sampler s( inPlug(), channelName, area );
-
-	float min = Imath::limits<float>::max();
-	float max = Imath::limits<float>::min();
-	double sum = 0.;
-
-	for( int y = area.min.y; y < area.max.y; ++y )
+	ConstCompoundDataPtr channelStatsData;
 	{
-		for( int x = area.min.x; x < area.max.x; ++x )
-		{
-			float v = s.sample( x, y );
-			min = std::min( v, min );
-			max = std::max( v, max );
-			sum += v;
-		}
+		ImagePlug::ChannelDataScope channelScope( context );
+		channelScope.setChannelName( channelName );
+		channelStatsData = boost::static_pointer_cast<const CompoundData>( channelStatsPlug()->getValue() );
 	}
+	const Statistics statistics( channelStatsData.get() );
 
 	if( output->parent<Plug>() == minPlug() )
 	{
-		static_cast<FloatPlug *>( output )->setValue( min );
+		static_cast<FloatPlug *>( output )->setValue( statistics.min );
 	}
 	else if( output->parent<Plug>() == maxPlug() )
 	{
-		static_cast<FloatPlug *>( output )->setValue( max );
+		static_cast<FloatPlug *>( output )->setValue( statistics.max );
 	}
 	else if( output->parent<Plug>() == averagePlug() )
 	{
 		static_cast<FloatPlug *>( output )->setValue(
-			sum / double( (area.size().x) * (area.size().y) )
+			statistics.sum / double( statistics.count )
+		);
+	}
+	else if( output->parent<Plug>() == percentileValuePlug() )
+	{
+		static_cast<FloatPlug *>( output )->setValue(
+			statistics.percentile( percentilePlug()->getValue(), histogramRangePlug()->getValue() )
 		);
 	}
 }
@@ -43,6 +43,7 @@
 #include "GafferImage/ImagePlug.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/Private/WriterThread.h"
 #include "Gaffer/ScriptNode.h"
 #include "Gaffer/StringPlug.h"
 
@@ -55,10 +56,13 @@
 
 #include "OpenColorIO/OpenColorIO.h"
 
+#include "boost/bind.hpp"
 #include "boost/filesystem.hpp"
+#include "boost/format.hpp"
 
 #include "tbb/spin_mutex.h"
 
+#include <cstring>
 #include <memory>
 
 #include <sys/utsname.h>
@@ -115,6 +119,129 @@ void copyBufferArea( const float *inData, const Imath::Box2i &inArea, float *out
 
 typedef std::shared_ptr<ImageOutput> ImageOutputPtr;
 
+// Maximum number of chunks which may be waiting to be written. The
+// gather thread blocks when the queue is full, which bounds memory
+// usage when computation is faster than the output.
+const size_t g_queueCapacity = 4;
+
+// Approximate number of scanlines in each chunk. Passing many scanlines
+// to each `write_scanlines()` or `write_tiles()` call allows formats
+// such as OpenEXR to compress the blocks within it in parallel.
+const int g_scanlinesPerChunk = 256;
+
+// A block of full width scanlines ready to be written, covering
+// the range `[yBegin, yEnd)` in EXR space.
+struct Chunk
+{
+	int yBegin;
+	int yEnd;
+	vector<float> data;
+};
+
+typedef std::shared_ptr<Chunk> ChunkPtr;
+
+// Assembles full width scanlines into chunks, and writes them to the
+// ImageOutput on a WriterThread. This allows the encoding and writing of
+// each chunk to overlap with the computation of the tiles for the chunks
+// which follow it.
+class Output
+{
+
+	public :
+
+		Output( ImageOutputPtr out, const std::string &fileName )
+			:	m_out( out ), m_fileName( fileName ), m_spec( out->spec() ),
+				m_writerThread( boost::bind( &Output::write, this, ::_1 ), g_queueCapacity )
+		{
+		}
+
+		const ImageSpec &spec() const
+		{
+			return m_spec;
+		}
+
+		// Returns zero-initialised storage for the full width scanlines
+		// `[yBegin, yEnd)` in EXR space, which must be filled before the
+		// next call. Scanlines must be requested in order, without gaps.
+		// When writing a tiled image, the range must cover whole rows of
+		// tiles.
+		float *scanlines( int yBegin, int yEnd )
+		{
+			if( m_writerThread.failed() )
+			{
+				// Rethrows the exception from the writer thread.
+				m_writerThread.finish();
+			}
+
+			if( m_chunk && m_chunk->yEnd - m_chunk->yBegin >= g_scanlinesPerChunk )
+			{
+				m_writerThread.push( m_chunk );
+				m_chunk.reset();
+			}
+
+			const size_t scanlineSize = m_spec.width * m_spec.channelnames.size();
+			if( !m_chunk )
+			{
+				m_chunk = std::make_shared<Chunk>();
+				m_chunk->yBegin = m_chunk->yEnd = yBegin;
+				m_chunk->data.reserve( ( g_scanlinesPerChunk + ImagePlug::tileSize() ) * scanlineSize );
+			}
+
+			assert( yBegin == m_chunk->yEnd );
+
+			const size_t offset = m_chunk->data.size();
+			m_chunk->data.resize( offset + ( yEnd - yBegin ) * scanlineSize, 0.0f );
+			m_chunk->yEnd = yEnd;
+
+			return &m_chunk->data[offset];
+		}
+
+		// Waits for all chunks to be written, rethrowing any
+		// exception thrown by the writer thread.
+		void finish()
+		{
+			if( m_chunk )
+			{
+				m_writerThread.push( m_chunk );
+				m_chunk.reset();
+			}
+			m_writerThread.finish();
+		}
+
+	private :
+
+		// Called on the writer thread.
+		void write( const Chunk &chunk )
+		{
+			if( m_spec.tile_width )
+			{
+				if( !m_out->write_tiles( m_spec.x, m_spec.x + m_spec.width, chunk.yBegin, chunk.yEnd, 0, 1, TypeDesc::FLOAT, &chunk.data[0] ) )
+				{
+					throw IECore::Exception( boost::str( boost::format( "Could not write tile to \"%s\", error = %s" ) % m_fileName % m_out->geterror() ) );
+				}
+			}
+			else
+			{
+				if( !m_out->write_scanlines( chunk.yBegin, chunk.yEnd, 0, TypeDesc::FLOAT, &chunk.data[0] ) )
+				{
+					throw IECore::Exception( boost::str( boost::format( "Could not write scanline to \"%s\", error = %s" ) % m_fileName % m_out->geterror() ) );
+				}
+			}
+		}
+
+		ImageOutputPtr m_out;
+		const std::string m_fileName;
+		const ImageSpec m_spec;
+
+		// Only accessed by the gather thread.
+		ChunkPtr m_chunk;
+
+		// Declared last, so that the thread is finished
+		// before the members it uses are destroyed.
+		Gaffer::Private::WriterThread<Chunk> m_writerThread;
+
+};
+
 class TileProcessor
 {
 	public:
@@ -170,23 +297,26 @@ class FlatTileWriter
 	// black, which is what we want. So iterate over the remaining tiles, and
 	// if memory has been allocated for that tile, write it to the file, and if
 	// nothing has been allocated, write a black tile.
+	//
+	// Writing a tile copies it into a row of tiles provided by the Output,
+	// which queues whole rows to be encoded and written on a separate
+	// thread. Black tiles need no copying, as the rows are initialised to
+	// zero.
 	public:
 		FlatTileWriter(
-				ImageOutputPtr out,
-				const std::string &fileName,
+				Output &output,
 				const Imath::Box2i &processWindow,
 				const GafferImage::Format &format
 			) :
-				m_out( out ),
-				m_fileName( fileName ),
+				m_output( output ),
 				m_format( format ),
-				m_spec( m_out->spec() ),
+				m_spec( output.spec() ),
 				m_processWindow( processWindow ),
 				m_inputTilesBounds( Imath::Box2i( ImagePlug::tileOrigin( processWindow.min ), ImagePlug::tileOrigin( processWindow.max - Imath::V2i( 1 ) ) + Imath::V2i( ImagePlug::tileSize() ) ) ),
 				m_outputDataWindow( m_format.fromEXRSpace( Imath::Box2i( Imath::V2i( m_spec.x, m_spec.y ), Imath::V2i( m_spec.x + m_spec.width - 1, m_spec.y + m_spec.height - 1 ) ) ) ),
 				m_numTiles( Imath::V2i( (int)ceil( float( m_spec.width ) / m_spec.tile_width ), (int)ceil( float( m_spec.height ) / m_spec.tile_height ) ) ),
 				m_nextTileIndex( 0 ),
-				m_blackTile( nullptr )
+				m_tileRowData( nullptr )
 		{
 			m_tilesData.resize( m_numTiles.x * m_numTiles.y );
 			m_tilesFilled.resize( m_numTiles.x * m_numTiles.y, false );
@@ -210,8 +340,8 @@ class FlatTileWriter
 				{
 					// If the tileData object hasn't been resized, then
 					// we have never even tried to write data to this
-					// tile, so write the static black tile.
-					writeTile( tileOrigin, blackTile() );
+					// tile, so write a black tile.
+					writeTile( tileOrigin, nullptr );
 				}
 			}
 		}
@@ -255,16 +385,6 @@ class FlatTileWriter
 
 	private:
 
-		inline ConstFloatVectorDataPtr blackTile()
-		{
-			if( m_blackTile == nullptr )
-			{
-				m_blackTile = new IECore::FloatVectorData( std::vector<float>( m_spec.tile_width * m_spec.tile_height * m_spec.channelnames.size(), 0. ) );
-			}
-
-			return m_blackTile;
-		}
-
 		inline size_t outTileIndex( const Imath::V2i &tileOrigin ) const
 		{
 			return ( ( ( m_outputDataWindow.max.y - m_spec.tile_height - tileOrigin.y ) / m_spec.tile_height ) * m_numTiles.x ) + ( ( tileOrigin.x - m_outputDataWindow.min.x ) / m_spec.tile_width );
@@ -338,7 +458,7 @@ class FlatTileWriter
 				}
 				else if( !BufferAlgo::intersects( m_inputTilesBounds, outTileBounds( tileOrigin ) ) )
 				{
-					writeTile( tileOrigin, blackTile() );
+					writeTile( tileOrigin, nullptr );
 				}
 				else
 				{
@@ -350,18 +470,37 @@ class FlatTileWriter
 		}
 
 
-		void writeTile( const Imath::V2i &tileOrigin, ConstFloatVectorDataPtr tileData ) const
+		// Tiles must be written in order. A null `tileData`
+		// writes a black tile.
+		void writeTile( const Imath::V2i &tileOrigin, ConstFloatVectorDataPtr tileData )
 		{
-			Imath::V2i exrTileOrigin = m_format.toEXRSpace( tileOrigin + Imath::V2i( 0, m_spec.tile_height - 1 ) );
+			const Imath::V2i exrTileOrigin = m_format.toEXRSpace( tileOrigin + Imath::V2i( 0, m_spec.tile_height - 1 ) );
+			const int width = std::min( m_spec.tile_width, m_spec.x + m_spec.width - exrTileOrigin.x );
+			const int height = std::min( m_spec.tile_height, m_spec.y + m_spec.height - exrTileOrigin.y );
+
+			if( exrTileOrigin.x == m_spec.x )
+			{
+				// First tile in the row.
+				m_tileRowData = m_output.scanlines( exrTileOrigin.y, exrTileOrigin.y + height );
+			}
 
-			if( !m_out->write_tile( exrTileOrigin.x, exrTileOrigin.y, 0, TypeDesc::FLOAT, &tileData->readable()[0] ) )
+			if( !tileData )
 			{
-				throw IECore::Exception( boost::str( boost::format( "Could not write tile to \"%s\", error = %s" ) % m_fileName % m_out->geterror() ) );
+				return;
+			}
+
+			const size_t numChannels = m_spec.channelnames.size();
+			const float *in = &tileData->readable()[0];
+			float *out = m_tileRowData + ( exrTileOrigin.x - m_spec.x ) * numChannels;
+			for( int y = 0; y < height; ++y )
+			{
+				std::copy( in, in + width * numChannels, out );
+				in += m_spec.tile_width * numChannels;
+				out += m_spec.width * numChannels;
 			}
 		}
 
-		ImageOutputPtr m_out;
-		const std::string &m_fileName;
+		Output &m_output;
 		const GafferImage::Format &m_format;
 		const ImageSpec m_spec;
 		const Imath::Box2i m_processWindow;
@@ -371,7 +510,7 @@ class FlatTileWriter
 		size_t m_nextTileIndex;
 		std::vector<FloatVectorDataPtr> m_tilesData;
 		std::vector<bool> m_tilesFilled;
-		ConstFloatVectorDataPtr m_blackTile;
+		float *m_tileRowData;
 };
 
 class FlatScanlineWriter
@@ -386,19 +525,18 @@ class FlatScanlineWriter
 	// It stores a vector of floats big enough to hold ImagePlug::tileSize()
 	// scanlines. As it receives each tile, it copies the data into the
 	// appropriate location in the buffer. When it's copied the last channel
-	// of the last tile of each row, it writes all of the data from the buffer
-	// into the ImageOutput object.
+	// of the last tile of each row, it copies all of the data from the buffer
+	// into the Output, which queues it to be encoded and written on a separate
+	// thread.
 	public:
 		FlatScanlineWriter(
-				ImageOutputPtr out,
-				const std::string &fileName,
+				Output &output,
 				const Imath::Box2i &processWindow,
 				const GafferImage::Format &format
 			) :
-				m_out( out ),
-				m_fileName( fileName ),
+				m_output( output ),
 				m_format( format ),
-				m_spec( m_out->spec() ),
+				m_spec( output.spec() ),
 				m_processWindow( processWindow ),
 				m_tilesBounds( Imath::Box2i( ImagePlug::tileOrigin( processWindow.min ), ImagePlug::tileOrigin( processWindow.max - Imath::V2i( 1 ) ) + Imath::V2i( ImagePlug::tileSize() ) ) )
 		{
@@ -463,22 +601,24 @@ class FlatScanlineWriter
 			return channelIndex == ( m_spec.channelnames.size() - 1 ) && tileOrigin.x == ( m_tilesBounds.max.x - ImagePlug::tileSize() ) ;
 		}
 
-		void writeScanlines( const int exrYBegin, const int exrYEnd, const int scanlinesYOffset = 0 ) const
+		void writeScanlines( const int exrYBegin, const int exrYEnd, const int scanlinesYOffset = 0 )
 		{
-			if ( !m_out->write_scanlines( exrYBegin, exrYEnd, 0, TypeDesc::FLOAT, &m_scanlinesData[0] + ( scanlinesYOffset * m_spec.width * m_spec.channelnames.size() ) ) )
-			{
-				throw IECore::Exception( boost::str( boost::format( "Could not write scanline to \"%s\", error = %s" ) % m_fileName % m_out->geterror() ) );
-			}
+			const size_t scanlineSize = m_spec.width * m_spec.channelnames.size();
+			memcpy(
+				m_output.scanlines( exrYBegin, exrYEnd ),
+				&m_scanlinesData[0] + scanlinesYOffset * scanlineSize,
+				sizeof( float ) * ( exrYEnd - exrYBegin ) * scanlineSize
+			);
 		}
 
 		void writeBlankScanlines( int yBegin, int yEnd )
 		{
-			float *scanlines = &m_scanlinesData[0];
-			memset( scanlines, 0, sizeof(float) * m_spec.width * std::min( ImagePlug::tileSize(), yEnd - yBegin ) * m_spec.channelnames.size() );
+			// The scanlines provided by the Output are
+			// initialised to zero, so we needn't fill them.
 			while( yBegin < yEnd )
 			{
-				const int numLines = std::min( yEnd - yBegin, ImagePlug::tileSize() );
-				writeScanlines( yBegin, yBegin + numLines );
+				const int numLines = std::min( yEnd - yBegin, g_scanlinesPerChunk );
+				m_output.scanlines( yBegin, yBegin + numLines );
 				yBegin += numLines;
 			}
 		}
@@ -500,8 +640,7 @@ class FlatScanlineWriter
 			}
 		}
 
-		ImageOutputPtr m_out;
-		const std::string &m_fileName;
+		Output &m_output;
 		const GafferImage::Format &m_format;
 		const ImageSpec m_spec;
 		const Imath::Box2i &m_processWindow;
@@ -1075,20 +1214,26 @@ void ImageWriter::execute() const
 	const Imath::Box2i imageDataWindow( imageFormat.fromEXRSpace( extImageDataWindow ) );
 	const Imath::Box2i processDataWindow( BufferAlgo::intersection( imageDataWindow, dataWindow ) );
 
-	TileProcessor processor = TileProcessor();
+	// Tiles are computed in parallel and assembled in order on
+	// the calling thread, while the Output encodes and writes the
+	// assembled data on a thread of its own.
+
+	Output output( out, fileName );
+	TileProcessor processor;
 
 	if ( spec.tile_width == 0 )
 	{
-		FlatScanlineWriter flatScanlineWriter( out, fileName, processDataWindow, imageFormat );
+		FlatScanlineWriter flatScanlineWriter( output, processDataWindow, imageFormat );
 		ImageAlgo::parallelGatherTiles( colorSpaceNode()->outPlug(), spec.channelnames, processor, flatScanlineWriter, processDataWindow, ImageAlgo::TopToBottom );
 		flatScanlineWriter.finish();
 	}
 	else
 	{
-		FlatTileWriter flatTileWriter( out, fileName, processDataWindow, imageFormat );
+		FlatTileWriter flatTileWriter( output, processDataWindow, imageFormat );
 		ImageAlgo::parallelGatherTiles( colorSpaceNode()->outPlug(), spec.channelnames, processor, flatTileWriter, processDataWindow, ImageAlgo::TopToBottom );
 		flatTileWriter.finish();
 	}
 
+	output.finish();
 	out->close();
 }
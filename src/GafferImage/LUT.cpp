@@ -128,6 +128,7 @@ void LUT::hashTransform( const Gaffer::Context *context, IECore::MurmurHash &h )
 	}
 
 	fileNamePlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 	directionPlug()->hash( h );
 	interpolationPlug()->hash( h );
 }
@@ -41,6 +41,7 @@
 #include "GafferImage/ImageAlgo.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/ScriptNode.h"
 #include "Gaffer/StringPlug.h"
 
 #include "IECoreImage/OpenImageIOAlgo.h"
@@ -55,10 +56,14 @@
 
 #include "boost/bind.hpp"
 #include "boost/filesystem/path.hpp"
+#include "boost/noncopyable.hpp"
 #include "boost/regex.hpp"
 
+#include "tbb/enumerable_thread_specific.h"
 #include "tbb/mutex.h"
 
+#include <atomic>
+#include <chrono>
 #include <memory>
 
 OIIO_NAMESPACE_USING
@@ -75,6 +80,16 @@ namespace
 
 const IECore::InternedString g_tileBatchIndexContextName( "__tileBatchIndex" );
 
+// Settings.
+std::atomic<size_t> g_handlesPerFile( 1 );
+std::atomic<int> g_tileBatchSize( 512 );
+
+// Statistics.
+std::atomic<size_t> g_openFileHandles( 0 );
+std::atomic<size_t> g_fileCacheEvictions( 0 );
+std::atomic<size_t> g_bytesRead( 0 );
+std::atomic<uint64_t> g_lockWaitTime( 0 ); // Nanoseconds
+
 struct ChannelMapEntry
 {
 	ChannelMapEntry( int subImage, int channelIndex )
@@ -132,8 +147,8 @@ V2i coordinateDivide( V2i a, V2i b )
 // correct tile batch index, access tileBatchPlug, and then return the tile at the correct tileBatchSubIndex.
 //
 // For scanline images, a tile batch is one tile high, and the full width of the image.
-// For tiled images, a tile batch is a fairly large fixed size ( current 512 pixels, or the tile size of the
-// image, whichever is larger ).  This amortizes the waste from tiles which lie over the edge of a tile batch,
+// For tiled images, a tile batch is a fairly large fixed size ( 512 pixels by default, or the tile size of
+// the image, whichever is larger ).  This amortizes the waste from tiles which lie over the edge of a tile batch,
 // and need to be read multiple times.
 // Either way, a tile batch contains all channels stored in the subimage which contains the desired channel.
 //
@@ -145,6 +160,9 @@ V2i coordinateDivide( V2i a, V2i b )
 // of the image horizontally ( this means that the left of the tileBatch is aligned to the data window, not
 // the origin ).
 //
+// Each File may hold several ImageInputs for the same file, allowing different tile batches to be
+// read concurrently. Each ImageInput is guarded by its own mutex, and tile batches are assigned to
+// ImageInputs by index, so that a single tile batch is never read by two threads at once.
 //
 class File
 {
@@ -153,8 +171,11 @@ class File
 
 		// Create a File handle object for an image input and image spec
 		File( std::unique_ptr<ImageInput> imageInput, ImageSpec imageSpec, const std::string &infoFileName )
-			: m_imageInput( std::move( imageInput ) ), m_imageSpec( imageSpec )
+			: m_fileName( infoFileName ), m_imageSpec( imageSpec ), m_numHandles( std::max<size_t>( g_handlesPerFile, 1 ) )
 		{
+			m_handles.reset( new Handle[m_numHandles] );
+			m_handles[0].setInput( std::move( imageInput ) );
+
 			std::vector<std::string> channelNames;
 
 			// \todo - for stereo images, we would need to take note of which view a subimage is for,
@@ -205,7 +226,7 @@ class File
 					}
 				}
 				subImageIndex++;
-			} while( m_imageInput->seek_subimage( subImageIndex, 0, currentSpec ) );
+			} while( m_handles[0].input->seek_subimage( subImageIndex, 0, currentSpec ) );
 
 			m_channelNamesData = new StringVectorData( channelNames );
 
@@ -228,7 +249,7 @@ class File
 				// OpenImageIO tiles that lie across the edge of a Gaffer tile batch, and get loaded multiple times.
 				// In order to amortize this cost, we make the tile batches for tiled source images a fairly large
 				// fixed size.
-				const int batchTargetSize = std::max( 512, std::max( m_imageSpec.tile_width, m_imageSpec.tile_height ) );
+				const int batchTargetSize = std::max<int>( g_tileBatchSize, std::max( m_imageSpec.tile_width, m_imageSpec.tile_height ) );
 				const int batchTileCount = ( batchTargetSize + ImagePlug::tileSize() - 1 ) / ImagePlug::tileSize();
 				m_tileBatchSize = Imath::V2i( batchTileCount );
 			}
@@ -240,10 +261,10 @@ class File
 		//
 		// This is currenly only used by readTileBatch below - we always cache to tile batches when reading
 		// channel data.
-		int readRegion( int subImage, const Box2i &targetRegion, std::vector<float> &data, Box2i &dataRegion )
+		int readRegion( ImageInput &imageInput, int subImage, const Box2i &targetRegion, std::vector<float> &data, Box2i &dataRegion )
 		{
 			ImageSpec subImageSpec;
-			m_imageInput->seek_subimage( subImage, 0, subImageSpec );
+			imageInput.seek_subimage( subImage, 0, subImageSpec );
 
 			const V2i fileDataOrigin( m_imageSpec.x, m_imageSpec.y );
 			const Box2i fileDataWindow( fileDataOrigin,
@@ -263,12 +284,12 @@ class File
 
 				data.resize( subImageSpec.nchannels * fileDataRegion.size().x * fileDataRegion.size().y );
 
-				if( !m_imageInput->read_scanlines( fileDataRegion.min.y, fileDataRegion.max.y, 0, TypeDesc::FLOAT, &data[0] ) )
+				if( !imageInput.read_scanlines( fileDataRegion.min.y, fileDataRegion.max.y, 0, TypeDesc::FLOAT, &data[0] ) )
 				{
 					throw IECore::Exception( boost::str (
 						boost::format( "OpenImageIOReader : Failed to read scanlines %i to %i.  Error: %s" ) %
 						fileDataRegion.min.y % fileDataRegion.max.y %
-						m_imageInput->geterror()
+						imageInput.geterror()
 					) );
 				}
 			}
@@ -290,7 +311,7 @@ class File
 
 				data.resize( subImageSpec.nchannels * fileDataRegion.size().x * fileDataRegion.size().y );
 
-				if( !m_imageInput->read_tiles (
+				if( !imageInput.read_tiles (
 					fileDataRegion.min.x, fileDataRegion.max.x,
 					fileDataRegion.min.y, fileDataRegion.max.y, 0, 1, TypeDesc::FLOAT, &data[0]
 				) )
@@ -299,12 +320,16 @@ class File
 						boost::format( "OpenImageIOReader : Failed to read tiles %i,%i to %i,%i.  Error: %s" ) %
 						fileDataRegion.min.x % fileDataRegion.min.y %
 						fileDataRegion.max.x % fileDataRegion.max.y %
-						m_imageInput->geterror()
+						imageInput.geterror()
 					) );
 				}
 			}
 
 			dataRegion = flopDisplayWindow( fileDataRegion, m_imageSpec.full_y, m_imageSpec.full_height );
+			// Count the pixel data in the file's own formats, rather than the
+			// floats we convert it to. We have no way of knowing how much of
+			// the file itself OIIO reads, so compression isn't accounted for.
+			g_bytesRead += subImageSpec.pixel_bytes( /* native = */ true ) * fileDataRegion.size().x * fileDataRegion.size().y;
 
 			return subImageSpec.nchannels;
 		}
@@ -329,11 +354,11 @@ class File
 			// Do the actual read of data
 			//
 			// Note - this method is not thread-safe, but because this is a private plug is only computed from
-			// the computeChannelData method, it is safe to assume that we have already acquired m_mutex
-			// at this point
+			// the computeChannelData method, it is safe to assume that we have already acquired
+			// mutex( tileBatchIndex ) at this point
 			std::vector<float> fileData;
 			Box2i fileDataRegion;
-			const int nchannels = readRegion( tileBatchIndex.z, targetRegion, fileData, fileDataRegion );
+			const int nchannels = readRegion( imageInput( tileBatchIndex ), tileBatchIndex.z, targetRegion, fileData, fileDataRegion );
 
 			// Pull data apart into tiles ( separate for each channel instead of interleaved )
 			int tileBatchNumElements = nchannels * m_tileBatchSize.y * m_tileBatchSize.x;
@@ -408,14 +433,15 @@ class File
 			return m_imageSpec;
 		}
 
-		tbb::mutex &mutex()
+		// Returns the mutex which must be held while reading the specified tile batch.
+		tbb::mutex &mutex( const V3i &tileBatchIndex )
 		{
-			return m_mutex;
+			return m_handles[handleIndex( tileBatchIndex )].mutex;
 		}
 
 		std::string formatName() const
 		{
-			return m_imageInput->format_name();
+			return m_handles[0].input->format_name();
 		}
 
 		ConstStringVectorDataPtr channelNamesData()
@@ -425,6 +451,55 @@ class File
 
 	private:
 
+		// Maintains `g_openFileHandles`, including when a Handle is
+		// destroyed because the File constructor threw.
+		struct Handle
+		{
+
+			~Handle()
+			{
+				if( input )
+				{
+					g_openFileHandles--;
+				}
+			}
+
+			void setInput( std::unique_ptr<ImageInput> imageInput )
+			{
+				assert( !input );
+				input = std::move( imageInput );
+				g_openFileHandles++;
+			}
+
+			std::unique_ptr<ImageInput> input;
+			tbb::mutex mutex;
+
+		};
+
+		size_t handleIndex( const V3i &tileBatchIndex ) const
+		{
+			const size_t h = (size_t)tileBatchIndex.x * 73856093 ^ (size_t)tileBatchIndex.y * 19349663 ^ (size_t)tileBatchIndex.z * 83492791;
+			return h % m_numHandles;
+		}
+
+		// Returns the ImageInput used to read the specified tile batch, opening
+		// it if necessary. The caller must hold mutex( tileBatchIndex ).
+		ImageInput &imageInput( const V3i &tileBatchIndex )
+		{
+			Handle &handle = m_handles[handleIndex( tileBatchIndex )];
+			if( !handle.input )
+			{
+				ImageSpec imageSpec;
+				std::unique_ptr<ImageInput> imageInput( ImageInput::create( m_fileName ) );
+				if( !imageInput || !imageInput->open( m_fileName, imageSpec ) )
+				{
+					throw IECore::Exception( "OpenImageIOReader : Could not open additional ImageInput for \"" + m_fileName + "\" : " + OIIO::geterror() );
+				}
+				handle.setInput( std::move( imageInput ) );
+			}
+			return *handle.input;
+		}
+
 		// Given a subImage index, and a tile origin, return an index to identify the tile batch which
 		// where this channel data will be found
 		V3i tileBatchIndex( int subImage, V2i tileOrigin ) const
@@ -454,12 +529,13 @@ class File
 			return channelIndex * tilePlaneSize + subIndex.y * m_tileBatchSize.x + subIndex.x;
 		}
 
-		std::unique_ptr<ImageInput> m_imageInput;
+		const std::string m_fileName;
 		ImageSpec m_imageSpec;
+		const size_t m_numHandles;
+		std::unique_ptr<Handle[]> m_handles;
 		ConstStringVectorDataPtr m_channelNamesData;
 		std::map<std::string, ChannelMapEntry> m_channelMap;
 		Imath::V2i m_tileBatchSize;
-		tbb::mutex m_mutex;
 		bool m_tiled;
 };
 
@@ -473,6 +549,9 @@ struct CacheEntry
 {
 	FilePtr file;
 	std::shared_ptr<std::string> error;
+	// The tile batches of open files are laid out in terms of
+	// the tile size at the time of opening.
+	int tileSize;
 };
 
 
@@ -481,6 +560,7 @@ CacheEntry fileCacheGetter( const std::string &fileName, size_t &cost )
 	cost = 1;
 
 	CacheEntry result;
+	result.tileSize = ImagePlug::tileSize();
 
 	ImageSpec imageSpec;
 	std::unique_ptr<ImageInput> imageInput( ImageInput::create( fileName ) );
@@ -506,14 +586,61 @@ CacheEntry fileCacheGetter( const std::string &fileName, size_t &cost )
 	return result;
 }
 
+// Set while we remove entries from the cache ourselves, so that
+// `fileCacheRemovalCallback()` can distinguish them from evictions
+// made to stay within the open files limit.
+tbb::enumerable_thread_specific<bool> g_explicitRemoval( false );
+
+void fileCacheRemovalCallback( const std::string &fileName, const CacheEntry &cacheEntry )
+{
+	if( !g_explicitRemoval.local() )
+	{
+		g_fileCacheEvictions++;
+	}
+}
+
 typedef LRUCache<std::string, CacheEntry> FileHandleCache;
 
 FileHandleCache *fileCache()
 {
-	static FileHandleCache *c = new FileHandleCache( fileCacheGetter, 200 );
+	static FileHandleCache *c = new FileHandleCache( fileCacheGetter, fileCacheRemovalCallback, 200 );
 	return c;
 }
 
+class ExplicitRemovalScope : boost::noncopyable
+{
+
+	public :
+
+		ExplicitRemovalScope()
+			:	m_explicitRemoval( g_explicitRemoval.local() )
+		{
+			m_explicitRemoval = true;
+		}
+
+		~ExplicitRemovalScope()
+		{
+			m_explicitRemoval = false;
+		}
+
+	private :
+
+		bool &m_explicitRemoval;
+
+};
+
+void eraseFile( const std::string &fileName )
+{
+	ExplicitRemovalScope scope;
+	fileCache()->erase( fileName );
+}
+
+void clearFiles()
+{
+	ExplicitRemovalScope scope;
+	fileCache()->clear();
+}
+
 // Returns the file handle container for the given filename in the current
 // context. Throws if the file is invalid, and returns null if
 // the filename is empty.
@@ -528,6 +655,12 @@ FilePtr retrieveFile( std::string &fileName, OpenImageIOReader::MissingFrameMode
 
 	FileHandleCache *cache = fileCache();
 	CacheEntry cacheEntry = cache->get( resolvedFileName );
+	if( cacheEntry.tileSize != ImagePlug::tileSize() )
+	{
+		// Tile size has changed since the file was opened.
+		eraseFile( resolvedFileName );
+		cacheEntry = cache->get( resolvedFileName );
+	}
 	if( !cacheEntry.file )
 	{
 		if( mode == OpenImageIOReader::Black )
@@ -682,6 +815,76 @@ size_t OpenImageIOReader::supportedExtensions( std::vector<std::string> &extensi
 	return extensions.size();
 }
 
+size_t OpenImageIOReader::getOpenFilesLimit()
+{
+	return fileCache()->getMaxCost();
+}
+
+void OpenImageIOReader::setOpenFilesLimit( size_t maxOpenFiles )
+{
+	fileCache()->setMaxCost( maxOpenFiles );
+}
+
+size_t OpenImageIOReader::getHandlesPerFile()
+{
+	return g_handlesPerFile;
+}
+
+void OpenImageIOReader::setHandlesPerFile( size_t handlesPerFile )
+{
+	g_handlesPerFile = std::max<size_t>( handlesPerFile, 1 );
+}
+
+int OpenImageIOReader::getTileBatchSize()
+{
+	return g_tileBatchSize;
+}
+
+void OpenImageIOReader::setTileBatchSize( int pixels )
+{
+	pixels = std::max( pixels, ImagePlug::tileSize() );
+	if( pixels == g_tileBatchSize )
+	{
+		return;
+	}
+
+	g_tileBatchSize = pixels;
+	// Open files have batch sizes derived from the old setting,
+	// so must be reopened. Cached hashes and tile batches were
+	// also computed with the old layout, and must not be reused
+	// with the new one.
+	clearFiles();
+	ValuePlug::clearCache();
+	ValuePlug::clearHashCache();
+}
+
+size_t OpenImageIOReader::openFileHandles()
+{
+	return g_openFileHandles;
+}
+
+size_t OpenImageIOReader::fileCacheEvictions()
+{
+	return g_fileCacheEvictions;
+}
+
+size_t OpenImageIOReader::bytesRead()
+{
+	return g_bytesRead;
+}
+
+double OpenImageIOReader::lockWaitTime()
+{
+	return g_lockWaitTime / 1e9;
+}
+
+void OpenImageIOReader::resetStatistics()
+{
+	g_fileCacheEvictions = 0;
+	g_bytesRead = 0;
+	g_lockWaitTime = 0;
+}
+
 void OpenImageIOReader::affects( const Gaffer::Plug *input, AffectedPlugsContainer &outputs ) const
 {
 	ImageNode::affects( input, outputs );
@@ -712,6 +915,8 @@ void OpenImageIOReader::hash( const ValuePlug *output, const Context *context, I
 	else if( output == tileBatchPlug() )
 	{
 		h.append( context->get<V3i>( g_tileBatchIndexContextName ) );
+		h.append( g_tileBatchSize.load() );
+		h.append( ImagePlug::tileSize() );
 		{
 			ImagePlug::GlobalScope c( context );
 			hashFileName( context, h );
@@ -775,6 +980,11 @@ void OpenImageIOReader::hashFileName( const Gaffer::Context *context, IECore::Mu
 	if( Context::substitutions( fileName ) & Context::FrameSubstitutions )
 	{
 		h.append( context->getFrame() );
+		ValuePlug::hashFileModificationTime( context->substitute( fileName ), h );
+	}
+	else
+	{
+		ValuePlug::hashFileModificationTime( fileName, h );
 	}
 }
 
@@ -952,7 +1162,7 @@ IECore::ConstFloatVectorDataPtr OpenImageIOReader::computeChannelData( const std
 	ConstObjectVectorPtr tileBatch;
 
 	// We never want two threads to both read the same tile batch from disk, so it's important to lock
-	// on file->m_mutex before calling tileBatchPlug()->getValue().
+	// on file->mutex( tileBatchIndex ) before calling tileBatchPlug()->getValue().
 	//
 	// This however has the potential to create some serious performance hazards when the cache is contended
 	// by multiple threads trying to load different parts of the same image.  We can alleviate this using
@@ -971,7 +1181,14 @@ IECore::ConstFloatVectorDataPtr OpenImageIOReader::computeChannelData( const std
 	}
 	else
 	{
-		tbb::mutex::scoped_lock lock( file->mutex() );
+		tbb::mutex &mutex = file->mutex( tileBatchIndex );
+		tbb::mutex::scoped_lock lock;
+		if( !lock.try_acquire( mutex ) )
+		{
+			const std::chrono::steady_clock::time_point t = std::chrono::steady_clock::now();
+			lock.acquire( mutex );
+			g_lockWaitTime += std::chrono::duration_cast<std::chrono::nanoseconds>( std::chrono::steady_clock::now() - t ).count();
+		}
 		tileBatch = tileBatchPlug()->getValue();
 	}
 
@@ -981,10 +1198,39 @@ IECore::ConstFloatVectorDataPtr OpenImageIOReader::computeChannelData( const std
 
 void OpenImageIOReader::plugSet( Gaffer::Plug *plug )
 {
-	// this clears the cache every time the refresh count is updated, so you don't get entries
-	// from old files hanging around.
+	// Remove our files from the cache every time the refresh count is updated,
+	// so you don't get entries from old files hanging around. We only remove
+	// our own files, so that other readers don't pay the cost of reopening them.
 	if( plug == refreshCountPlug() )
 	{
-		fileCache()->clear();
+		std::vector<std::string> fileNames;
+		try
+		{
+			const ScriptNode *script = scriptNode();
+			Context::Scope scope( script ? script->context() : Context::current() );
+			const std::string fileName = Context::current()->substitute( fileNamePlug()->getValue() );
+			fileNames.push_back( fileName );
+
+			FileSequencePtr fileSequence = nullptr;
+			IECore::ls( fileNamePlug()->getValue(), fileSequence, /* minSequenceSize */ 1 );
+			if( fileSequence )
+			{
+				std::vector<std::string> sequenceFileNames;
+				fileSequence->fileNames( sequenceFileNames );
+				fileNames.insert( fileNames.end(), sequenceFileNames.begin(), sequenceFileNames.end() );
+			}
+		}
+		catch( ... )
+		{
+			// We can't determine our file names, so
+			// must fall back to clearing everything.
+			clearFiles();
+			return;
+		}
+
+		for( std::vector<std::string>::const_iterator it = fileNames.begin(), eIt = fileNames.end(); it != eIt; ++it )
+		{
+			eraseFile( *it );
+		}
 	}
 }
@@ -41,7 +41,11 @@
 #include "Gaffer/Context.h"
 
 #include <algorithm>
+#include <bitset>
 #include <climits>
+#include <cmath>
+#include <cstdint>
+#include <functional>
 
 using namespace std;
 using namespace Imath;
@@ -49,6 +53,393 @@ using namespace IECore;
 using namespace Gaffer;
 using namespace GafferImage;
 
+//////////////////////////////////////////////////////////////////////////
+// Utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Below these radii, the brute force algorithms are faster than the
+// constant time ones, which have a higher fixed cost per tile.
+const int g_minExtremeRadius = 2;
+const int g_minHistogramRadius = 4;
+
+// Computes the minimum or maximum of every window of `2 * radius + 1`
+// consecutive values in `in`, using the van Herk/Gil-Werman algorithm.
+// This requires only three comparisons per value, regardless of radius.
+// Values are accessed with the specified strides, and `size` outputs are
+// produced.
+template<typename Compare>
+void slidingExtreme( const float *in, int inStride, float *out, int outStride, int size, int radius, vector<float> &prefix, vector<float> &suffix )
+{
+	const Compare compare;
+	const int width = 2 * radius + 1;
+
+	if( radius < g_minExtremeRadius )
+	{
+		for( int i = 0; i < size; ++i )
+		{
+			float v = in[i*inStride];
+			for( int j = 1; j < width; ++j )
+			{
+				const float c = in[(i+j)*inStride];
+				if( compare( c, v ) )
+				{
+					v = c;
+				}
+			}
+			out[i*outStride] = v;
+		}
+		return;
+	}
+
+	// Prefix and suffix extremes within blocks of `width` values.
+	const int inSize = size + width - 1;
+	prefix.resize( inSize );
+	suffix.resize( inSize );
+	for( int blockBegin = 0; blockBegin < inSize; blockBegin += width )
+	{
+		const int blockEnd = std::min( blockBegin + width, inSize );
+
+		prefix[blockBegin] = in[blockBegin*inStride];
+		for( int i = blockBegin + 1; i < blockEnd; ++i )
+		{
+			const float v = in[i*inStride];
+			prefix[i] = compare( v, prefix[i-1] ) ? v : prefix[i-1];
+		}
+
+		suffix[blockEnd-1] = in[(blockEnd-1)*inStride];
+		for( int i = blockEnd - 2; i >= blockBegin; --i )
+		{
+			const float v = in[i*inStride];
+			suffix[i] = compare( v, suffix[i+1] ) ? v : suffix[i+1];
+		}
+	}
+
+	// Every window spans at most two blocks, so is covered by the
+	// suffix of one and the prefix of the next.
+	for( int i = 0; i < size; ++i )
+	{
+		const float s = suffix[i];
+		const float p = prefix[i+width-1];
+		out[i*outStride] = compare( p, s ) ? p : s;
+	}
+}
+
+// Fills `result` with the extreme of the window around each pixel of
+// a tile, given the input pixels within `radius` of the tile. Because
+// the window is rectangular, it is computed separably.
+template<typename Compare>
+void extremeFilter( const vector<float> &input, const V2i &radius, const Context *context, vector<float> &result )
+{
+	const int tileSize = ImagePlug::tileSize();
+	const V2i inputSize = V2i( tileSize ) + radius * 2;
+
+	vector<float> horizontal( tileSize * inputSize.y );
+	vector<float> prefix, suffix;
+	for( int y = 0; y < inputSize.y; ++y )
+	{
+		slidingExtreme<Compare>( &input[y * inputSize.x], 1, &horizontal[y * tileSize], 1, tileSize, radius.x, prefix, suffix );
+	}
+
+	IECore::Canceller::check( context->canceller() );
+
+	result.resize( tileSize * tileSize );
+	for( int x = 0; x < tileSize; ++x )
+	{
+		slidingExtreme<Compare>( &horizontal[x], tileSize, &result[x], tileSize, tileSize, radius.y, prefix, suffix );
+	}
+}
+
+// Fills `result` with the median of the window around each pixel of
+// a tile, given the input pixels within `radius` of the tile.
+//
+// For large radii we use a sliding window histogram in the style of
+// Huang et al. Rather than quantise the values, which would make the
+// result approximate, we histogram their ranks within the input region,
+// so that the result is exactly the same as that of a brute force
+// sort. Each rank is unique, so the histogram is a bitset, stored in
+// 64 bit words so that empty spans can be skipped quickly.
+void medianFilter( const vector<float> &input, const V2i &radius, const Context *context, vector<float> &result )
+{
+	const int tileSize = ImagePlug::tileSize();
+	const V2i inputSize = V2i( tileSize ) + radius * 2;
+	const V2i windowSize = radius * 2 + V2i( 1 );
+	const int windowArea = windowSize.x * windowSize.y;
+	const int k = windowArea / 2;
+
+	result.resize( tileSize * tileSize );
+
+	if( std::max( radius.x, radius.y ) < g_minHistogramRadius )
+	{
+		vector<float> pixels( windowArea );
+		vector<float>::iterator resultIt = pixels.begin() + k;
+		vector<float>::iterator outIt = result.begin();
+		for( int y = 0; y < tileSize; ++y )
+		{
+			IECore::Canceller::check( context->canceller() );
+			for( int x = 0; x < tileSize; ++x )
+			{
+				vector<float>::iterator pixelsIt = pixels.begin();
+				for( int wy = 0; wy < windowSize.y; ++wy )
+				{
+					const float *row = &input[( y + wy ) * inputSize.x + x];
+					pixelsIt = std::copy( row, row + windowSize.x, pixelsIt );
+				}
+				nth_element( pixels.begin(), resultIt, pixels.end() );
+				*outIt++ = *resultIt;
+			}
+		}
+		return;
+	}
+
+	// Rank the input values. NaNs are sorted last so that we have
+	// a strict weak ordering.
+
+	const int inputArea = input.size();
+	vector<int> sorted( inputArea );
+	for( int i = 0; i < inputArea; ++i )
+	{
+		sorted[i] = i;
+	}
+	auto compare = [&input]( int a, int b ) {
+		const float va = input[a];
+		const float vb = input[b];
+		return va < vb || ( std::isnan( vb ) && !std::isnan( va ) );
+	};
+
+	// We sort in chunks and then merge them, so that we can check for
+	// cancellation periodically even when the radius is huge.
+	const int chunkSize = 16384;
+	for( int begin = 0; begin < inputArea; begin += chunkSize )
+	{
+		IECore::Canceller::check( context->canceller() );
+		std::sort( sorted.begin() + begin, sorted.begin() + std::min( begin + chunkSize, inputArea ), compare );
+	}
+	for( int width = chunkSize; width < inputArea; width *= 2 )
+	{
+		for( int begin = 0; begin + width < inputArea; begin += 2 * width )
+		{
+			IECore::Canceller::check( context->canceller() );
+			std::inplace_merge(
+				sorted.begin() + begin, sorted.begin() + begin + width,
+				sorted.begin() + std::min( begin + 2 * width, inputArea ),
+				compare
+			);
+		}
+	}
+
+	vector<int> ranks( inputArea );
+	for( int i = 0; i < inputArea; ++i )
+	{
+		ranks[sorted[i]] = i;
+	}
+
+	IECore::Canceller::check( context->canceller() );
+
+	vector<uint64_t> histogram( inputArea / 64 + 1, 0 );
+	auto contains = [&histogram]( int rank ) { return ( histogram[rank / 64] >> ( rank % 64 ) ) & 1; };
+	auto count = []( uint64_t word ) { return (int)std::bitset<64>( word ).count(); };
+
+	// Initialise the histogram for the first window, and
+	// find its median by counting upwards.
+
+	for( int wy = 0; wy < windowSize.y; ++wy )
+	{
+		IECore::Canceller::check( context->canceller() );
+		for( int wx = 0; wx < windowSize.x; ++wx )
+		{
+			const int rank = ranks[wy * inputSize.x + wx];
+			histogram[rank / 64] |= uint64_t( 1 ) << ( rank % 64 );
+		}
+	}
+
+	int below = 0; // Number of ranks in the window which are less than `median`
+	size_t word = 0;
+	while( below + count( histogram[word] ) <= k )
+	{
+		below += count( histogram[word++] );
+	}
+
+	int median = word * 64; // Rank of the current median
+	while( !contains( median ) || below < k )
+	{
+		if( contains( median ) )
+		{
+			++below;
+		}
+		++median;
+	}
+
+	// Replaces one rank in the window with another, keeping
+	// `below` up to date.
+	auto replace = [&]( int removed, int added ) {
+		histogram[removed / 64] &= ~( uint64_t( 1 ) << ( removed % 64 ) );
+		histogram[added / 64] |= uint64_t( 1 ) << ( added % 64 );
+		below += ( added < median ) - ( removed < median );
+	};
+
+	// Moves the median until exactly `k` ranks in the window
+	// lie below it.
+	auto updateMedian = [&]() {
+
+		while( below > k )
+		{
+			// Search downwards for the previous rank.
+			--median;
+			while( !contains( median ) )
+			{
+				if( median % 64 == 63 && histogram[median / 64] == 0 )
+				{
+					median -= 64;
+				}
+				else
+				{
+					--median;
+				}
+			}
+			--below;
+		}
+
+		while( below < k || !contains( median ) )
+		{
+			// Search upwards for the next rank.
+			if( contains( median ) )
+			{
+				++below;
+			}
+			++median;
+			while( !contains( median ) )
+			{
+				if( median % 64 == 0 && histogram[median / 64] == 0 )
+				{
+					median += 64;
+				}
+				else
+				{
+					++median;
+				}
+			}
+		}
+	};
+
+	// Visit the pixels in a serpentine order, so that each step
+	// slides the window by a single pixel and only a single row
+	// or column of the histogram needs updating.
+
+	int x = 0;
+	for( int y = 0; y < tileSize; ++y )
+	{
+		IECore::Canceller::check( context->canceller() );
+
+		if( y > 0 )
+		{
+			// Slide down
+			const int *top = &ranks[( y - 1 ) * inputSize.x + x];
+			const int *bottom = top + windowSize.y * inputSize.x;
+			for( int wx = 0; wx < windowSize.x; ++wx )
+			{
+				replace( top[wx], bottom[wx] );
+			}
+			updateMedian();
+		}
+
+		result[y * tileSize + x] = input[sorted[median]];
+
+		const int step = y % 2 ? -1 : 1;
+		for( int i = 1; i < tileSize; ++i )
+		{
+			// Slide sideways
+			const int *leading = &ranks[y * inputSize.x + ( step > 0 ? x + windowSize.x : x - 1 )];
+			const int *trailing = &ranks[y * inputSize.x + ( step > 0 ? x : x + windowSize.x - 1 )];
+			for( int wy = 0; wy < windowSize.y; ++wy )
+			{
+				replace( trailing[wy * inputSize.x], leading[wy * inputSize.x] );
+			}
+			updateMedian();
+
+			x += step;
+			result[y * tileSize + x] = input[sorted[median]];
+		}
+	}
+}
+
+// Returns the offset from `center` to the pixel with the specified value,
+// preferring pixels closest to the center in case of ties. We search outwards
+// ring by ring, so that we can usually stop after examining only a few pixels.
+V2i closestOffset( const vector<float> &input, int inputWidth, const V2i &center, const V2i &radius, float value )
+{
+	V2i result( INT_MAX, INT_MAX );
+	int closestMatch = INT_MAX;
+
+	auto visit = [&]( const V2i &o ) {
+
+		// If we've found a pixel which matches the rank value
+		if( input[( center.y + o.y ) * inputWidth + center.x + o.x] != value )
+		{
+			return;
+		}
+
+		int absX = abs( o.x );
+		int absY = abs( o.y );
+
+		// Simple heuristic for distance from the center
+		// Weight Chebyshev distance heavily, followed by Manhattan distance to resolve ties
+		// The specifics don't matter too much as long as we generally prefer points near the
+		// center in case of ties.  Chebyshev distance of N is equivalent to saying "This
+		// would be within the range of a rank filter of radius N"
+		int distance = 100 * max( absX, absY ) + absX + absY;
+
+		// Remaining ties are resolved in favour of the first pixel in scanline order.
+		if(
+			distance < closestMatch ||
+			( distance == closestMatch && ( o.y < result.y || ( o.y == result.y && o.x < result.x ) ) )
+		)
+		{
+			closestMatch = distance;
+			result = o;
+		}
+	};
+
+	for( int ring = 0, maxRing = max( radius.x, radius.y ); ring <= maxRing; ++ring )
+	{
+		if( 101 * ring > closestMatch )
+		{
+			// No pixel in this ring or beyond can be closer.
+			break;
+		}
+
+		V2i o;
+		for( o.y = -min( ring, radius.y ); o.y <= min( ring, radius.y ); ++o.y )
+		{
+			if( abs( o.y ) == ring )
+			{
+				for( o.x = -min( ring, radius.x ); o.x <= min( ring, radius.x ); ++o.x )
+				{
+					visit( o );
+				}
+			}
+			else if( ring <= radius.x )
+			{
+				visit( V2i( -ring, o.y ) );
+				visit( V2i( ring, o.y ) );
+			}
+		}
+	}
+
+	// One of the pixels must match the rank
+	assert( result != V2i( INT_MAX, INT_MAX ) );
+
+	return result;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// RankFilter
+//////////////////////////////////////////////////////////////////////////
+
 IE_CORE_DEFINERUNTIMETYPED( RankFilter );
 
 size_t RankFilter::g_firstPlugIndex = 0;
@@ -220,86 +611,28 @@ void RankFilter::compute( Gaffer::ValuePlug *output, const Gaffer::Context *cont
 			(Sampler::BoundingMode)boundingModePlug()->getValue()
 		);
 
+		vector<float> input;
+		sampler.sampleRegion( inputBound, input );
+
+		// To compute the pixel offset to the rank in this channel,
+		// we first compute the rank as usual
+		vector<float> values;
+		rankValues( input, radius, context, values );
+
 		V2iVectorDataPtr resultData = new V2iVectorData;
 		vector<V2i> &result = resultData->writable();
 		result.reserve( ImagePlug::tileSize() * ImagePlug::tileSize() );
 
-		vector<float> pixels( ( 1 + 2 * radius.x ) * ( 1 + 2 * radius.y ) );
-		vector<float> sortPixels( ( 1 + 2 * radius.x ) * ( 1 + 2 * radius.y ) );
-		vector<float>::iterator resultIt = sortPixels.begin() + sortPixels.size() / 2;
-
+		// Now we scan the window to find where the rank occured
+		vector<float>::const_iterator valuesIt = values.begin();
+		const int inputWidth = inputBound.size().x;
 		V2i p;
-		for( p.y = tileBound.min.y; p.y < tileBound.max.y; ++p.y )
+		for( p.y = 0; p.y < ImagePlug::tileSize(); ++p.y )
 		{
-			for( p.x = tileBound.min.x; p.x < tileBound.max.x; ++p.x )
+			IECore::Canceller::check( context->canceller() );
+			for( p.x = 0; p.x < ImagePlug::tileSize(); ++p.x )
 			{
-				IECore::Canceller::check( context->canceller() );
-
-				// Fill array with all nearby samples
-				V2i o;
-				vector<float>::iterator pixelsIt = pixels.begin();
-				for( o.y = -radius.y; o.y <= radius.y; ++o.y )
-				{
-					for( o.x = -radius.x; o.x <= radius.x; ++o.x )
-					{
-						*pixelsIt++ = sampler.sample( p.x + o.x, p.y + o.y );
-					}
-				}
-
-				switch( m_mode )
-				{
-					case MedianRank :
-						// To compute the pixel offset to the rank in this channel,
-						// we first compute the rank as usual
-						std::copy (pixels.begin(), pixels.end(), sortPixels.begin());
-						nth_element( sortPixels.begin(), resultIt, sortPixels.end() );
-						break;
-					case ErodeRank:
-						resultIt = min_element( pixels.begin(), pixels.end() );
-						break;
-					case DilateRank:
-						resultIt = max_element( pixels.begin(), pixels.end() );
-						break;
-				}
-				// Now we rescan the array to find where the rank occured
-				// In case there are multiple instances of an identical value,
-				// we take whichever one is closest to the center
-				V2i r( INT_MAX, INT_MAX );
-
-				int closestMatch = INT_MAX;
-				pixelsIt = pixels.begin();
-				for( o.y = -radius.y; o.y <= radius.y; ++o.y )
-				{
-					for( o.x = -radius.x; o.x <= radius.x; ++o.x )
-					{
-						// If we've found a pixel which matches the rank value
-						if( *pixelsIt++ == *resultIt )
-						{
-							int absX = abs( o.x );
-							int absY = abs( o.y );
-
-							// Simple heuristic for distance from the center
-							// Weight Chebyshev distance heavily, followed by Manhattan distance to resolve ties
-							// The specifics don't matter too much as long as we generally prefer points near the
-							// center in case of ties.  Chebyshev distance of N is equivalent to saying "This
-							// would be within the range of a rank filter of radius N"
-							int distance = 100 * max( absX, absY ) + absX + absY;
-
-							if( distance < closestMatch )
-							{
-								closestMatch = distance;
-
-								// Store the offset to the rank pixel
-								r = o;
-							}
-						}
-					}
-				}
-
-				// One of the pixels must match the rank
-				assert( r != V2i( INT_MAX, INT_MAX ) );
-
-				result.push_back( r );
+				result.push_back( closestOffset( input, inputWidth, p + radius, radius, *valuesIt++ ) );
 			}
 		}
 
@@ -313,6 +646,22 @@ void RankFilter::compute( Gaffer::ValuePlug *output, const Gaffer::Context *cont
 }
 
 
+void RankFilter::rankValues( const std::vector<float> &input, const Imath::V2i &radius, const Gaffer::Context *context, std::vector<float> &result ) const
+{
+	switch( m_mode )
+	{
+		case MedianRank :
+			medianFilter( input, radius, context, result );
+			break;
+		case ErodeRank :
+			extremeFilter<std::less<float>>( input, radius, context, result );
+			break;
+		case DilateRank :
+			extremeFilter<std::greater<float>>( input, radius, context, result );
+			break;
+	}
+}
+
 void RankFilter::hashChannelData( const GafferImage::ImagePlug *parent, const Gaffer::Context *context, IECore::MurmurHash &h ) const
 {
 	const V2i radius = radiusPlug()->getValue();
@@ -397,40 +746,9 @@ IECore::ConstFloatVectorDataPtr RankFilter::computeChannelData( const std::strin
 		return resultData;
 	}
 
-	vector<float> pixels( ( 1 + 2 * radius.x ) * ( 1 + 2 * radius.y ) );
-	vector<float>::iterator resultIt = pixels.begin() + pixels.size() / 2;
-
-	V2i p;
-	for( p.y = tileBound.min.y; p.y < tileBound.max.y; ++p.y )
-	{
-		for( p.x = tileBound.min.x; p.x < tileBound.max.x; ++p.x )
-		{
-			IECore::Canceller::check( context->canceller() );
-
-			V2i o;
-			vector<float>::iterator pixelsIt = pixels.begin();
-			for( o.y = -radius.y; o.y <= radius.y; ++o.y )
-			{
-				for( o.x = -radius.x; o.x <= radius.x; ++o.x )
-				{
-					*pixelsIt++ = sampler.sample( p.x + o.x, p.y + o.y );
-				}
-			}
-			switch( m_mode )
-			{
-				case MedianRank:
-					nth_element( pixels.begin(), resultIt, pixels.end() );
-					break;
-				case ErodeRank:
-					resultIt = min_element( pixels.begin(), pixels.end() );
-					break;
-				case DilateRank:
-					resultIt = max_element( pixels.begin(), pixels.end() );
-					break;
-			}
-			result.push_back( *resultIt );
-		}
-	}
+	vector<float> input;
+	sampler.sampleRegion( inputBound, input );
+	rankValues( input, radius, context, result );
 
 	return resultData;
 }
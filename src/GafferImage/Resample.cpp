@@ -45,6 +45,8 @@
 #include "OpenImageIO/filter.h"
 #include "OpenImageIO/fmath.h"
 
+#include <algorithm>
+#include <cmath>
 #include <iostream>
 
 using namespace Imath;
@@ -184,17 +186,40 @@ const OIIO::Filter2D *filterAndScale( const std::string &name, V2f ratio, V2f &i
 	return result;
 }
 
-// Precomputes all the filter weights for a whole row or column of a tile. For separable
+// The non-zero filter weights for a whole row or column of a tile. For separable
 // filters these weights can then be reused across all rows/columns in the same tile.
 /// \todo The weights computed for a particular tile could also be reused for all
 /// tiles in the same tile column or row. We could achieve this by outputting
 /// the weights on an internal plug, and using Gaffer's caching to ensure they are
-/// only computed once and then reused. At the time of writing, profiles indicate that
-/// accessing pixels via the Sampler is the main bottleneck, but once that is optimised
-/// perhaps cached filter weights could have a benefit.
-void filterWeights( const OIIO::Filter2D *filter, const float inputFilterScale, const int filterRadius, const int x, const float ratio, const float offset, Passes pass, std::vector<float> &weights )
+/// only computed once and then reused.
+struct FilterTable
 {
-	weights.reserve( ( 2 * filterRadius + 1 ) * ImagePlug::tileSize() );
+	// Offsets of input pixels relative to the start of the input
+	// buffer, and the weights to apply to them. Zero weights are
+	// omitted, so they neither cost anything nor propagate
+	// infinite values from the input.
+	std::vector<int> offsets;
+	std::vector<float> weights;
+	// The taps for output pixel `i` are stored in the range
+	// `[ begins[i], begins[i+1] )`.
+	std::vector<int> begins;
+	std::vector<float> totalWeights;
+	// True if every output pixel is the unweighted average of a
+	// contiguous range of input pixels, allowing the filter to be
+	// computed using running sums. This makes the arithmetic per
+	// output pixel independent of the filter width, although the
+	// input region fetched for each tile still grows with it.
+	bool box;
+};
+
+void filterTable( const OIIO::Filter2D *filter, const float inputFilterScale, const int filterRadius, const int x, const float ratio, const float offset, const int inputOrigin, Passes pass, FilterTable &table )
+{
+	table.offsets.reserve( ( 2 * filterRadius + 1 ) * ImagePlug::tileSize() );
+	table.weights.reserve( ( 2 * filterRadius + 1 ) * ImagePlug::tileSize() );
+	table.begins.reserve( ImagePlug::tileSize() + 1 );
+	table.totalWeights.reserve( ImagePlug::tileSize() );
+	table.begins.push_back( 0 );
+	table.box = true;
 
 	const float filterCoordinateMult = 1.0f / inputFilterScale;
 
@@ -207,13 +232,40 @@ void filterWeights( const OIIO::Filter2D *filter, const float inputFilterScale,
 		iXF = OIIO::floorfrac( iX, &iXI );
 
 		int fX; // relative filter position
+		float totalW = 0.0f;
 		for( fX = -filterRadius; fX<= filterRadius; ++fX )
 		{
 			const float f = filterCoordinateMult * (fX - ( iXF - 0.5f ) );
 			const float w = pass == Horizontal ? filter->xfilt( f ) : filter->yfilt( f );
-			weights.push_back( w );
+			if( w == 0.0f )
+			{
+				continue;
+			}
+
+			const int o = iXI + fX - inputOrigin;
+			table.box = table.box && w == 1.0f && ( (int)table.offsets.size() == table.begins.back() || table.offsets.back() == o - 1 );
+			table.offsets.push_back( o );
+			table.weights.push_back( w );
+			totalW += w;
+		}
+
+		table.begins.push_back( table.offsets.size() );
+		table.totalWeights.push_back( totalW );
+	}
+}
+
+// Running sums can't be used in the presence of infinite values,
+// because they would poison every subsequent sum.
+bool allFinite( const std::vector<float> &buffer )
+{
+	for( float v : buffer )
+	{
+		if( !std::isfinite( v ) )
+		{
+			return false;
 		}
 	}
+	return true;
 }
 
 Box2f transform( const Box2f &b, const M33f &m )
@@ -508,11 +560,12 @@ IECore::ConstFloatVectorDataPtr Resample::computeChannelData( const std::string
 	inputFilterScale *= filterScalePlug()->getValue();
 
 	const unsigned passes = requiredPasses( this, parent, filter );
+	const Box2i region = inputRegion( tileOrigin, passes, ratio, offset, filter, inputFilterScale );
 
 	Sampler sampler(
 		passes == Vertical ? horizontalPassPlug() : inPlug(),
 		channelName,
-		inputRegion( tileOrigin, passes, ratio, offset, filter, inputFilterScale ),
+		region,
 		(Sampler::BoundingMode)boundingModePlug()->getValue()
 	);
 
@@ -613,92 +666,150 @@ IECore::ConstFloatVectorDataPtr Resample::computeChannelData( const std::string
 		// it is cached for use in the vertical pass. The HorizontalPass
 		// debug mode causes this pass to be output directly for inspection.
 
+		const int regionWidth = region.size().x;
+		std::vector<float> input;
+		sampler.sampleRegion( region, input );
+
 		// Pixels in the same column share the same filter weights, so
 		// we precompute the weights now to avoid repeating work later.
-		std::vector<float> weights;
-		filterWeights( filter, inputFilterScale.x, filterRadius.x, tileBound.min.x, ratio.x, offset.x, Horizontal, weights );
-
-		V2i oP; // output pixel position
-		float iX; // input pixel x coordinate (floating point)
-		int iXI; // input pixel position (floored to int)
+		FilterTable table;
+		filterTable( filter, inputFilterScale.x, filterRadius.x, tileBound.min.x, ratio.x, offset.x, region.min.x, Horizontal, table );
 
-		for( oP.y = tileBound.min.y; oP.y < tileBound.max.y; ++oP.y )
+		if( table.box && allFinite( input ) )
 		{
-			Canceller::check( context->canceller() );
-
-			std::vector<float>::const_iterator wIt = weights.begin();
-			for( oP.x = tileBound.min.x; oP.x < tileBound.max.x; ++oP.x )
+			// The running sums are accumulated in double precision to
+			// limit the error from subtracting them, but the results
+			// may still differ slightly from direct summation.
+			std::vector<double> sums( regionWidth + 1, 0.0 );
+			for( int y = 0; y < ImagePlug::tileSize(); ++y )
 			{
+				Canceller::check( context->canceller() );
 
-				iX = ( oP.x + 0.5 ) / ratio.x + offset.x;
-				OIIO::floorfrac( iX, &iXI );
+				const float *row = input.data() + y * regionWidth;
+				for( int i = 0; i < regionWidth; ++i )
+				{
+					sums[i+1] = sums[i] + row[i];
+				}
 
-				int fX; // relative filter position
-				float v = 0.0f;
-				float totalW = 0.0f;
-				for( fX = -filterRadius.x; fX<= filterRadius.x; ++fX )
+				for( int x = 0; x < ImagePlug::tileSize(); ++x )
 				{
-					const float w = *wIt++;
-					if( w == 0.0f )
+					const int b = table.begins[x];
+					const int e = table.begins[x+1];
+					if( b != e )
 					{
-						continue;
+						*pIt = ( sums[table.offsets[e-1]+1] - sums[table.offsets[b]] ) / table.totalWeights[x];
 					}
-
-					v += w * sampler.sample( iXI + fX, oP.y );
-					totalW += w;
+					++pIt;
 				}
+			}
+		}
+		else
+		{
+			for( int y = 0; y < ImagePlug::tileSize(); ++y )
+			{
+				Canceller::check( context->canceller() );
 
-				if( totalW != 0.0f )
+				const float *row = input.data() + y * regionWidth;
+				for( int x = 0; x < ImagePlug::tileSize(); ++x )
 				{
-					*pIt = v / totalW;
-				}
+					float v = 0.0f;
+					for( int i = table.begins[x], e = table.begins[x+1]; i < e; ++i )
+					{
+						v += table.weights[i] * row[table.offsets[i]];
+					}
 
-				++pIt;
+					const float totalW = table.totalWeights[x];
+					if( totalW != 0.0f )
+					{
+						*pIt = v / totalW;
+					}
+
+					++pIt;
+				}
 			}
 		}
 	}
 	else if( passes == Vertical )
 	{
-		V2i oP; // output pixel position
-		float iY; // input pixel position (floating point)
-		int iYI; // input pixel position (floored to int)
+		const int tileSize = ImagePlug::tileSize();
+		std::vector<float> input;
+		sampler.sampleRegion( region, input );
 
 		// Pixels in the same row share the same filter weights, so
 		// we precompute the weights now to avoid repeating work later.
-		std::vector<float> weights;
-		filterWeights( filter, inputFilterScale.y, filterRadius.y, tileBound.min.y, ratio.y, offset.y, Vertical, weights );
+		FilterTable table;
+		filterTable( filter, inputFilterScale.y, filterRadius.y, tileBound.min.y, ratio.y, offset.y, region.min.y, Vertical, table );
 
-		for( oP.y = tileBound.min.y; oP.y < tileBound.max.y; ++oP.y )
+		float *result = resultData->writable().data();
+		if( table.box && allFinite( input ) )
 		{
-			Canceller::check( context->canceller() );
+			// Running sums down each column, computed a whole
+			// row at a time. As for the horizontal pass, the
+			// results may differ slightly from direct summation.
+			const int regionHeight = region.size().y;
+			std::vector<double> sums( ( regionHeight + 1 ) * tileSize, 0.0 );
+			for( int r = 0; r < regionHeight; ++r )
+			{
+				const double *previous = sums.data() + r * tileSize;
+				double *current = sums.data() + ( r + 1 ) * tileSize;
+				const float *in = input.data() + r * tileSize;
+				for( int x = 0; x < tileSize; ++x )
+				{
+					current[x] = previous[x] + in[x];
+				}
+			}
 
-			iY = ( oP.y + 0.5 ) / ratio.y + offset.y;
-			OIIO::floorfrac( iY, &iYI );
+			for( int y = 0; y < tileSize; ++y )
+			{
+				const int b = table.begins[y];
+				const int e = table.begins[y+1];
+				if( b == e )
+				{
+					continue;
+				}
 
-			for( oP.x = tileBound.min.x; oP.x < tileBound.max.x; ++oP.x )
+				const double *first = sums.data() + table.offsets[b] * tileSize;
+				const double *last = sums.data() + ( table.offsets[e-1] + 1 ) * tileSize;
+				const double totalW = table.totalWeights[y];
+				float *out = result + y * tileSize;
+				for( int x = 0; x < tileSize; ++x )
+				{
+					out[x] = ( last[x] - first[x] ) / totalW;
+				}
+			}
+		}
+		else
+		{
+			// Accumulate whole rows at a time, so that the innermost
+			// loop runs over contiguous memory in both the input and
+			// the output.
+			for( int y = 0; y < tileSize; ++y )
 			{
-				int fY; // relative filter position
-				float v = 0.0f;
-				float totalW = 0.0f;
-				std::vector<float>::const_iterator wIt = weights.begin() + ( oP.y - tileBound.min.y ) * ( filterRadius.y * 2 + 1);
-				for( fY = -filterRadius.y; fY<= filterRadius.y; ++fY )
+				Canceller::check( context->canceller() );
+
+				float *out = result + y * tileSize;
+				for( int i = table.begins[y], e = table.begins[y+1]; i < e; ++i )
 				{
-					const float w = *wIt++;
-					if( w == 0.0f )
+					const float w = table.weights[i];
+					const float *in = input.data() + table.offsets[i] * tileSize;
+					for( int x = 0; x < tileSize; ++x )
 					{
-						continue;
+						out[x] += w * in[x];
 					}
-
-					v += w * sampler.sample( oP.x, iYI + fY );
-					totalW += w;
 				}
 
+				const float totalW = table.totalWeights[y];
 				if( totalW != 0.0f )
 				{
-					*pIt = v / totalW;
+					for( int x = 0; x < tileSize; ++x )
+					{
+						out[x] /= totalW;
+					}
+				}
+				else
+				{
+					std::fill( out, out + tileSize, 0.0f );
 				}
-
-				++pIt;
 			}
 		}
 	}
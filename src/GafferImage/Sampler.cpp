@@ -101,6 +101,21 @@ Sampler::Sampler( const GafferImage::ImagePlug *plug, const std::string &channel
 	m_dataCacheRaw.resize( m_cacheWidth * cacheHeight, nullptr );
 }
 
+void Sampler::sampleRegion( const Imath::Box2i &region, std::vector<float> &buffer )
+{
+	const Context *context = Context::current();
+	buffer.resize( region.size().x * region.size().y );
+	float *b = buffer.data();
+	for( int y = region.min.y; y < region.max.y; ++y )
+	{
+		Canceller::check( context->canceller() );
+		for( int x = region.min.x; x < region.max.x; ++x )
+		{
+			*b++ = sample( x, y );
+		}
+	}
+}
+
 void Sampler::hash( IECore::MurmurHash &h ) const
 {
 	for ( int x = m_cacheWindow.min.x; x < m_cacheWindow.max.x; x += GafferImage::ImagePlug::tileSize() )
@@ -50,7 +50,7 @@ IE_CORE_DEFINERUNTIMETYPED( Unpremultiply );
 size_t Unpremultiply::g_firstPlugIndex = 0;
 
 Unpremultiply::Unpremultiply( const std::string &name )
-	:	ChannelDataProcessor( name )
+	:	ChannelDataProcessor( name, /* processLayers = */ true )
 {
 	storeIndexOfNextChild( g_firstPlugIndex );
 	addChild( new StringPlug( "alphaChannel", Gaffer::Plug::In, "A" ) );
@@ -97,9 +97,17 @@ void Unpremultiply::hashChannelData( const GafferImage::ImagePlug *output, const
 
 void Unpremultiply::processChannelData( const Gaffer::Context *context, const ImagePlug *parent, const std::string &channel, FloatVectorDataPtr outData ) const
 {
+	processLayerData( context, parent, std::vector<std::string>( 1, channel ), std::vector<FloatVectorDataPtr>( 1, outData ) );
+}
+
+void Unpremultiply::processLayerData( const Gaffer::Context *context, const ImagePlug *parent, const std::vector<std::string> &channels, const std::vector<IECore::FloatVectorDataPtr> &outData ) const
+{
+	// Processing all the channels of a layer together means that
+	// we only need to validate and fetch the alpha channel once.
+
 	std::string alphaChannel = alphaChannelPlug()->getValue();
 
-	if ( channel == alphaChannel )
+	if ( channels.size() == 1 && channels[0] == alphaChannel )
 	{
 		return;
 	}
@@ -123,14 +131,23 @@ void Unpremultiply::processChannelData( const Gaffer::Context *context, const Im
 
 	ConstFloatVectorDataPtr aData = inPlug()->channelDataPlug()->getValue();
 	const std::vector<float> &a = aData->readable();
-	std::vector<float> &out = outData->writable();
 
-	std::vector<float>::const_iterator aIt = a.begin();
-	for ( std::vector<float>::iterator outIt = out.begin(), outItEnd = out.end(); outIt != outItEnd; ++outIt, ++aIt )
+	for( size_t i = 0; i < channels.size(); ++i )
 	{
-		if ( *aIt != 0.0f )
+		if( channels[i] == alphaChannel )
+		{
+			continue;
+		}
+
+		std::vector<float> &out = outData[i]->writable();
+
+		std::vector<float>::const_iterator aIt = a.begin();
+		for ( std::vector<float>::iterator outIt = out.begin(), outItEnd = out.end(); outIt != outItEnd; ++outIt, ++aIt )
 		{
-			*outIt /= *aIt;
+			if ( *aIt != 0.0f )
+			{
+				*outIt /= *aIt;
+			}
 		}
 	}
 }
@@ -192,6 +192,7 @@ void GafferImageModule::bindCore()
 		.def( "image", &image )
 		.def( "imageHash", &imageHash )
 		.def( "tileSize", &ImagePlug::tileSize ).staticmethod( "tileSize" )
+		.def( "setTileSize", &ImagePlug::setTileSize ).staticmethod( "setTileSize" )
 		.def( "tileIndex", &ImagePlug::tileIndex ).staticmethod( "tileIndex" )
 		.def( "tileOrigin", &ImagePlug::tileOrigin ).staticmethod( "tileOrigin" )
 	;
@@ -50,7 +50,15 @@ using namespace GafferImage;
 
 void GafferImageModule::bindFilters()
 {
-	DependencyNodeClass<Blur>();
+	{
+		scope s = DependencyNodeClass<Blur>();
+
+		enum_<Blur::Mode>( "Mode" )
+			.value( "Exact", Blur::Exact )
+			.value( "Approximate", Blur::Approximate )
+		;
+	}
+
 	DependencyNodeClass<RankFilter>( nullptr, no_init );
 	DependencyNodeClass<Median>();
 	DependencyNodeClass<Dilate>();
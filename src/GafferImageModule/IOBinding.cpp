@@ -127,6 +127,28 @@ void GafferImageModule::bindIO()
 		scope s = GafferBindings::DependencyNodeClass<OpenImageIOReader>()
 			.def( "supportedExtensions", &supportedExtensions<OpenImageIOReader> )
 			.staticmethod( "supportedExtensions" )
+			.def( "getOpenFilesLimit", &OpenImageIOReader::getOpenFilesLimit )
+			.staticmethod( "getOpenFilesLimit" )
+			.def( "setOpenFilesLimit", &OpenImageIOReader::setOpenFilesLimit )
+			.staticmethod( "setOpenFilesLimit" )
+			.def( "getHandlesPerFile", &OpenImageIOReader::getHandlesPerFile )
+			.staticmethod( "getHandlesPerFile" )
+			.def( "setHandlesPerFile", &OpenImageIOReader::setHandlesPerFile )
+			.staticmethod( "setHandlesPerFile" )
+			.def( "getTileBatchSize", &OpenImageIOReader::getTileBatchSize )
+			.staticmethod( "getTileBatchSize" )
+			.def( "setTileBatchSize", &OpenImageIOReader::setTileBatchSize )
+			.staticmethod( "setTileBatchSize" )
+			.def( "openFileHandles", &OpenImageIOReader::openFileHandles )
+			.staticmethod( "openFileHandles" )
+			.def( "fileCacheEvictions", &OpenImageIOReader::fileCacheEvictions )
+			.staticmethod( "fileCacheEvictions" )
+			.def( "bytesRead", &OpenImageIOReader::bytesRead )
+			.staticmethod( "bytesRead" )
+			.def( "lockWaitTime", &OpenImageIOReader::lockWaitTime )
+			.staticmethod( "lockWaitTime" )
+			.def( "resetStatistics", &OpenImageIOReader::resetStatistics )
+			.staticmethod( "resetStatistics" )
 		;
 
 		enum_<OpenImageIOReader::MissingFrameMode>( "MissingFrameMode" )
@@ -63,6 +63,35 @@ void setExpression( Expression &e, const std::string &expression, const std::str
 	e.setExpression( expression, language );
 }
 
+list executeBatch( const Expression &e, const ValuePlug *output, object pythonContexts )
+{
+	std::vector<ConstContextPtr> contexts;
+	for( boost::python::ssize_t i = 0, l = len( pythonContexts ); i < l; ++i )
+	{
+		contexts.push_back( extract<ContextPtr>( pythonContexts[i] )() );
+	}
+
+	std::vector<IECore::ConstObjectPtr> values;
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		e.executeBatch( output, contexts, values );
+	}
+
+	list result;
+	for( std::vector<IECore::ConstObjectPtr>::const_iterator it = values.begin(), eIt = values.end(); it != eIt; ++it )
+	{
+		if( *it )
+		{
+			result.append( (*it)->copy() );
+		}
+		else
+		{
+			result.append( object() );
+		}
+	}
+	return result;
+}
+
 tuple getExpression( Expression &e )
 {
 	std::string language;
@@ -172,6 +201,49 @@ class EngineWrapper : public IECorePython::RefCountedWrapper<Expression::Engine>
 			throw IECore::Exception( "Engine::execute() python method not defined" );
 		}
 
+		void executeBatch( const std::vector<ConstContextPtr> &contexts, const std::vector<const ValuePlug *> &proxyInputs, std::vector<IECore::ConstObjectVectorPtr> &results ) const override
+		{
+			if( isSubclassed() )
+			{
+				IECorePython::ScopedGILLock gilLock;
+				try
+				{
+					object f = this->methodOverride( "executeBatch" );
+					if( f )
+					{
+						list pythonContexts;
+						for( std::vector<ConstContextPtr>::const_iterator it = contexts.begin(); it!=contexts.end(); it++ )
+						{
+							pythonContexts.append( ContextPtr( const_cast<Context *>( it->get() ) ) );
+						}
+
+						list pythonProxyInputs;
+						for( std::vector<const ValuePlug *>::const_iterator it = proxyInputs.begin(); it!=proxyInputs.end(); it++ )
+						{
+							pythonProxyInputs.append( PlugPtr( const_cast<ValuePlug *>( *it ) ) );
+						}
+
+						object pythonResults = f( pythonContexts, pythonProxyInputs );
+
+						results.clear();
+						for( boost::python::ssize_t i = 0, e = len( pythonResults ); i < e; ++i )
+						{
+							results.push_back( extract<IECore::ConstObjectVectorPtr>( pythonResults[i] ) );
+						}
+						return;
+					}
+				}
+				catch( const error_already_set &e )
+				{
+					IECorePython::ExceptionAlgo::translatePythonException();
+				}
+			}
+
+			// No batch implementation in Python, so fall back to calling
+			// execute() for each context.
+			Expression::Engine::executeBatch( contexts, proxyInputs, results );
+		}
+
 		void apply( ValuePlug *proxyOutput, const ValuePlug *topLevelProxyOutput, const IECore::Object *value ) const override
 		{
 			if( isSubclassed() )
@@ -364,6 +436,7 @@ void GafferModule::bindExpression()
 		.def( "getExpression", &getExpression )
 		.def( "expressionChangedSignal", &Expression::expressionChangedSignal, return_internal_reference<1>() )
 		.def( "identifier", &Expression::identifier )
+		.def( "executeBatch", &executeBatch )
 	;
 
 	IECorePython::RefCountedClass<Expression::Engine, IECore::RefCounted, EngineWrapper>( "Engine" )
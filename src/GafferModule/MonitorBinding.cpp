@@ -43,6 +43,7 @@
 #include "Gaffer/MonitorAlgo.h"
 #include "Gaffer/PerformanceMonitor.h"
 #include "Gaffer/Plug.h"
+#include "Gaffer/TraceMonitor.h"
 #include "Gaffer/VTuneMonitor.h"
 
 #include "IECorePython/ScopedGILRelease.h"
@@ -71,11 +72,21 @@ void exitScope( Monitor &m, object type, object value, object traceBack )
 std::string repr( PerformanceMonitor::Statistics &s )
 {
 	return boost::str(
-		boost::format( "Gaffer.PerformanceMonitor.Statistics( hashCount = %d, computeCount = %d, hashDuration = %d, computeDuration = %d )" )
+		boost::format(
+			"Gaffer.PerformanceMonitor.Statistics( hashCount = %d, computeCount = %d, hashDuration = %d, computeDuration = %d, "
+			"cacheHitCount = %d, cacheMissCount = %d, cacheBytesInserted = %d, cacheEvictionCount = %d, "
+			"duplicateComputeCount = %d, duplicateComputeDuration = %d )"
+		)
 			% s.hashCount
 			% s.computeCount
 			% s.hashDuration.count()
 			% s.computeDuration.count()
+			% s.cacheHitCount
+			% s.cacheMissCount
+			% s.cacheBytesInserted
+			% s.cacheEvictionCount
+			% s.duplicateComputeCount
+			% s.duplicateComputeDuration.count()
 	);
 }
 
@@ -83,10 +94,20 @@ PerformanceMonitor::Statistics *statisticsConstructor(
 	size_t hashCount,
 	size_t computeCount,
 	boost::chrono::nanoseconds::rep hashDuration,
-	boost::chrono::nanoseconds::rep computeDuration
+	boost::chrono::nanoseconds::rep computeDuration,
+	size_t cacheHitCount,
+	size_t cacheMissCount,
+	size_t cacheBytesInserted,
+	size_t cacheEvictionCount,
+	size_t duplicateComputeCount,
+	boost::chrono::nanoseconds::rep duplicateComputeDuration
 )
 {
-	return new PerformanceMonitor::Statistics( hashCount, computeCount, boost::chrono::nanoseconds( hashDuration ), boost::chrono::nanoseconds( computeDuration ) );
+	return new PerformanceMonitor::Statistics(
+		hashCount, computeCount, boost::chrono::nanoseconds( hashDuration ), boost::chrono::nanoseconds( computeDuration ),
+		cacheHitCount, cacheMissCount, cacheBytesInserted, cacheEvictionCount,
+		duplicateComputeCount, boost::chrono::nanoseconds( duplicateComputeDuration )
+	);
 }
 
 boost::chrono::nanoseconds::rep getHashDuration( PerformanceMonitor::Statistics &s )
@@ -109,6 +130,16 @@ void setComputeDuration( PerformanceMonitor::Statistics &s, boost::chrono::nanos
 	s.computeDuration = boost::chrono::nanoseconds( v );
 }
 
+boost::chrono::nanoseconds::rep getDuplicateComputeDuration( PerformanceMonitor::Statistics &s )
+{
+	return s.duplicateComputeDuration.count();
+}
+
+void setDuplicateComputeDuration( PerformanceMonitor::Statistics &s, boost::chrono::nanoseconds::rep v )
+{
+	s.duplicateComputeDuration = boost::chrono::nanoseconds( v );
+}
+
 template<typename T>
 dict allStatistics( T &m )
 {
@@ -121,6 +152,12 @@ dict allStatistics( T &m )
 	return result;
 }
 
+void writeTrace( const TraceMonitor &m, const std::string &fileName )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeTrace( fileName );
+}
+
 list contextMonitorVariableNames( const ContextMonitor::Statistics &s )
 {
 	std::vector<IECore::InternedString> names = s.variableNames();
@@ -152,6 +189,12 @@ void GafferModule::bindMonitor()
 			.value( "HashCount", HashCount )
 			.value( "ComputeCount", ComputeCount )
 			.value( "HashesPerCompute", HashesPerCompute )
+			.value( "CacheHitCount", CacheHitCount )
+			.value( "CacheMissCount", CacheMissCount )
+			.value( "CacheBytesInserted", CacheBytesInserted )
+			.value( "CacheEvictionCount", CacheEvictionCount )
+			.value( "DuplicateComputeCount", DuplicateComputeCount )
+			.value( "DuplicateComputeDuration", DuplicateComputeDuration )
 		;
 
 		def(
@@ -194,7 +237,13 @@ void GafferModule::bindMonitor()
 						arg( "hashCount" ) = 0,
 						arg( "computeCount" ) = 0,
 						arg( "hashDuration" ) = 0,
-						arg( "computeDuration" ) = 0
+						arg( "computeDuration" ) = 0,
+						arg( "cacheHitCount" ) = 0,
+						arg( "cacheMissCount" ) = 0,
+						arg( "cacheBytesInserted" ) = 0,
+						arg( "cacheEvictionCount" ) = 0,
+						arg( "duplicateComputeCount" ) = 0,
+						arg( "duplicateComputeDuration" ) = 0
 					)
 				)
 			)
@@ -202,6 +251,12 @@ void GafferModule::bindMonitor()
 			.def_readwrite( "computeCount", &PerformanceMonitor::Statistics::computeCount )
 			.add_property( "hashDuration", &getHashDuration, &setHashDuration )
 			.add_property( "computeDuration", &getComputeDuration, &setComputeDuration )
+			.def_readwrite( "cacheHitCount", &PerformanceMonitor::Statistics::cacheHitCount )
+			.def_readwrite( "cacheMissCount", &PerformanceMonitor::Statistics::cacheMissCount )
+			.def_readwrite( "cacheBytesInserted", &PerformanceMonitor::Statistics::cacheBytesInserted )
+			.def_readwrite( "cacheEvictionCount", &PerformanceMonitor::Statistics::cacheEvictionCount )
+			.def_readwrite( "duplicateComputeCount", &PerformanceMonitor::Statistics::duplicateComputeCount )
+			.add_property( "duplicateComputeDuration", &getDuplicateComputeDuration, &setDuplicateComputeDuration )
 			.def( self == self )
 			.def( self != self )
 			.def( "__repr__", &repr )
@@ -225,6 +280,11 @@ void GafferModule::bindMonitor()
 		;
 	}
 
+	class_<TraceMonitor, bases<Monitor>, boost::noncopyable>( "TraceMonitor" )
+		.def( "writeTrace", &writeTrace )
+		.def( "clear", &TraceMonitor::clear )
+	;
+
 #ifdef GAFFER_VTUNE
 	{
 		scope s = class_<VTuneMonitor, bases<Monitor>, boost::noncopyable>( "VTuneMonitor" )
@@ -104,6 +104,7 @@ void GafferModule::bindPlug()
 			.value( "AcceptsInputs", Plug::AcceptsInputs )
 			.value( "Cacheable", Plug::Cacheable )
 			.value( "AcceptsDependencyCycles", Plug::AcceptsDependencyCycles )
+			.value( "DiskCacheable", Plug::DiskCacheable )
 			.value( "Default", Plug::Default )
 			.value( "All", Plug::All )
 		;
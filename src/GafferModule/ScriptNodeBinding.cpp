@@ -54,12 +54,18 @@
 #include "IECorePython/ScopedGILRelease.h"
 
 #include "IECore/MessageHandler.h"
+#include "IECore/MurmurHash.h"
 
 #include "boost/algorithm/string/replace.hpp"
+#include "boost/filesystem.hpp"
 #include "boost/lexical_cast.hpp"
 #include "boost/regex.hpp"
 
+#include <chrono>
+#include <fstream>
+#include <map>
 #include <memory>
+#include <sstream>
 
 using namespace Gaffer;
 using namespace GafferBindings;
@@ -73,21 +79,9 @@ extern "C"
 // essential to include this last, since it defines macros which
 // clash with other headers.
 #include "Python-ast.h"
+#include "marshal.h"
 };
 
-namespace boost {
-namespace python {
-
-// Specialisation to allow use of handle<PyCodeObject>
-template<>
-struct base_type_traits<PyCodeObject>
-{
-	typedef PyObject type;
-};
-
-} // namespace python
-} // namespace boost
-
 //////////////////////////////////////////////////////////////////////////
 // Serialisation
 //////////////////////////////////////////////////////////////////////////
@@ -105,10 +99,18 @@ const std::string formattedErrorContext( int lineNumber, const std::string &cont
 	);
 }
 
-// Execute the script one top level statement at a time,
-// reporting errors that occur, but otherwise continuing
-// with execution.
-bool tolerantExec( const char *pythonScript, boost::python::object globals, boost::python::object locals, const std::string &context )
+// Compiles the whole script into a single code object.
+boost::python::object compileScript( const char *pythonScript )
+{
+	return boost::python::object( boost::python::handle<>(
+		Py_CompileString( pythonScript, "<string>", Py_file_input )
+	) );
+}
+
+// Compiles each top level statement of the script separately,
+// returning a tuple of code objects. This allows tolerantExec()
+// to continue with subsequent statements when one fails.
+boost::python::object compileStatements( const char *pythonScript )
 {
 	// The python parsing framework uses an arena to simplify memory allocation,
 	// which is handy for us, since we're going to manipulate the AST a little.
@@ -126,17 +128,14 @@ bool tolerantExec( const char *pythonScript, boost::python::object globals, boos
 
 	if( !mod )
 	{
-		int lineNumber = 0;
-		std::string message = IECorePython::ExceptionAlgo::formatPythonException( /* withTraceback = */ false, &lineNumber );
-		IECore::msg( IECore::Msg::Error, formattedErrorContext( lineNumber, context ), message );
-		return false;
+		boost::python::throw_error_already_set();
 	}
 
 	assert( mod->kind == Module_kind );
 
 	// Loop over the top-level statements in the module body,
-	// executing one at a time.
-	bool result = false;
+	// compiling one at a time.
+	boost::python::list result;
 	int numStatements = asdl_seq_LEN( mod->v.Module.body );
 	for( int i=0; i<numStatements; ++i )
 	{
@@ -149,12 +148,312 @@ bool tolerantExec( const char *pythonScript, boost::python::object globals, boos
 		);
 
 		// Compile it.
-		boost::python::handle<PyCodeObject> code( PyAST_Compile( newModule, "<string>", nullptr, arena.get() ) );
+		result.append( boost::python::object( boost::python::handle<>(
+			(PyObject *)PyAST_Compile( newModule, "<string>", nullptr, arena.get() )
+		) ) );
+	}
+
+	return boost::python::tuple( result );
+}
+
+std::string replaceImath( const std::string &serialisation )
+{
+	// Figure out the version of Gaffer which serialised the file.
+
+	int milestoneVersion = 0;
+	int majorVersion = 0;
+	boost::regex milestoneVersionRegex( R"(Gaffer\.Metadata\.registerNodeValue\( parent, "serialiser:milestoneVersion", ([0-9]+), )" );
+	boost::regex majorVersionRegex( R"(Gaffer\.Metadata\.registerNodeValue\( parent, "serialiser:majorVersion", ([0-9]+), )" );
+	boost::match_results<const char *> matchResults;
+	if( regex_search( serialisation.c_str(), matchResults, milestoneVersionRegex ) )
+	{
+		milestoneVersion = boost::lexical_cast<int>( matchResults.str( 1 ) );
+	}
+	if( regex_search( serialisation.c_str(), matchResults, majorVersionRegex ) )
+	{
+		majorVersion = boost::lexical_cast<int>( matchResults.str( 1 ) );
+	}
+
+	// If it's from a version which used the imath bindings
+	// then we have no work to do.
+
+	if( milestoneVersion > 0 || majorVersion >= 42 )
+	{
+		return serialisation;
+	}
+
+	// Otherwise we need to replace all references to imath
+	// types to use the imath module rather than IECore.
+
+	std::string result = serialisation;
+	for(
+		const auto &x : {
+			"V2i", "V2f", "V2d",
+			"V3i", "V3f", "V3d",
+			"Color3f", "Color4f",
+			"Box2i", "Box2f", "Box2d",
+			"Box3i", "Box3f", "Box3d",
+			"M33f", "M33d",
+			"M44f", "M44d",
+			"Eulerf", "Eulerd",
+			"Plane3f", "Plane3d",
+			"Quatf", "Quatd"
+		}
+	)
+	{
+		boost::replace_all( result, std::string( "IECore." ) + x + "(", std::string( "imath." ) + x + "(" );
+		boost::replace_all( result, std::string( "IECore." ) + x + ".", std::string( "imath." ) + x + "." );
+	}
+
+	return result;
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Code cache
+//////////////////////////////////////////////////////////////////////////
+
+// Compiling the serialisations of large scripts and references accounts for
+// a significant fraction of their load time. We therefore cache the compiled
+// code, keyed by a hash of the serialisation itself, so that the cache is
+// reused automatically as long as the file is unchanged. This also means that
+// a script containing many References to the same file only translates and
+// compiles that file once. Compiled code is held in memory for the lifetime
+// of the process, and can also be stored on disk, in the manner of Python's
+// __pycache__, so that it can be reused by subsequent processes. All methods
+// must be called with the GIL held.
+class CodeCache : boost::noncopyable
+{
+
+	public :
+
+		CodeCache()
+			:	m_hits( 0 ), m_misses( 0 ), m_compileTime( 0 )
+		{
+		}
+
+		void setDirectory( const std::string &directory )
+		{
+			m_directory = directory;
+		}
+
+		const std::string &getDirectory() const
+		{
+			return m_directory;
+		}
+
+		// Returns the code compiled by `compileScript()` or `compileStatements()`,
+		// as specified by `statements`, after applying `replaceImath()` to the
+		// source. Throws `error_already_set` if the source can't be compiled.
+		boost::python::object get( const std::string &source, bool statements, bool &hit )
+		{
+			IECore::MurmurHash h;
+			h.append( source );
+			h.append( statements );
+			h.append( (uint64_t)PyImport_GetMagicNumber() );
+
+			MemoryCache::const_iterator it = m_memoryCache.find( h );
+			if( it != m_memoryCache.end() )
+			{
+				m_hits++;
+				hit = true;
+				return it->second;
+			}
+
+			boost::python::object result = load( h, statements );
+			hit = !result.is_none();
+			if( hit )
+			{
+				m_hits++;
+			}
+			else
+			{
+				m_misses++;
+				const std::chrono::steady_clock::time_point t = std::chrono::steady_clock::now();
+				const std::string toCompile = replaceImath( source );
+				result = statements ? compileStatements( toCompile.c_str() ) : compileScript( toCompile.c_str() );
+				m_compileTime += std::chrono::duration<double>( std::chrono::steady_clock::now() - t ).count();
+				save( h, result );
+			}
+
+			if( m_memoryCache.size() >= g_maxMemoryEntries )
+			{
+				m_memoryCache.clear();
+			}
+			m_memoryCache[h] = result;
+
+			return result;
+		}
+
+		void clear()
+		{
+			m_memoryCache.clear();
+		}
+
+		size_t hits() const
+		{
+			return m_hits;
+		}
+
+		size_t misses() const
+		{
+			return m_misses;
+		}
+
+		double compileTime() const
+		{
+			return m_compileTime;
+		}
+
+		void resetStatistics()
+		{
+			m_hits = m_misses = 0;
+			m_compileTime = 0;
+		}
+
+	private :
+
+		std::string fileName( const IECore::MurmurHash &h ) const
+		{
+			const std::string s = h.toString();
+			return m_directory + "/" + s.substr( 0, 2 ) + "/" + s + ".gfrc";
+		}
+
+		// Returns None if the code isn't in the cache.
+		boost::python::object load( const IECore::MurmurHash &h, bool statements ) const
+		{
+			if( m_directory.empty() )
+			{
+				return boost::python::object();
+			}
+
+			std::ifstream f( fileName( h ).c_str(), std::ios::in | std::ios::binary );
+			if( !f.good() )
+			{
+				return boost::python::object();
+			}
+
+			std::stringstream buffer;
+			buffer << f.rdbuf();
+			std::string data = buffer.str();
+
+			PyObject *o = PyMarshal_ReadObjectFromString( &data[0], data.size() );
+			if( !o )
+			{
+				// Corrupt or truncated file. We'll just
+				// compile again and overwrite it.
+				PyErr_Clear();
+				return boost::python::object();
+			}
 
-		// And execute it.
+			boost::python::object result( ( boost::python::handle<>( o ) ) );
+			if( statements ? !PyTuple_Check( o ) : !PyCode_Check( o ) )
+			{
+				return boost::python::object();
+			}
+
+			return result;
+		}
+
+		void save( const IECore::MurmurHash &h, const boost::python::object &code ) const
+		{
+			if( m_directory.empty() )
+			{
+				return;
+			}
+
+			PyObject *marshalled = PyMarshal_WriteObjectToString( code.ptr(), Py_MARSHAL_VERSION );
+			if( !marshalled )
+			{
+				PyErr_Clear();
+				return;
+			}
+			boost::python::handle<> marshalledHandle( marshalled );
+
+			try
+			{
+				// Write to a temporary file and then rename, so that
+				// other processes never see a partially written file.
+				const boost::filesystem::path path( fileName( h ) );
+				boost::filesystem::create_directories( path.parent_path() );
+				const boost::filesystem::path tempPath = path.parent_path() / boost::filesystem::unique_path( "%%%%-%%%%-%%%%-%%%%.tmp" );
+				{
+					std::ofstream f( tempPath.c_str(), std::ios::out | std::ios::binary );
+					f.write( PyString_AsString( marshalled ), PyString_Size( marshalled ) );
+					if( !f.good() )
+					{
+						throw IECore::Exception( "Unable to write \"" + tempPath.string() + "\"" );
+					}
+				}
+				boost::filesystem::rename( tempPath, path );
+			}
+			catch( const std::exception &e )
+			{
+				IECore::msg( IECore::Msg::Warning, "ScriptNode code cache", e.what() );
+			}
+		}
+
+		static const size_t g_maxMemoryEntries = 100;
+
+		typedef std::map<IECore::MurmurHash, boost::python::object> MemoryCache;
+		MemoryCache m_memoryCache;
+		std::string m_directory;
+
+		size_t m_hits;
+		size_t m_misses;
+		double m_compileTime;
+
+};
+
+CodeCache &codeCache()
+{
+	// Deliberately leaked, since it holds Python objects which
+	// can't be destroyed after Python has been shut down.
+	static CodeCache *c = new CodeCache;
+	return *c;
+}
+
+// Gets the compiled code for a script, translated by `replaceImath()`
+// where necessary, using the cache when the
+// script is being loaded from a file (as identified by a non-empty
+// context). Scripts executed from strings are typically unique
+// (pasting, for instance), so aren't worth caching.
+boost::python::object compile( const std::string &pythonScript, bool statements, const std::string &context, bool &cached )
+{
+	if( context.empty() )
+	{
+		cached = false;
+		const std::string toCompile = replaceImath( pythonScript );
+		return statements ? compileStatements( toCompile.c_str() ) : compileScript( toCompile.c_str() );
+	}
+	return codeCache().get( pythonScript, statements, cached );
+}
+
+// Execute the script one top level statement at a time,
+// reporting errors that occur, but otherwise continuing
+// with execution.
+bool tolerantExec( const std::string &pythonScript, boost::python::object globals, boost::python::object locals, const std::string &context, bool &cached )
+{
+	boost::python::object statements;
+	try
+	{
+		statements = compile( pythonScript, /* statements = */ true, context, cached );
+	}
+	catch( boost::python::error_already_set &e )
+	{
+		int lineNumber = 0;
+		std::string message = IECorePython::ExceptionAlgo::formatPythonException( /* withTraceback = */ false, &lineNumber );
+		IECore::msg( IECore::Msg::Error, formattedErrorContext( lineNumber, context ), message );
+		return false;
+	}
+
+	// Loop over the statements, executing one at a time.
+	bool result = false;
+	const Py_ssize_t numStatements = PyTuple_GET_SIZE( statements.ptr() );
+	for( Py_ssize_t i=0; i<numStatements; ++i )
+	{
 		boost::python::handle<> v( boost::python::allow_null(
 			PyEval_EvalCode(
-				code.get(),
+				(PyCodeObject *)PyTuple_GET_ITEM( statements.ptr(), i ),
 				globals.ptr(),
 				locals.ptr()
 			)
@@ -218,58 +517,6 @@ std::string serialise( const Node *parent, const Set *filter )
 	return result;
 }
 
-std::string replaceImath( const std::string &serialisation )
-{
-	// Figure out the version of Gaffer which serialised the file.
-
-	int milestoneVersion = 0;
-	int majorVersion = 0;
-	boost::regex milestoneVersionRegex( R"(Gaffer\.Metadata\.registerNodeValue\( parent, "serialiser:milestoneVersion", ([0-9]+), )" );
-	boost::regex majorVersionRegex( R"(Gaffer\.Metadata\.registerNodeValue\( parent, "serialiser:majorVersion", ([0-9]+), )" );
-	boost::match_results<const char *> matchResults;
-	if( regex_search( serialisation.c_str(), matchResults, milestoneVersionRegex ) )
-	{
-		milestoneVersion = boost::lexical_cast<int>( matchResults.str( 1 ) );
-	}
-	if( regex_search( serialisation.c_str(), matchResults, majorVersionRegex ) )
-	{
-		majorVersion = boost::lexical_cast<int>( matchResults.str( 1 ) );
-	}
-
-	// If it's from a version which used the imath bindings
-	// then we have no work to do.
-
-	if( milestoneVersion > 0 || majorVersion >= 42 )
-	{
-		return serialisation;
-	}
-
-	// Otherwise we need to replace all references to imath
-	// types to use the imath module rather than IECore.
-
-	std::string result = serialisation;
-	for(
-		const auto &x : {
-			"V2i", "V2f", "V2d",
-			"V3i", "V3f", "V3d",
-			"Color3f", "Color4f",
-			"Box2i", "Box2f", "Box2d",
-			"Box3i", "Box3f", "Box3d",
-			"M33f", "M33d",
-			"M44f", "M44d",
-			"Eulerf", "Eulerd",
-			"Plane3f", "Plane3d",
-			"Quatf", "Quatd"
-		}
-	)
-	{
-		boost::replace_all( result, std::string( "IECore." ) + x + "(", std::string( "imath." ) + x + "(" );
-		boost::replace_all( result, std::string( "IECore." ) + x + ".", std::string( "imath." ) + x + "." );
-	}
-
-	return result;
-}
-
 bool execute( ScriptNode *script, const std::string &serialisation, Node *parent, bool continueOnError, const std::string &context = "" )
 {
 	if( !Py_IsInitialized() )
@@ -277,9 +524,8 @@ bool execute( ScriptNode *script, const std::string &serialisation, Node *parent
 		Py_Initialize();
 	}
 
-	const std::string toExecute = replaceImath( serialisation );
-
 	IECorePython::ScopedGILLock gilLock;
+	bool cached = false;
 	bool result = false;
 	try
 	{
@@ -289,7 +535,8 @@ bool execute( ScriptNode *script, const std::string &serialisation, Node *parent
 		{
 			try
 			{
-				exec( toExecute.c_str(), e, e );
+				boost::python::object code = compile( serialisation, /* statements = */ false, context, cached );
+				boost::python::handle<> v( PyEval_EvalCode( (PyCodeObject *)code.ptr(), e.ptr(), e.ptr() ) );
 			}
 			catch( boost::python::error_already_set &e )
 			{
@@ -300,7 +547,7 @@ bool execute( ScriptNode *script, const std::string &serialisation, Node *parent
 		}
 		else
 		{
-			result = tolerantExec( toExecute.c_str(), e, e, context );
+			result = tolerantExec( serialisation, e, e, context, cached );
 		}
 	}
 	catch( boost::python::error_already_set &e )
@@ -402,6 +649,52 @@ void save( ScriptNode &s )
 	s.save();
 }
 
+void setCodeCacheDirectory( const std::string &directory )
+{
+	codeCache().setDirectory( directory );
+}
+
+std::string getCodeCacheDirectory()
+{
+	return codeCache().getDirectory();
+}
+
+void clearCodeCache()
+{
+	codeCache().clear();
+}
+
+size_t codeCacheHits()
+{
+	return codeCache().hits();
+}
+
+size_t codeCacheMisses()
+{
+	return codeCache().misses();
+}
+
+double codeCacheCompileTime()
+{
+	return codeCache().compileTime();
+}
+
+void resetCodeCacheStatistics()
+{
+	codeCache().resetStatistics();
+}
+
+boost::python::dict loadStatistics()
+{
+	boost::python::dict result;
+	const ScriptNode::LoadStatisticsMap statistics = ScriptNode::loadStatistics();
+	for( const auto &s : statistics )
+	{
+		result[s.first] = s.second;
+	}
+	return result;
+}
+
 struct ActionSlotCaller
 {
 
@@ -484,6 +777,34 @@ void GafferModule::bindScriptNode()
 		.def( "load", &ScriptNode::load, ( boost::python::arg( "continueOnError" ) = false ) )
 		.def( "importFile", &ScriptNode::importFile, ( boost::python::arg( "fileName" ), boost::python::arg( "parent" ) = boost::python::object(), boost::python::arg( "continueOnError" ) = false ) )
 		.def( "context", &context )
+		.def( "setCodeCacheDirectory", &setCodeCacheDirectory )
+		.staticmethod( "setCodeCacheDirectory" )
+		.def( "getCodeCacheDirectory", &getCodeCacheDirectory )
+		.staticmethod( "getCodeCacheDirectory" )
+		.def( "clearCodeCache", &clearCodeCache )
+		.staticmethod( "clearCodeCache" )
+		.def( "codeCacheHits", &codeCacheHits )
+		.staticmethod( "codeCacheHits" )
+		.def( "codeCacheMisses", &codeCacheMisses )
+		.staticmethod( "codeCacheMisses" )
+		.def( "codeCacheCompileTime", &codeCacheCompileTime )
+		.staticmethod( "codeCacheCompileTime" )
+		.def( "resetCodeCacheStatistics", &resetCodeCacheStatistics )
+		.staticmethod( "resetCodeCacheStatistics" )
+		.def( "setParallelLoading", &ScriptNode::setParallelLoading )
+		.staticmethod( "setParallelLoading" )
+		.def( "getParallelLoading", &ScriptNode::getParallelLoading )
+		.staticmethod( "getParallelLoading" )
+		.def( "loadStatistics", &loadStatistics )
+		.staticmethod( "loadStatistics" )
+		.def( "resetLoadStatistics", &ScriptNode::resetLoadStatistics )
+		.staticmethod( "resetLoadStatistics" )
+	;
+
+	boost::python::class_<ScriptNode::LoadStatistics>( "LoadStatistics" )
+		.def_readonly( "loads", &ScriptNode::LoadStatistics::loads )
+		.def_readonly( "readTime", &ScriptNode::LoadStatistics::readTime )
+		.def_readonly( "totalTime", &ScriptNode::LoadStatistics::totalTime )
 	;
 
 	SignalClass<ScriptNode::ActionSignal, DefaultSignalCaller<ScriptNode::ActionSignal>, ActionSlotCaller>( "ActionSignal" );
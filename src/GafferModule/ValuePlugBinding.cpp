@@ -90,6 +90,42 @@ void GafferModule::bindValuePlug()
 		.staticmethod( "cacheMemoryUsage" )
 		.def( "clearCache", &ValuePlug::clearCache )
 		.staticmethod( "clearCache" )
+		.def( "getHashCacheSizeLimit", &ValuePlug::getHashCacheSizeLimit )
+		.staticmethod( "getHashCacheSizeLimit" )
+		.def( "setHashCacheSizeLimit", &ValuePlug::setHashCacheSizeLimit )
+		.staticmethod( "setHashCacheSizeLimit" )
+		.def( "clearHashCache", &ValuePlug::clearHashCache )
+		.staticmethod( "clearHashCache" )
+		.def( "hashCacheHits", &ValuePlug::hashCacheHits )
+		.staticmethod( "hashCacheHits" )
+		.def( "hashCacheMisses", &ValuePlug::hashCacheMisses )
+		.staticmethod( "hashCacheMisses" )
+		.def( "resetHashCacheStatistics", &ValuePlug::resetHashCacheStatistics )
+		.staticmethod( "resetHashCacheStatistics" )
+		.def( "setDiskCacheDirectory", &ValuePlug::setDiskCacheDirectory )
+		.staticmethod( "setDiskCacheDirectory" )
+		.def( "getDiskCacheDirectory", &ValuePlug::getDiskCacheDirectory )
+		.staticmethod( "getDiskCacheDirectory" )
+		.def( "getDiskCacheSizeLimit", &ValuePlug::getDiskCacheSizeLimit )
+		.staticmethod( "getDiskCacheSizeLimit" )
+		.def( "setDiskCacheSizeLimit", &ValuePlug::setDiskCacheSizeLimit )
+		.staticmethod( "setDiskCacheSizeLimit" )
+		.def( "clearDiskCache", &ValuePlug::clearDiskCache )
+		.staticmethod( "clearDiskCache" )
+		.def( "diskCacheHits", &ValuePlug::diskCacheHits )
+		.staticmethod( "diskCacheHits" )
+		.def( "diskCacheMisses", &ValuePlug::diskCacheMisses )
+		.staticmethod( "diskCacheMisses" )
+		.def( "diskCacheWrites", &ValuePlug::diskCacheWrites )
+		.staticmethod( "diskCacheWrites" )
+		.def( "diskCacheEvictions", &ValuePlug::diskCacheEvictions )
+		.staticmethod( "diskCacheEvictions" )
+		.def( "resetDiskCacheStatistics", &ValuePlug::resetDiskCacheStatistics )
+		.staticmethod( "resetDiskCacheStatistics" )
+		.def( "markHashUnstable", &ValuePlug::markHashUnstable )
+		.staticmethod( "markHashUnstable" )
+		.def( "hashFileModificationTime", &ValuePlug::hashFileModificationTime )
+		.staticmethod( "hashFileModificationTime" )
 		.def( "__repr__", &repr )
 	;
 
@@ -319,63 +319,37 @@ class OSLExpressionEngine : public Gaffer::Expression::Engine
 		{
 			ShadingSystem *s = shadingSystem();
 			OSL::ShadingContext *shadingContext = s->get_context();
+			IECore::ConstObjectVectorPtr result = executeInternal( s, shadingContext, context, proxyInputs );
+			s->release_context( shadingContext );
+			return result;
+		}
 
-		    OSL::ShaderGlobals shaderGlobals;
-			memset( &shaderGlobals, 0, sizeof( ShaderGlobals ) );
-
-			shaderGlobals.time = context->getTime();
-
-			RenderState renderState;
-			renderState.inParameters = &m_inParameters;
-			renderState.context = context;
-			renderState.inPlugs = &proxyInputs;
-			shaderGlobals.renderstate = &renderState;
-
-			s->execute( shadingContext, *m_shaderGroup, shaderGlobals );
-
-			ObjectVectorPtr result = new ObjectVector;
-			result->members().reserve( m_outSymbols.size() );
+		void executeBatch( const std::vector<Gaffer::ConstContextPtr> &contexts, const std::vector<const Gaffer::ValuePlug *> &proxyInputs, std::vector<IECore::ConstObjectVectorPtr> &results ) const override
+		{
+			// Acquire a single shading context and reuse
+			// it for the whole batch.
+			ShadingSystem *s = shadingSystem();
+			OSL::ShadingContext *shadingContext = s->get_context();
 
-			for( vector<const OSL::ShaderSymbol *>::const_iterator it = m_outSymbols.begin(), eIt = m_outSymbols.end(); it != eIt; ++it )
+			results.clear();
+			results.reserve( contexts.size() );
+			try
 			{
-				const TypeDesc type = s->symbol_typedesc( *it );
-				const void *storage = s->symbol_address( *shadingContext, *it );
-				if( type == TypeDesc::TypeFloat )
+				for( std::vector<Gaffer::ConstContextPtr>::const_iterator it = contexts.begin(), eIt = contexts.end(); it != eIt; ++it )
 				{
-					result->members().push_back( new FloatData( *(const float *)storage ) );
-				}
-				else if( type == TypeDesc::TypeInt )
-				{
-					result->members().push_back( new IntData( *(const int *)storage ) );
-				}
-				else if( type == TypeDesc::TypeColor )
-				{
-					const float *f = (const float *)storage;
-					result->members().push_back( new Color3fData( Color3f( f[0], f[1], f[2] ) ) );
-				}
-				else if( type == TypeDesc::TypeVector )
-				{
-					const float *f = (const float *)storage;
-					result->members().push_back( new V3fData( V3f( f[0], f[1], f[2] ) ) );
-				}
-				else if( type == TypeDesc::TypeMatrix )
-				{
-					const float *f = (const float *)storage;
-					result->members().push_back( new M44fData( M44f(
-						f[0],  f[1],  f[2],  f[3],
-						f[4],  f[5],  f[6],  f[7],
-						f[8],  f[9],  f[10], f[11],
-						f[12], f[13], f[14], f[15]
-					) ) );
-				}
-				else if( type == TypeDesc::TypeString )
-				{
-					result->members().push_back( new StringData( *(const char **)storage ) );
+					// The values of the input plugs are queried during
+					// execution, so their context must be current.
+					Context::Scope scope( it->get() );
+					results.push_back( executeInternal( s, shadingContext, it->get(), proxyInputs ) );
 				}
 			}
+			catch( ... )
+			{
+				s->release_context( shadingContext );
+				throw;
+			}
 
 			s->release_context( shadingContext );
-			return result;
 		}
 
 		void apply( Gaffer::ValuePlug *proxyOutput, const Gaffer::ValuePlug *topLevelProxyOutput, const IECore::Object *value ) const override
@@ -556,6 +530,65 @@ class OSLExpressionEngine : public Gaffer::Expression::Engine
 
 	private :
 
+		IECore::ConstObjectVectorPtr executeInternal( ShadingSystem *s, OSL::ShadingContext *shadingContext, const Gaffer::Context *context, const std::vector<const Gaffer::ValuePlug *> &proxyInputs ) const
+		{
+			OSL::ShaderGlobals shaderGlobals;
+			memset( &shaderGlobals, 0, sizeof( ShaderGlobals ) );
+
+			shaderGlobals.time = context->getTime();
+
+			RenderState renderState;
+			renderState.inParameters = &m_inParameters;
+			renderState.context = context;
+			renderState.inPlugs = &proxyInputs;
+			shaderGlobals.renderstate = &renderState;
+
+			s->execute( shadingContext, *m_shaderGroup, shaderGlobals );
+
+			ObjectVectorPtr result = new ObjectVector;
+			result->members().reserve( m_outSymbols.size() );
+
+			for( vector<const OSL::ShaderSymbol *>::const_iterator it = m_outSymbols.begin(), eIt = m_outSymbols.end(); it != eIt; ++it )
+			{
+				const TypeDesc type = s->symbol_typedesc( *it );
+				const void *storage = s->symbol_address( *shadingContext, *it );
+				if( type == TypeDesc::TypeFloat )
+				{
+					result->members().push_back( new FloatData( *(const float *)storage ) );
+				}
+				else if( type == TypeDesc::TypeInt )
+				{
+					result->members().push_back( new IntData( *(const int *)storage ) );
+				}
+				else if( type == TypeDesc::TypeColor )
+				{
+					const float *f = (const float *)storage;
+					result->members().push_back( new Color3fData( Color3f( f[0], f[1], f[2] ) ) );
+				}
+				else if( type == TypeDesc::TypeVector )
+				{
+					const float *f = (const float *)storage;
+					result->members().push_back( new V3fData( V3f( f[0], f[1], f[2] ) ) );
+				}
+				else if( type == TypeDesc::TypeMatrix )
+				{
+					const float *f = (const float *)storage;
+					result->members().push_back( new M44fData( M44f(
+						f[0],  f[1],  f[2],  f[3],
+						f[4],  f[5],  f[6],  f[7],
+						f[8],  f[9],  f[10], f[11],
+						f[12], f[13], f[14], f[15]
+					) ) );
+				}
+				else if( type == TypeDesc::TypeString )
+				{
+					result->members().push_back( new StringData( *(const char **)storage ) );
+				}
+			}
+
+			return result;
+		}
+
 		static EngineDescription<OSLExpressionEngine> g_engineDescription;
 
 		static OSL::ShadingSystem *shadingSystem()
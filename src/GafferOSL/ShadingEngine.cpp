@@ -631,6 +631,9 @@ OSL::ShadingSystem *shadingSystem()
 	return g_shadingSystem;
 }
 
+// Points are shaded in parallel, in blocks of this size.
+const size_t g_pointsPerBlock = 1024;
+
 } // namespace
 
 
@@ -1202,7 +1205,10 @@ IECore::CompoundDataPtr ShadingEngine::shade( const IECore::CompoundData *points
 
 	ShadingResults results( numPoints );
 
-	// Iterate over the input points, doing the shading as we go
+	// Iterate over the input points in blocks, doing the shading as we go.
+	// The setup for each block is shared by all its points, so the only
+	// per-point work is updating the varying globals, executing the shader
+	// and storing the results.
 
 	struct ThreadContext
 	{
@@ -1238,6 +1244,8 @@ IECore::CompoundDataPtr ShadingEngine::shade( const IECore::CompoundData *points
 
 	auto f = [&shadingSystem, &renderState, &results, &shaderGlobals, &p, &u, &v, &uv, &n, &shaderGroup, &contexts, canceller]( const tbb::blocked_range<size_t> &r )
 	{
+		IECore::Canceller::check( canceller );
+
 		ThreadContextType::reference context = contexts.local();
 
 		ThreadRenderState threadRenderState( renderState );
@@ -1248,8 +1256,6 @@ IECore::CompoundDataPtr ShadingEngine::shade( const IECore::CompoundData *points
 
 		for( size_t i = r.begin(); i < r.end(); ++i )
 		{
-			IECore::Canceller::check( canceller );
-
 			threadShaderGlobals.P = p[i];
 
 			if( uv )
@@ -1287,7 +1293,7 @@ IECore::CompoundDataPtr ShadingEngine::shade( const IECore::CompoundData *points
 	// tasks from propagating down and stopping our tasks from being started.
 	// Otherwise we silently return results with black gaps where tasks were omitted.
 	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
-	tbb::parallel_for( tbb::blocked_range<size_t>( 0, numPoints, 5000 ), f, taskGroupContext );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, numPoints, g_pointsPerBlock ), f, tbb::simple_partitioner(), taskGroupContext );
 
 	return results.results();
 }
@@ -148,6 +148,7 @@ void Encapsulate::hashObject( const ScenePath &path, const Gaffer::Context *cont
 		h.append( reinterpret_cast<uint64_t>( this ) );
 		h.append( m_dirtyCount );
 		h.append( context->hash() );
+		ValuePlug::markHashUnstable( h );
 		inPlug()->boundPlug()->hash( h );
 	}
 	else
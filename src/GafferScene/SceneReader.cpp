@@ -37,12 +37,13 @@
 #include "GafferScene/SceneReader.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/ScriptNode.h"
 #include "Gaffer/StringPlug.h"
 
 #include "IECoreScene/SceneCache.h"
-#include "IECoreScene/SharedSceneInterfaces.h"
 
 #include "IECore/InternedString.h"
+#include "IECore/LRUCache.h"
 #include "IECore/StringAlgo.h"
 
 #include "boost/bind.hpp"
@@ -56,6 +57,29 @@ using namespace GafferScene;
 
 typedef boost::tokenizer<boost::char_separator<char> > Tokenizer;
 
+//////////////////////////////////////////////////////////////////////////
+// File cache
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+ConstSceneInterfacePtr fileCacheGetter( const std::string &fileName, size_t &cost )
+{
+	cost = 1;
+	return SceneInterface::create( fileName, IndexedIO::Read );
+}
+
+typedef LRUCache<std::string, ConstSceneInterfacePtr> FileCache;
+
+FileCache *fileCache()
+{
+	static FileCache *c = new FileCache( fileCacheGetter, 200 );
+	return c;
+}
+
+} // namespace
+
 IE_CORE_DEFINERUNTIMETYPED( SceneReader );
 
 //////////////////////////////////////////////////////////////////////////
@@ -138,6 +162,16 @@ size_t SceneReader::supportedExtensions( std::vector<std::string> &extensions )
 	return extensions.size();
 }
 
+size_t SceneReader::getOpenFilesLimit()
+{
+	return fileCache()->getMaxCost();
+}
+
+void SceneReader::setOpenFilesLimit( size_t maxOpenFiles )
+{
+	fileCache()->setMaxCost( maxOpenFiles );
+}
+
 void SceneReader::hashBound( const ScenePath &path, const Gaffer::Context *context, const ScenePlug *parent, IECore::MurmurHash &h ) const
 {
 	SceneNode::hashBound( path, context, parent, h );
@@ -149,6 +183,7 @@ void SceneReader::hashBound( const ScenePath &path, const Gaffer::Context *conte
 	}
 
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 
 	if( s->hasBound() )
 	{
@@ -195,6 +230,7 @@ void SceneReader::hashTransform( const ScenePath &path, const Gaffer::Context *c
 	}
 
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 	s->hash( SceneInterface::TransformHash, context->getTime(), h );
 }
 
@@ -228,6 +264,7 @@ void SceneReader::hashAttributes( const ScenePath &path, const Gaffer::Context *
 	SceneNode::hashAttributes( path, context, parent, h );
 
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 	s->hash( SceneInterface::AttributesHash, context->getTime(), h );
 }
 
@@ -279,6 +316,7 @@ void SceneReader::hashObject( const ScenePath &path, const Gaffer::Context *cont
 	SceneNode::hashObject( path, context, parent, h );
 
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 	s->hash( SceneInterface::ObjectHash, context->getTime(), h );
 }
 
@@ -305,6 +343,7 @@ void SceneReader::hashChildNames( const ScenePath &path, const Gaffer::Context *
 	SceneNode::hashChildNames( path, context, parent, h );
 
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 
 	// append a hash of the tags plug, as restricting the tags can affect the hierarchy
 	tagsPlug()->hash( h );
@@ -381,6 +420,7 @@ void SceneReader::hashSetNames( const Gaffer::Context *context, const ScenePlug
 	SceneNode::hashSetNames( context, parent, h );
 	fileNamePlug()->hash( h );
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 }
 
 IECore::ConstInternedStringVectorDataPtr SceneReader::computeSetNames( const Gaffer::Context *context, const ScenePlug *parent ) const
@@ -402,6 +442,7 @@ void SceneReader::hashSet( const IECore::InternedString &setName, const Gaffer::
 	SceneNode::hashSet( setName, context, parent, h );
 	fileNamePlug()->hash( h );
 	refreshCountPlug()->hash( h );
+	ValuePlug::hashFileModificationTime( fileNamePlug()->getValue(), h );
 	h.append( setName );
 }
 
@@ -447,13 +488,36 @@ IECore::ConstPathMatcherDataPtr SceneReader::computeSet( const IECore::InternedS
 
 void SceneReader::plugSet( Gaffer::Plug *plug )
 {
-	// this clears the cache every time the refresh count is updated, so you don't get entries
-	// from old files hanging around and screwing up the hierarchy.
-	/// \todo The fact that this clears the cache for all nodes, ever is a problem - find a better
-	// way of doing this!
+	// Remove our files from the cache every time the refresh count is updated,
+	// so you don't get entries from old files hanging around and screwing up
+	// the hierarchy. We only remove our own files, so that other nodes don't
+	// pay the cost of reloading.
 	if( plug == refreshCountPlug() )
 	{
-		SharedSceneInterfaces::clear();
+		std::set<std::string> fileNames;
+		{
+			tbb::spin_mutex::scoped_lock lock( m_fileNamesMutex );
+			fileNames.swap( m_fileNames );
+		}
+
+		// We may not have loaded the current file yet, but it could
+		// still have been cached by another node.
+		try
+		{
+			const ScriptNode *script = scriptNode();
+			Context::Scope scope( script ? script->context() : Context::current() );
+			fileNames.insert( fileNamePlug()->getValue() );
+		}
+		catch( ... )
+		{
+			// Errors will be reported when computing
+			// the outputs, so we needn't report them here.
+		}
+
+		for( std::set<std::string>::const_iterator it = fileNames.begin(), eIt = fileNames.end(); it != eIt; ++it )
+		{
+			fileCache()->erase( *it );
+		}
 		m_lastScene.clear();
 	}
 }
@@ -481,7 +545,14 @@ ConstSceneInterfacePtr SceneReader::scene( const ScenePath &path ) const
 		}
 	}
 
-	lastScene.fileNameScene = SharedSceneInterfaces::get( fileName );
+	ConstSceneInterfacePtr fileNameScene = fileCache()->get( fileName );
+
+	{
+		tbb::spin_mutex::scoped_lock lock( m_fileNamesMutex );
+		m_fileNames.insert( fileName );
+	}
+
+	lastScene.fileNameScene = fileNameScene;
 	lastScene.fileName = fileName;
 
 	lastScene.pathScene = lastScene.fileNameScene->scene( path );
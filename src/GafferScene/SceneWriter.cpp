@@ -39,14 +39,16 @@
 #include "GafferScene/SceneAlgo.h"
 
 #include "Gaffer/Context.h"
+#include "Gaffer/Private/WriterThread.h"
 #include "Gaffer/StringPlug.h"
 
 #include "IECoreScene/SceneInterface.h"
 
+#include "boost/bind.hpp"
 #include "boost/filesystem.hpp"
 
-#include "tbb/concurrent_unordered_map.h"
-#include "tbb/mutex.h"
+#include <map>
+#include <memory>
 
 using namespace std;
 using namespace IECore;
@@ -57,34 +59,173 @@ using namespace GafferScene;
 namespace
 {
 
+// Maximum number of computed locations which may be waiting to be
+// written. Compute threads block when the queue is full, which bounds
+// memory usage when compute is faster than the output.
+const size_t g_queueCapacity = 1024;
+
+// All the data needed to write a single location, computed in advance
+// so that the writer thread never has to touch the ScenePlug.
+struct Location
+{
+	ScenePlug::ScenePath path;
+	float time;
+	ConstCompoundObjectPtr attributes;
+	ConstCompoundObjectPtr globals;
+	ConstObjectPtr object;
+	Imath::Box3d bound;
+	M44dDataPtr transform;
+	SceneInterface::NameList sets;
+	size_t numChildren;
+};
+
+typedef std::shared_ptr<Location> LocationPtr;
+
+// Writes computed locations into the SceneInterface on a WriterThread.
+// Because a location is always queued before the tasks for its children
+// are spawned, writing in FIFO order guarantees that parents are written
+// before their children.
+class Output
+{
+
+	public :
+
+		Output( SceneInterfacePtr root )
+			:	m_root( root ), m_writerThread( boost::bind( &Output::write, this, ::_1 ), g_queueCapacity )
+		{
+		}
+
+		// Called concurrently by the compute threads.
+		void push( const LocationPtr &location )
+		{
+			m_writerThread.push( location );
+		}
+
+		// True if writing has failed, in which case there is no
+		// point computing any more locations.
+		bool failed() const
+		{
+			return m_writerThread.failed();
+		}
+
+		// Waits for all queued locations to be written, rethrowing
+		// any exception thrown by the writer thread.
+		void finish()
+		{
+			m_writerThread.finish();
+		}
+
+	private :
+
+		// Called on the writer thread.
+		void write( const Location &location )
+		{
+			SceneInterfacePtr output;
+			if( location.path.empty() )
+			{
+				output = m_root;
+			}
+			else
+			{
+				const ScenePlug::ScenePath parentPath( location.path.begin(), location.path.end() - 1 );
+				OpenLocations::iterator parentIt = m_openLocations.find( parentPath );
+				if( parentIt == m_openLocations.end() )
+				{
+					throw IECore::Exception( "SceneWriter : Parent of location written before it" );
+				}
+				output = parentIt->second.scene->child( location.path.back(), SceneInterface::CreateIfMissing );
+				// Once all its children have been created, we have no further
+				// use for the parent, so we release it rather than holding open
+				// a SceneInterface for every location in the scene.
+				if( --parentIt->second.remainingChildren == 0 )
+				{
+					m_openLocations.erase( parentIt );
+				}
+			}
+
+			if( location.numChildren )
+			{
+				OpenLocation &openLocation = m_openLocations[location.path];
+				openLocation.scene = output;
+				openLocation.remainingChildren = location.numChildren;
+			}
+
+			for( CompoundObject::ObjectMap::const_iterator it = location.attributes->members().begin(), eIt = location.attributes->members().end(); it != eIt; it++ )
+			{
+				output->writeAttribute( it->first, it->second.get(), location.time );
+			}
+
+			if( location.globals )
+			{
+				output->writeAttribute( "gaffer:globals", location.globals.get(), location.time );
+			}
+
+			if( location.object->typeId() != IECore::NullObjectTypeId && location.path.size() > 0 )
+			{
+				output->writeObject( location.object.get(), location.time );
+			}
+
+			output->writeBound( location.bound, location.time );
+
+			if( location.transform )
+			{
+				output->writeTransform( location.transform.get(), location.time );
+			}
+
+			output->writeTags( location.sets );
+		}
+
+		// Only accessed by the writer thread. We keep open only those
+		// locations which have children still waiting to be written.
+		struct OpenLocation
+		{
+			SceneInterfacePtr scene;
+			size_t remainingChildren;
+		};
+		typedef std::map<ScenePlug::ScenePath, OpenLocation> OpenLocations;
+
+		SceneInterfacePtr m_root;
+		OpenLocations m_openLocations;
+
+		// Declared last, so that the thread is finished
+		// before the members it uses are destroyed.
+		Gaffer::Private::WriterThread<Location> m_writerThread;
+
+};
+
 struct LocationWriter
 {
-	LocationWriter(SceneInterfacePtr output, ConstCompoundDataPtr sets, float time, tbb::mutex& mutex) : m_output( output ), m_sets(sets), m_time( time ), m_mutex( mutex )
+	LocationWriter( Output &output, ConstCompoundDataPtr sets, float time ) : m_output( output ), m_sets( sets ), m_time( time )
 	{
 	}
 
-	/// first half of this function can be lock free reading data from ScenePlug
-	/// once all the data has been read then we take a global lock and write
-	/// into the SceneInterface
+	/// Computes all the data for a location, and queues it for
+	/// writing by the writer thread.
 	bool operator()( const ScenePlug *scene, const ScenePlug::ScenePath &scenePath )
 	{
-		ConstCompoundObjectPtr attributes = scene->attributesPlug()->getValue();
-
-		ConstCompoundObjectPtr globals;
+		if( m_output.failed() )
+		{
+			return false;
+		}
 
-		ConstObjectPtr object = scene->objectPlug()->getValue();
-		Imath::Box3f bound = scene->boundPlug()->getValue();
+		LocationPtr location = std::make_shared<Location>();
+		location->path = scenePath;
+		location->time = m_time;
+		location->attributes = scene->attributesPlug()->getValue();
+		location->object = scene->objectPlug()->getValue();
+		location->numChildren = scene->childNamesPlug()->getValue()->readable().size();
 
-		IECore::M44dDataPtr transformData;
+		const Imath::Box3f bound = scene->boundPlug()->getValue();
+		location->bound = Imath::Box3d( Imath::V3d( bound.min ), Imath::V3d( bound.max ) );
 
 		if( scenePath.empty() )
 		{
-			globals = scene->globalsPlug()->getValue();
+			location->globals = scene->globalsPlug()->getValue();
 		}
 		else
 		{
 			Imath::M44f t = scene->transformPlug()->getValue();
-			transformData = new IECore::M44dData( Imath::M44d (
+			location->transform = new IECore::M44dData( Imath::M44d (
 				t[0][0], t[0][1], t[0][2], t[0][3],
 				t[1][0], t[1][1], t[1][2], t[1][3],
 				t[2][0], t[2][1], t[2][2], t[2][3],
@@ -92,9 +233,8 @@ struct LocationWriter
 			) );
 		}
 
-		SceneInterface::NameList locationSets;
 		const CompoundDataMap &setsMap = m_sets->readable();
-		locationSets.reserve( setsMap.size() );
+		location->sets.reserve( setsMap.size() );
 
 		for( CompoundDataMap::const_iterator it = setsMap.begin(); it != setsMap.end(); ++it)
 		{
@@ -102,48 +242,18 @@ struct LocationWriter
 
 			if( pathMatcher->readable().match( scenePath ) & IECore::PathMatcher::ExactMatch )
 			{
-				locationSets.push_back( it->first );
+				location->sets.push_back( it->first );
 			}
 		}
 
-		tbb::mutex::scoped_lock scopedLock( m_mutex );
-
-		if( !scenePath.empty() )
-		{
-			m_output = m_output->child( scenePath.back(), SceneInterface::CreateIfMissing );
-		}
-
-		for( CompoundObject::ObjectMap::const_iterator it = attributes->members().begin(), eIt = attributes->members().end(); it != eIt; it++ )
-		{
-			m_output->writeAttribute( it->first, it->second.get(), m_time );
-		}
-
-		if( globals )
-		{
-			m_output->writeAttribute( "gaffer:globals", globals.get(), m_time );
-		}
-
-		if( object->typeId() != IECore::NullObjectTypeId && scenePath.size() > 0 )
-		{
-			m_output->writeObject( object.get(), m_time );
-		}
-
-		m_output->writeBound( Imath::Box3d( Imath::V3f( bound.min ), Imath::V3f( bound.max ) ), m_time );
-
-		if( transformData )
-		{
-			m_output->writeTransform( transformData.get(), m_time );
-		}
-
-		m_output->writeTags( locationSets );
+		m_output.push( location );
 
 		return true;
 	}
 
-	SceneInterfacePtr m_output;
+	Output &m_output;
 	ConstCompoundDataPtr m_sets;
 	float m_time;
-	tbb::mutex &m_mutex;
 };
 
 }
@@ -230,20 +340,25 @@ void SceneWriter::executeSequence( const std::vector<float> &frames ) const
 
 	const std::string fileName = fileNamePlug()->getValue();
 	createDirectories( fileName );
-	SceneInterfacePtr output = SceneInterface::create( fileName, IndexedIO::Write );
-	tbb::mutex mutex;
+	SceneInterfacePtr sceneInterface = SceneInterface::create( fileName, IndexedIO::Write );
 	ContextPtr context = new Context( *Context::current() );
 	Context::Scope scopedContext( context.get() );
 
+	Output output( sceneInterface );
 	for( std::vector<float>::const_iterator it = frames.begin(); it != frames.end(); ++it )
 	{
 		context->setFrame( *it );
 
 		ConstCompoundDataPtr sets = SceneAlgo::sets( scene );
-		LocationWriter locationWriter( output, sets, context->getTime(), mutex );
+		LocationWriter locationWriter( output, sets, context->getTime() );
 
 		SceneAlgo::parallelProcessLocations( scene, locationWriter );
+		if( output.failed() )
+		{
+			break;
+		}
 	}
+	output.finish();
 }
 
 bool SceneWriter::requiresSequenceExecution() const
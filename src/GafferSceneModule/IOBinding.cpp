@@ -72,6 +72,10 @@ void GafferSceneModule::bindIO()
 	GafferBindings::DependencyNodeClass<SceneReader>()
 		.def( "supportedExtensions", &supportedExtensions )
 		.staticmethod( "supportedExtensions" )
+		.def( "getOpenFilesLimit", &SceneReader::getOpenFilesLimit )
+		.staticmethod( "getOpenFilesLimit" )
+		.def( "setOpenFilesLimit", &SceneReader::setOpenFilesLimit )
+		.staticmethod( "setOpenFilesLimit" )
 	;
 
 	GafferDispatchBindings::TaskNodeClass<SceneWriter>();